@@ -0,0 +1,43 @@
+"""Latest cross-source analysis per language and date
+
+Revision ID: 3e7a9c5d1f20
+Revises: a9d3f1c7e2b4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7a9c5d1f20'
+down_revision: Union[str, None] = 'a9d3f1c7e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS latest_cross_source_analysis (
+            language VARCHAR(5) NOT NULL,
+            date DATE NOT NULL,
+            analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+            created_at TIMESTAMP,
+            PRIMARY KEY (language, date) INCLUDE (analysis_id, created_at)
+        )
+    """)
+    # Backfill from the existing append-only history
+    op.execute("""
+        INSERT INTO latest_cross_source_analysis (language, date, analysis_id, created_at)
+        SELECT DISTINCT ON (language, date) language, date, id, created_at
+        FROM cross_source_analyses
+        ORDER BY language, date, created_at DESC
+        ON CONFLICT (language, date) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS latest_cross_source_analysis")
@@ -0,0 +1,50 @@
+"""Summaries structured columns, data version and latest-lookup indexes
+
+Revision ID: 8c1f4d2a9b3e
+Revises: 50e7b7f0acb7
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4d2a9b3e'
+down_revision: Union[str, None] = '50e7b7f0acb7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columns the scraper writes that the initial migration predates
+    op.execute("ALTER TABLE summaries ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+    op.execute("ALTER TABLE summaries ADD COLUMN IF NOT EXISTS short_summary TEXT")
+    op.execute("ALTER TABLE summaries ADD COLUMN IF NOT EXISTS sections JSONB")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id SMALLINT PRIMARY KEY DEFAULT 1,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+
+    # Latest summary per domain for a language and date
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_summaries_language_date_domain_created
+            ON summaries (language, date, domain, created_at DESC)
+    """)
+    # Covered by the composite index above
+    op.execute("DROP INDEX IF EXISTS ix_summaries_language")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summaries_language ON summaries (language)")
+    op.execute("DROP INDEX IF EXISTS idx_summaries_language_date_domain_created")
+    # The columns and data_version may predate this revision (direct_db_init.py creates
+    # them too), so they are left in place.
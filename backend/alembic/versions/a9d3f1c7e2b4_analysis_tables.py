@@ -0,0 +1,68 @@
+"""Analysis tables created so far only by direct_db_init.py
+
+Revision ID: a9d3f1c7e2b4
+Revises: 8c1f4d2a9b3e
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f1c7e2b4'
+down_revision: Union[str, None] = '8c1f4d2a9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The later revisions reference these tables, which the initial migration
+    # predates; databases set up with direct_db_init.py already have them
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS domain_analyses (
+            id SERIAL PRIMARY KEY,
+            domain VARCHAR(255) NOT NULL,
+            date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS topic_analyses (
+            id SERIAL PRIMARY KEY,
+            domain_analysis_id INTEGER NOT NULL REFERENCES domain_analyses(id),
+            topic_name VARCHAR(255) NOT NULL,
+            political_leaning VARCHAR(50) NOT NULL,
+            sentiment VARCHAR(50) NOT NULL,
+            framing TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS key_phrases (
+            id SERIAL PRIMARY KEY,
+            topic_analysis_id INTEGER NOT NULL REFERENCES topic_analyses(id),
+            phrase TEXT NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cross_source_analyses (
+            id SERIAL PRIMARY KEY,
+            date DATE NOT NULL,
+            analysis_json JSONB NOT NULL,
+            language VARCHAR(5) NOT NULL DEFAULT 'hu',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("ALTER TABLE topic_analyses ADD COLUMN IF NOT EXISTS article_urls TEXT[] DEFAULT '{}'")
+    op.execute("ALTER TABLE cross_source_analyses ADD COLUMN IF NOT EXISTS language VARCHAR(5) NOT NULL DEFAULT 'hu'")
+    op.execute("ALTER TABLE domain_analyses ADD COLUMN IF NOT EXISTS language VARCHAR(5) NOT NULL DEFAULT 'hu'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The tables may predate this revision (direct_db_init.py creates them too)
+    # and hold the analyses, so they are left in place.
+    pass
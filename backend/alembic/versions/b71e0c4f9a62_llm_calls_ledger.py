@@ -0,0 +1,44 @@
+"""LLM call ledger
+
+Revision ID: b71e0c4f9a62
+Revises: 3e7a9c5d1f20
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e0c4f9a62'
+down_revision: Union[str, None] = '3e7a9c5d1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS llm_calls (
+            id BIGSERIAL PRIMARY KEY,
+            run_id VARCHAR(32) NOT NULL,
+            call VARCHAR(64) NOT NULL,
+            outlet VARCHAR(255),
+            language VARCHAR(5),
+            model VARCHAR(128) NOT NULL,
+            input_tokens INTEGER NOT NULL,
+            output_tokens INTEGER NOT NULL,
+            latency_seconds DOUBLE PRECISION NOT NULL,
+            succeeded BOOLEAN NOT NULL,
+            cost_usd DOUBLE PRECISION NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_created_at ON llm_calls (created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_run_id ON llm_calls (run_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS llm_calls")
@@ -0,0 +1,80 @@
+"""Full-text search vectors on articles, topics, key phrases and summaries
+
+Revision ID: d4a8e2c6f1b3
+Revises: b71e0c4f9a62
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e2c6f1b3'
+down_revision: Union[str, None] = 'b71e0c4f9a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # Hungarian stemming on accent-folded words, so "fovaros" finds "főváros" and "fővárosban"
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'hungarian_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION hungarian_unaccent (COPY = hungarian);
+                ALTER TEXT SEARCH CONFIGURATION hungarian_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, hungarian_stem;
+            END IF;
+        END
+        $$
+    """)
+    # Generated columns are computed by Postgres on every insert, so the scraper needs no changes
+    op.execute("""
+        ALTER TABLE scraped_articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('hungarian_unaccent', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('hungarian_unaccent', coalesce(content, '')), 'B')
+        ) STORED
+    """)
+    op.execute("""
+        ALTER TABLE topic_analyses ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('hungarian_unaccent', coalesce(topic_name, '')), 'A') ||
+            setweight(to_tsvector('hungarian_unaccent', coalesce(framing, '')), 'B')
+        ) STORED
+    """)
+    op.execute("""
+        ALTER TABLE key_phrases ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('hungarian_unaccent', coalesce(phrase, '')), 'B')
+        ) STORED
+    """)
+    op.execute("""
+        ALTER TABLE summaries ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector(
+                CASE WHEN language = 'en' THEN 'english'::regconfig ELSE 'hungarian_unaccent'::regconfig END,
+                coalesce(short_summary, '')), 'A') ||
+            setweight(to_tsvector(
+                CASE WHEN language = 'en' THEN 'english'::regconfig ELSE 'hungarian_unaccent'::regconfig END,
+                regexp_replace(coalesce(content, ''), '\\[(START|END)_[A-Z_]+\\]', ' ', 'g')), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_scraped_articles_search ON scraped_articles USING GIN (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_topic_analyses_search ON topic_analyses USING GIN (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_key_phrases_search ON key_phrases USING GIN (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_summaries_search ON summaries USING GIN (search_vector)")
+    # Joins from key phrase matches back to their topic
+    op.execute("CREATE INDEX IF NOT EXISTS idx_key_phrases_topic_analysis_id ON key_phrases (topic_analysis_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_key_phrases_topic_analysis_id")
+    for table in ["scraped_articles", "topic_analyses", "key_phrases", "summaries"]:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS hungarian_unaccent")
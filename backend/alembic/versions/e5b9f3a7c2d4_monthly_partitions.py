@@ -0,0 +1,145 @@
+"""Partition scraped_articles and summaries by month
+
+Revision ID: e5b9f3a7c2d4
+Revises: d4a8e2c6f1b3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9f3a7c2d4'
+down_revision: Union[str, None] = 'd4a8e2c6f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, partition column, its type, partition bound for a month, partition column of rows
+#  lacking it, stored columns, indexes), kept in step with scripts/retention.py
+TABLES = [
+    (
+        "scraped_articles",
+        "scraped_at",
+        "timestamptz",
+        "to_char({month}, 'YYYY-MM-DD') || ' 00:00:00+00'",
+        "coalesce(scraped_at, publication_date, CURRENT_TIMESTAMP)",
+        ["id", "url", "domain", "title", "content", "publication_date", "scraped_at"],
+        [
+            "CREATE INDEX IF NOT EXISTS idx_scraped_articles_url ON scraped_articles (url)",
+            "CREATE INDEX IF NOT EXISTS idx_scraped_articles_search ON scraped_articles USING GIN (search_vector)",
+        ],
+    ),
+    (
+        "summaries",
+        "date",
+        "date",
+        "{month}::text",
+        "coalesce(date, created_at::date, CURRENT_DATE)",
+        ["id", "domain", "language", "date", "content", "short_summary", "sections", "created_at"],
+        [
+            "CREATE INDEX IF NOT EXISTS idx_summaries_language_date_domain_created ON summaries (language, date, domain, created_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_summaries_search ON summaries USING GIN (search_vector)",
+        ],
+    ),
+]
+
+
+def _replace_table(table: str, staging: str, columns: list, selected: str) -> None:
+    """Move the rows and the id sequence to the staging table and give it the table's name."""
+    op.execute(f"INSERT INTO {staging} ({', '.join(columns)}) SELECT {selected} FROM {table}")
+    # The sequence would be dropped with the table that owns it
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {staging}.id")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A plain table cannot be partitioned in place: each table is rebuilt as a
+    # partitioned copy with one partition per month of its data (and of the next
+    # month), and the original is dropped. Every unique index of a partitioned
+    # table must include the partition column, so the primary keys become
+    # (id, partition column) and the unique index on article URLs becomes a plain
+    # one, with the article_urls table below keeping the URLs unique.
+    # Timestamps without a time zone are read as UTC, which is what the scraper stores.
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    for table, key, key_type, bound, fallback, columns, indexes in TABLES:
+        staging = f"{table}_partitioned"
+        # Databases created by direct_db_init.py have a plain TIMESTAMP scraped_at. The
+        # type of a partition column cannot be altered, so it is set on a template first
+        op.execute(f"""
+            CREATE TEMPORARY TABLE {staging}_template (LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED)
+            ON COMMIT DROP
+        """)
+        op.execute(f"ALTER TABLE {staging}_template ALTER COLUMN {key} TYPE {key_type}")
+        op.execute(f"""
+            CREATE TABLE {staging} (LIKE {staging}_template INCLUDING DEFAULTS INCLUDING GENERATED)
+            PARTITION BY RANGE ({key})
+        """)
+        op.execute(f"ALTER TABLE {staging} ALTER COLUMN {key} SET NOT NULL")
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id, {key})")
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month date;
+            BEGIN
+                FOR month IN
+                    SELECT series::date
+                    FROM (SELECT min({fallback})::date AS first, max({fallback})::date AS last FROM {table}) bounds,
+                    generate_series(
+                        date_trunc('month', least(coalesce(bounds.first, CURRENT_DATE), CURRENT_DATE)),
+                        date_trunc('month', greatest(coalesce(bounds.last, CURRENT_DATE), CURRENT_DATE + interval '1 month')),
+                        interval '1 month'
+                    ) AS series
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {staging} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_' || to_char(month, 'YYYY_MM'),
+                        {bound.format(month="month")},
+                        {bound.format(month="(month + interval '1 month')::date")}
+                    );
+                END LOOP;
+            END
+            $$
+        """)
+        selected = ", ".join(f"({fallback})::{key_type}" if column == key else column for column in columns)
+        _replace_table(table, staging, columns, selected)
+        for index in indexes:
+            op.execute(index)
+
+    # The scraper claims an article's URL here before inserting the article
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS article_urls (
+            url VARCHAR(512) PRIMARY KEY,
+            scraped_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    op.execute("""
+        INSERT INTO article_urls (url, scraped_at)
+        SELECT url, min(scraped_at) FROM scraped_articles GROUP BY url
+        ON CONFLICT (url) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows of partitions already retired by scripts/retention.py live only in the archives
+    op.execute("DROP TABLE IF EXISTS article_urls")
+    for table, key, key_type, bound, fallback, columns, indexes in TABLES:
+        staging = f"{table}_partitioned"
+        op.execute(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED)")
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id)")
+        _replace_table(table, staging, columns, ", ".join(columns))
+        for index in indexes:
+            if "idx_scraped_articles_url" not in index:
+                op.execute(index)
+    # Indexes of the initial migration, which its downgrade drops
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_scraped_articles_url ON scraped_articles (url)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_scraped_articles_domain ON scraped_articles (domain)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_scraped_articles_id ON scraped_articles (id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summaries_date ON summaries (date)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summaries_domain ON summaries (domain)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summaries_id ON summaries (id)")
@@ -0,0 +1,134 @@
+"""Relational unified_topics and source_coverage tables for cross-source analyses
+
+Revision ID: f6c1a8d3b5e7
+Revises: e5b9f3a7c2d4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+import json
+import os
+import sys
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# The backfill builds its rows with the scraper's code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from backend.documents import normalize_analysis_document, unified_topic_rows
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c1a8d3b5e7'
+down_revision: Union[str, None] = 'e5b9f3a7c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Analyses decoded and written per round trip of the backfill
+BACKFILL_BATCH_SIZE = 200
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One row per unified topic and per source covering it, written next to the
+    # JSONB document so per-topic and per-outlet queries need no JSON decoding
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS unified_topics (
+            id SERIAL PRIMARY KEY,
+            analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            language VARCHAR(5) NOT NULL,
+            position SMALLINT NOT NULL,
+            topic_id VARCHAR(255) NOT NULL,
+            name TEXT NOT NULL,
+            comparative_analysis TEXT,
+            UNIQUE (analysis_id, position)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS source_coverage (
+            id SERIAL PRIMARY KEY,
+            unified_topic_id INTEGER NOT NULL REFERENCES unified_topics(id) ON DELETE CASCADE,
+            analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            language VARCHAR(5) NOT NULL,
+            domain VARCHAR(255) NOT NULL,
+            original_topic_name TEXT,
+            sentiment SMALLINT NOT NULL CHECK (sentiment BETWEEN -1 AND 1),
+            political_leaning SMALLINT NOT NULL CHECK (political_leaning BETWEEN -2 AND 2),
+            framing TEXT,
+            key_phrases TEXT[] NOT NULL DEFAULT '{}',
+            article_urls TEXT[] NOT NULL DEFAULT '{}'
+        )
+    """)
+    op.execute("COMMENT ON COLUMN source_coverage.sentiment IS '-1 negatív, 0 semleges, 1 pozitív'")
+    op.execute("COMMENT ON COLUMN source_coverage.political_leaning IS '-2 bal, -1 közép-bal, 0 közép, 1 közép-jobb, 2 jobb'")
+
+    op.execute("CREATE INDEX IF NOT EXISTS idx_unified_topics_topic_id ON unified_topics (topic_id, language, date)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_source_coverage_unified_topic_id ON source_coverage (unified_topic_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_source_coverage_analysis_id ON source_coverage (analysis_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_source_coverage_domain ON source_coverage (domain, language, date)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_source_coverage_leaning ON source_coverage (language, political_leaning, date)")
+
+    _backfill_unified_topics()
+
+
+def _backfill_unified_topics() -> None:
+    """
+    Rows for the analyses stored so far, built like the scraper builds them:
+    normalized domains, slug topic ids and the Sentiment/PoliticalLeaning codes.
+    """
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        analyses = bind.execute(sa.text("""
+            SELECT id, date, language, analysis_json FROM cross_source_analyses
+            WHERE id > :last_id ORDER BY id LIMIT :batch_size
+        """), {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}).fetchall()
+        if not analyses:
+            return
+        last_id = analyses[-1].id
+
+        topic_rows, coverage_rows = [], []
+        for analysis in analyses:
+            document = analysis.analysis_json
+            if isinstance(document, str):
+                document = json.loads(document)
+            if not isinstance(document, dict) or not isinstance(document.get("unified_topics"), list):
+                continue
+            topics, coverage = unified_topic_rows(normalize_analysis_document(document)["unified_topics"])
+            keys = {"analysis_id": analysis.id, "date": analysis.date, "language": analysis.language}
+            topic_rows.extend({**keys, **row._asdict()} for row in topics)
+            coverage_rows.extend({**keys, **row._asdict()} for row in coverage)
+        if not topic_rows:
+            continue
+
+        bind.execute(sa.text("""
+            INSERT INTO unified_topics (analysis_id, date, language, position, topic_id, name, comparative_analysis)
+            VALUES (:analysis_id, :date, :language, :position, :topic_id, :name, :comparative_analysis)
+        """), topic_rows)
+        topic_row_ids = {
+            (row.analysis_id, row.position): row.id
+            for row in bind.execute(sa.text("""
+                SELECT id, analysis_id, position FROM unified_topics
+                WHERE analysis_id BETWEEN :first_id AND :last_id
+            """), {"first_id": analyses[0].id, "last_id": last_id})
+        }
+        if coverage_rows:
+            bind.execute(sa.text("""
+                INSERT INTO source_coverage
+                (unified_topic_id, analysis_id, date, language, domain, original_topic_name,
+                 sentiment, political_leaning, framing, key_phrases, article_urls)
+                VALUES (:unified_topic_id, :analysis_id, :date, :language, :domain, :original_topic_name,
+                        :sentiment, :political_leaning, :framing, :key_phrases, :article_urls)
+            """), [
+                {**row, "unified_topic_id": topic_row_ids[(row["analysis_id"], row["position"])]}
+                for row in coverage_rows
+            ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS source_coverage")
+    op.execute("DROP TABLE IF EXISTS unified_topics")
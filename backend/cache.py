@@ -0,0 +1,283 @@
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import date as dt_date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import asyncpg
+from fastapi import Request
+from fastapi.responses import Response
+
+from backend import database
+from backend.config import settings
+from backend.metrics import record_cache_lookup
+from backend.queries import queries
+from backend.utils.compression import compress_variants
+from backend.utils.httputils import negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+DATA_VERSION_QUERY = queries.register("data_version", "SELECT version FROM data_version WHERE id = 1")
+
+
+class CacheEntry(NamedTuple):
+    """
+    A rendered response body together with its HTTP validators and its
+    pre-compressed variants keyed by content coding.
+    """
+    etag: str
+    last_modified: Optional[str]
+    body: bytes
+    variants: Mapping[str, bytes] = {}
+
+    def pack(self) -> bytes:
+        sizes = {encoding: len(data) for encoding, data in self.variants.items()}
+        header = json.dumps([self.etag, self.last_modified, len(self.body), sizes]).encode("utf-8")
+        return b"".join([header, b"\n", self.body, *self.variants.values()])
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CacheEntry":
+        header, payload = data.split(b"\n", 1)
+        etag, last_modified, body_size, sizes = json.loads(header)
+        body, offset = payload[:body_size], body_size
+        variants = {}
+        for encoding, size in sizes.items():
+            variants[encoding] = payload[offset:offset + size]
+            offset += size
+        return cls(etag, last_modified, body, variants)
+
+
+class PreparedResponse(NamedTuple):
+    """
+    Rows fetched for a response whose body is rendered only when needed.
+
+    `validator_rows` are the rows the body is built from; their `id` and
+    `created_at` columns determine the ETag and Last-Modified headers.
+    `render` may still use the connection the rows were fetched with.
+    """
+    validator_rows: Sequence[asyncpg.Record]
+    render: Callable[[], Awaitable[bytes]]
+
+
+def cache_seed(endpoint: str, date: dt_date, language: str, *extra) -> str:
+    """Identify a response independently of the data version; also the ETag seed."""
+    return ":".join([endpoint, date.isoformat(), language, *[str(part) for part in extra]])
+
+
+def compute_validators(seed: str, rows: Sequence[asyncpg.Record]) -> Tuple[str, Optional[str]]:
+    """Compute a strong ETag and a Last-Modified date from the ids and creation times of `rows`."""
+    digest = hashlib.sha256(f"{settings.API_VERSION}|{seed}".encode("utf-8"))
+    last_modified: Optional[datetime] = None
+    for row in rows:
+        created_at = row['created_at']
+        digest.update(f"|{row['id']}:{created_at.isoformat() if created_at else ''}".encode("utf-8"))
+        if created_at and (last_modified is None or created_at > last_modified):
+            last_modified = created_at
+
+    etag = f'"{digest.hexdigest()[:32]}"'
+    if last_modified is None:
+        return etag, None
+    if last_modified.tzinfo is None:
+        # created_at is TIMESTAMP WITHOUT TIME ZONE, filled by a UTC database server
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return etag, format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def not_modified(request: Request, entry: CacheEntry) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, entry.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cache_headers(entry: CacheEntry) -> dict:
+    headers = {
+        "ETag": entry.etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": (
+            f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    return headers
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CacheEntry]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CacheEntry) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared between worker processes. Requires the `redis` package."""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis.asyncio as redis
+
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        data = await self._client.get(key)
+        return CacheEntry.unpack(data) if data is not None else None
+
+    async def set(self, key: str, value: CacheEntry) -> None:
+        await self._client.set(key, value.pack(), ex=self.ttl_seconds)
+
+    async def clear(self) -> None:
+        # Entries of older data versions are never read again and expire on their own
+        pass
+
+
+class ResponseCache:
+    """
+    Cache of serialized endpoint responses keyed by endpoint, date and language.
+
+    Every key embeds the data version marker that the scraper bumps after each write,
+    so a new scraper run invalidates all cached responses at once. The marker is
+    re-read from the database at most every `version_check_seconds`, which keeps
+    cache hits free of database round-trips.
+    """
+
+    def __init__(self, backend, version_check_seconds: float):
+        self.backend = backend
+        self.version_check_seconds = version_check_seconds
+        self._version: int = 0
+        self._version_checked_at: Optional[float] = None
+
+    async def current_version(self) -> int:
+        now = time.monotonic()
+        if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_seconds:
+            return self._version
+
+        self._version_checked_at = now
+        if not database.db_pool:
+            return self._version
+        try:
+            async with database.acquire_connection() as conn:
+                version = await queries.fetchval(conn, DATA_VERSION_QUERY)
+        except Exception as e:
+            logger.warning(f"Failed to read data version marker: {e}")
+            return self._version
+
+        version = version or 0
+        if version != self._version:
+            logger.info(f"Data version changed from {self._version} to {version}, invalidating response cache")
+            self._version = version
+            await self.backend.clear()
+        return self._version
+
+    async def make_key(self, endpoint: str, date: dt_date, language: str, *extra) -> str:
+        version = await self.current_version()
+        return f"hns:{version}:{cache_seed(endpoint, date, language, *extra)}"
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {e}")
+            return None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        try:
+            await self.backend.set(key, entry)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {key}: {e}")
+
+    async def respond(
+        self,
+        request: Request,
+        key: str,
+        prepare: Callable[[asyncpg.Connection], Awaitable[PreparedResponse]]
+    ) -> Response:
+        """
+        Serve the response for `key` from the cache, or fetch it with `prepare` on a miss.
+
+        Conditional requests are answered with 304 before the body is rendered,
+        both on a cache hit and on a miss. Compressed variants are produced once
+        when the entry is stored and served as-is to clients that accept them.
+        """
+        entry = await self.get(key)
+        record_cache_lookup("response", key.split(":")[2], entry is not None)
+        if entry is None:
+            async with database.acquire_connection() as conn:
+                prepared = await prepare(conn)
+
+                # The version prefix is left out so ETags survive unrelated scraper writes
+                etag, last_modified = compute_validators(key.split(":", 2)[2], prepared.validator_rows)
+                validators = CacheEntry(etag, last_modified, b"")
+                if not_modified(request, validators):
+                    return Response(status_code=304, headers=cache_headers(validators))
+
+                body = await prepared.render()
+            # Compress once per cache fill; hits reuse the stored bytes
+            entry = validators._replace(body=body, variants=compress_variants(body))
+            await self.set(key, entry)
+
+        headers = cache_headers(entry)
+        if not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), entry.variants)
+        if encoding == "identity":
+            return Response(content=entry.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(content=entry.variants[encoding], media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def create_cache_backend():
+    """Create the configured cache backend, falling back to memory if Redis is unavailable."""
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend(settings.CACHE_REDIS_URL, settings.CACHE_TTL_SECONDS)
+        except ImportError:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed, using in-memory cache")
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+
+
+response_cache = ResponseCache(create_cache_backend(), settings.CACHE_VERSION_CHECK_SECONDS)
@@ -0,0 +1,96 @@
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.utils.compression import StreamCompressor, available_encodings, compress, is_compressible
+from backend.utils.httputils import negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+
+class CompressionMiddleware:
+    """
+    Negotiate br/gzip for JSON and NDJSON responses that are not already encoded.
+
+    Complete bodies smaller than `minimum_size` are sent as they are. Responses
+    that already carry a Content-Encoding (pre-compressed cache entries and
+    snapshots) pass through untouched, so this only does work on cache misses
+    that could not reuse stored bytes and on streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), available_encodings())
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Message = None
+        self.active = False
+        self.started = False
+        self.compressor: StreamCompressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # Hold the start message until the first body chunk tells us whether to compress
+            self.start_message = message
+            self.active = (
+                message["status"] not in (204, 304)
+                and "content-encoding" not in headers
+                and is_compressible(headers.get("content-type", ""))
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if self.active and not more_body and len(body) < self.minimum_size:
+                self.active = False
+            if self.active:
+                headers["Content-Encoding"] = self.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    self.compressor = StreamCompressor(self.encoding)
+                else:
+                    body = compress(body, self.encoding)
+                    headers["Content-Length"] = str(len(body))
+                    message["body"] = body
+            await self.send(self.start_message)
+
+        if self.compressor is not None:
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.finish()
+            message["body"] = data
+
+        await self.send(message)
@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,4 +34,112 @@ class Settings:
 
     DATABASE_URL: str = os.getenv("DATABASE_URL", default_database_url)
 
+    # asyncpg connection pool
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    # Connections are replaced after this many queries or this long idle
+    DB_POOL_MAX_QUERIES = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
+    DB_POOL_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", "300"))
+    DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+    DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    # Open and prepare the minimum number of connections before serving requests
+    DB_POOL_WARMUP = os.getenv("DB_POOL_WARMUP", "true").lower() == "true"
+    # How long shutdown waits for checked-out connections before terminating them
+    DB_POOL_CLOSE_TIMEOUT = float(os.getenv("DB_POOL_CLOSE_TIMEOUT", "10"))
+
+    # Response cache for the read endpoints ("memory" or "redis")
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "900"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    # How often the data version marker bumped by the scraper is re-read
+    CACHE_VERSION_CHECK_SECONDS = float(os.getenv("CACHE_VERSION_CHECK_SECONDS", "10"))
+    # Decoded cross-source analysis documents kept in memory, keyed by row id
+    DOCUMENT_CACHE_MAX_ENTRIES = int(os.getenv("DOCUMENT_CACHE_MAX_ENTRIES", "64"))
+
+    # Cache-Control lifetimes sent to browsers and CDNs
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "300"))
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "3600"))
+
+    # Static JSON snapshots written by the scraper when SNAPSHOT_PUBLISH is set. The
+    # scrape workflow publishes them to the frontend's GitHub Pages site; the API serves
+    # them from SNAPSHOT_DIR where that is its own (shared) directory, e.g. after
+    # running scripts/publisher.py on the API host
+    SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(backend_dir, "snapshots"))
+    SNAPSHOT_SERVE = os.getenv("SNAPSHOT_SERVE", "true").lower() == "true"
+    SNAPSHOT_PUBLISH = os.getenv("SNAPSHOT_PUBLISH", "false").lower() == "true"
+    # Dates kept in the manifest, counted back from the newest published one
+    SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "7"))
+
+    # Response compression: bodies below COMPRESSION_MIN_SIZE bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+    # Production server (python -m backend.serve); SERVER_WORKERS=0 uses one worker per CPU
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "20"))
+    # Load the data version, snapshot manifest and latest analyses before serving
+    CACHE_PREWARM = os.getenv("CACHE_PREWARM", "true").lower() == "true"
+
+    # Date range requests (?from=&to=), streamed as NDJSON in pages of dates
+    RANGE_MAX_DAYS = int(os.getenv("RANGE_MAX_DAYS", "366"))
+    RANGE_PAGE_DAYS = int(os.getenv("RANGE_PAGE_DAYS", "7"))
+
+    # Days covered by /stats/coverage when no `from` is given
+    STATS_DEFAULT_DAYS = int(os.getenv("STATS_DEFAULT_DAYS", "30"))
+
+    # Largest page of results returned by /search
+    SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "50"))
+
+    # Months of scraped articles and summaries kept in Postgres besides the current one;
+    # scripts/retention.py archives and detaches older monthly partitions (0 keeps everything)
+    ARTICLE_RETENTION_MONTHS = int(os.getenv("ARTICLE_RETENTION_MONTHS", "12"))
+    SUMMARY_RETENTION_MONTHS = int(os.getenv("SUMMARY_RETENTION_MONTHS", "0"))
+    RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "archive")
+
+    # Prometheus metrics at /metrics (request latency, response sizes, pool waits, cache hit ratios)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # On-demand sampling profiler for single requests (X-Profile: 1 header or ?profile=1);
+    # requests must also send PROFILING_TOKEN in X-Profile-Token, and the API refuses
+    # to start with profiling enabled but no token
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+
+    # Scraper pipeline instrumentation: each run is appended as one JSON line to
+    # PIPELINE_METRICS_FILE (empty disables it) and, when OTEL_EXPORTER_OTLP_ENDPOINT
+    # is set and the OpenTelemetry SDK is installed, exported to that collector
+    PIPELINE_METRICS_FILE = os.getenv("PIPELINE_METRICS_FILE", "pipeline_metrics.jsonl")
+    OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+
+    # Near-duplicate articles (same content under another URL) are collapsed per outlet
+    # before summarization; cross-outlet duplicates are flagged to the cross-source step
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+    DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", "50"))
+
+    # The cross-source prompt only gets topics pre-grouped into clusters covered by two or
+    # more sources (TF-IDF cosine similarity, average linkage), most widely covered first
+    TOPIC_CLUSTERING_ENABLED = os.getenv("TOPIC_CLUSTERING_ENABLED", "true").lower() == "true"
+    TOPIC_CLUSTER_THRESHOLD = float(os.getenv("TOPIC_CLUSTER_THRESHOLD", "0.2"))
+    TOPIC_CLUSTER_MAX_CLUSTERS = int(os.getenv("TOPIC_CLUSTER_MAX_CLUSTERS", "15"))
+
+    # Every LLM call of a run is written to the llm_calls table; the cost is estimated
+    # from the (input, output) prices in USD per million tokens of the call's model.
+    # LLM_MODEL_PRICES adds or overrides models as JSON, e.g. {"gemini-2.0-flash": [0.10, 0.40]}
+    LLM_LEDGER_ENABLED = os.getenv("LLM_LEDGER_ENABLED", "true").lower() == "true"
+    LLM_MODEL_PRICES = {
+        "gemini-2.0-flash": (0.10, 0.40),
+        "gemini-2.0-flash-lite": (0.075, 0.30),
+        # Thinking is on by default for the 2.5 preview, so its output is priced as thinking output
+        "gemini-2.5-flash-preview-04-17": (0.15, 3.50),
+        "gemini-2.5-flash": (0.30, 2.50),
+        "gemini-2.5-pro": (1.25, 10.00),
+        **{model: tuple(prices) for model, prices in json.loads(os.getenv("LLM_MODEL_PRICES", "{}")).items()},
+    }
+
 settings = Settings()
\ No newline at end of file
@@ -1,14 +1,121 @@
 import os
+import time
+import asyncio
 import asyncpg
 import logging
+from collections import deque
 from contextlib import asynccontextmanager
+from typing import Any, Dict
 from backend.config import settings
+from backend.metrics import ACQUIRE_BUCKETS, registry
+from backend.queries import queries
+from backend.utils.jsonutils import dumps_str, loads
 
 logger = logging.getLogger(__name__)
 
 # Global connection pool
 db_pool = None
 
+
+class PoolMetrics:
+    """Acquire wait times, failures and usage of the connection pool, for capacity planning."""
+
+    def __init__(self, window: int = 1024):
+        self.acquires = 0
+        self.acquire_failures = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # Most recent wait times, for percentiles
+        self._recent_waits = deque(maxlen=window)
+
+    def record_acquire(self, wait_seconds: float) -> None:
+        POOL_ACQUIRE_DURATION.observe(wait_seconds)
+        self.acquires += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self._recent_waits.append(wait_seconds)
+
+    def record_failure(self) -> None:
+        POOL_ACQUIRE_FAILURES.inc()
+        self.acquire_failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self._recent_waits)
+
+        def percentile(p: float) -> float:
+            return waits[min(int(len(waits) * p), len(waits) - 1)] if waits else 0.0
+
+        size = db_pool.get_size() if db_pool else 0
+        idle = db_pool.get_idle_size() if db_pool else 0
+        return {
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "min_size": db_pool.get_min_size() if db_pool else 0,
+            "max_size": db_pool.get_max_size() if db_pool else 0,
+            "acquires": self.acquires,
+            "acquire_failures": self.acquire_failures,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_p50": percentile(0.50),
+            "wait_seconds_p99": percentile(0.99),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+POOL_ACQUIRE_DURATION = registry.histogram(
+    "db_pool_acquire_seconds", "Time spent waiting for a connection from the pool.",
+    buckets=ACQUIRE_BUCKETS,
+)
+POOL_ACQUIRE_FAILURES = registry.counter(
+    "db_pool_acquire_failures_total", "Pool acquires that timed out or failed."
+)
+
+
+def _pool_connections() -> Dict[tuple, float]:
+    size = db_pool.get_size() if db_pool else 0
+    idle = db_pool.get_idle_size() if db_pool else 0
+    return {("in_use",): size - idle, ("idle",): idle}
+
+
+registry.gauge_function("db_pool_connections", "Open pool connections by state.", _pool_connections, ["state"])
+registry.gauge_function(
+    "db_pool_max_connections", "Configured maximum size of the pool.",
+    lambda: db_pool.get_max_size() if db_pool else settings.DB_POOL_MAX_SIZE
+)
+
+async def register_json_codecs(conn):
+    """Decode json/jsonb columns with the fast JSON decoder instead of returning text."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=dumps_str,
+            decoder=loads,
+            schema="pg_catalog",
+            format="text"
+        )
+
+async def init_connection(conn):
+    """Set up a new pool connection: JSON codecs, then the registered hot statements."""
+    await register_json_codecs(conn)
+    await queries.prepare_all(conn)
+
+async def warm_pool():
+    """Acquire the minimum number of connections at once so each is opened and prepared before traffic."""
+    started = time.perf_counter()
+    count = db_pool.get_min_size()
+
+    async def touch():
+        async with acquire_connection() as conn:
+            await conn.execute("SELECT 1")
+
+    await asyncio.gather(*(touch() for _ in range(count)))
+    logger.info(
+        f"Warmed {count} database connections with {len(queries.names)} prepared statements "
+        f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+    )
+
 async def init_db():
     """Initialize the database connection pool."""
     global db_pool
@@ -16,10 +123,17 @@ async def init_db():
         logger.info("Creating database connection pool...")
         db_pool = await asyncpg.create_pool(
             settings.DATABASE_URL,
-            min_size=5,
-            max_size=20
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            init=init_connection
         )
         logger.info("Database connection pool created successfully")
+        if settings.DB_POOL_WARMUP:
+            await warm_pool()
     except Exception as e:
         logger.error(f"Failed to create database connection pool: {e}")
         raise
@@ -29,19 +143,45 @@ async def close_db():
     global db_pool
     if db_pool:
         logger.info("Closing database connection pool...")
-        await db_pool.close()
+        try:
+            await asyncio.wait_for(db_pool.close(), timeout=settings.DB_POOL_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for connections to be released, terminating the pool")
+            db_pool.terminate()
+        db_pool = None
         logger.info("Database connection pool closed")
 
 @asynccontextmanager
 async def lifespan_context(app):
     """Context manager for FastAPI lifespan."""
     await init_db()
-    yield
-    await close_db()
+    if settings.CACHE_PREWARM:
+        # Imported here because the caches depend on this module
+        from backend.warmup import prewarm_caches
+        await prewarm_caches()
+    try:
+        yield
+    finally:
+        await close_db()
 
-async def get_connection():
-    """Dependency for getting a database connection."""
+@asynccontextmanager
+async def acquire_connection():
+    """Acquire a connection from the pool for the duration of the block."""
     if not db_pool:
         raise RuntimeError("Database connection pool not initialized")
-    async with db_pool.acquire() as conn:
+    started = time.perf_counter()
+    try:
+        conn = await db_pool.acquire(timeout=settings.DB_POOL_ACQUIRE_TIMEOUT)
+    except Exception:
+        pool_metrics.record_failure()
+        raise
+    pool_metrics.record_acquire(time.perf_counter() - started)
+    try:
+        yield conn
+    finally:
+        await db_pool.release(conn)
+
+async def get_connection():
+    """Dependency for getting a database connection."""
+    async with acquire_connection() as conn:
         yield conn
\ No newline at end of file
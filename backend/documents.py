@@ -0,0 +1,280 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import asyncpg
+
+from backend.config import settings
+from backend.metrics import record_cache_lookup
+from backend.models.enums import PoliticalLeaning, Sentiment
+from backend.queries import queries
+from backend.utils.jsonutils import loads
+from backend.utils.textutils import normalize_domain
+from backend.utils.topicindex import TopicIndex, assign_topic_ids
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_DOCUMENT_QUERY = queries.register("analysis_document", '''
+    SELECT analysis_json FROM cross_source_analyses WHERE id = $1
+''')
+
+
+class CachedAnalysis(NamedTuple):
+    document: Dict[str, Any]
+    topic_index: TopicIndex
+
+
+class AnalysisDocumentCache:
+    """
+    LRU cache of decoded cross-source analysis documents keyed by `cross_source_analyses.id`,
+    each stored together with the topic index built over it.
+
+    Analysis rows are never updated after insertion, so a cached document stays
+    valid for as long as it is kept.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._documents: "OrderedDict[int, CachedAnalysis]" = OrderedDict()
+
+    def get(self, analysis_id: int) -> Optional[CachedAnalysis]:
+        cached = self._documents.get(analysis_id)
+        record_cache_lookup("document", "analysis", cached is not None)
+        if cached is not None:
+            self._documents.move_to_end(analysis_id)
+        return cached
+
+    def set(self, analysis_id: int, cached: CachedAnalysis) -> None:
+        self._documents[analysis_id] = cached
+        self._documents.move_to_end(analysis_id)
+        while len(self._documents) > self.max_entries:
+            self._documents.popitem(last=False)
+
+
+analysis_documents = AnalysisDocumentCache(settings.DOCUMENT_CACHE_MAX_ENTRIES)
+
+
+def normalize_analysis_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize an analysis document in place: canonical domain names for every
+    source coverage entry and a stable `topic_id` for every unified topic.
+    """
+    for topic in document.get("unified_topics", []):
+        for source in topic.get("source_coverage") or []:
+            if "domain" in source:
+                source["domain"] = normalize_domain(source["domain"])
+    return assign_topic_ids(document)
+
+
+class UnifiedTopicRow(NamedTuple):
+    position: int
+    topic_id: str
+    name: str
+    comparative_analysis: Optional[str]
+
+
+class SourceCoverageRow(NamedTuple):
+    position: int
+    domain: str
+    original_topic_name: Optional[str]
+    sentiment: int
+    political_leaning: int
+    framing: Optional[str]
+    key_phrases: List[str]
+    article_urls: List[str]
+
+
+def _text_list(value: Any) -> List[str]:
+    return [str(item) for item in value] if isinstance(value, list) else []
+
+
+def unified_topic_rows(topics: List[Dict[str, Any]]) -> Tuple[List[UnifiedTopicRow], List[SourceCoverageRow]]:
+    """
+    The unified_topics and source_coverage rows of the topics of a normalized
+    analysis document, with sentiment and political leaning as their smallint codes.
+
+    Coverage rows refer to their topic by position. The scraper and the
+    backfills of existing analyses both build their rows here.
+    """
+    topic_rows: List[UnifiedTopicRow] = []
+    coverage_rows: List[SourceCoverageRow] = []
+    for position, topic in enumerate(topics):
+        topic_rows.append(UnifiedTopicRow(
+            position, topic["topic_id"], topic.get("name") or "", topic.get("comparative_analysis")
+        ))
+        sources = topic.get("source_coverage")
+        for source in sources if isinstance(sources, list) else []:
+            coverage_rows.append(SourceCoverageRow(
+                position,
+                source.get("domain") or "",
+                source.get("original_topic_name"),
+                Sentiment.from_string(source.get("sentiment")).code,
+                PoliticalLeaning.from_string(source.get("political_leaning")).code,
+                source.get("framing"),
+                _text_list(source.get("key_phrases")),
+                _text_list(source.get("article_urls")),
+            ))
+    return topic_rows, coverage_rows
+
+
+async def load_cached_analysis(conn: asyncpg.Connection, analysis_id: int) -> CachedAnalysis:
+    """
+    Return the decoded, normalized analysis document for a row id and its topic index.
+
+    The JSONB column is only fetched and decoded on a cache miss. The returned
+    document is shared between requests and must not be mutated.
+    """
+    cached = analysis_documents.get(analysis_id)
+    if cached is None:
+        value = await queries.fetchval(conn, ANALYSIS_DOCUMENT_QUERY, analysis_id)
+        cached = _cache_analysis(analysis_id, value)
+    return cached
+
+
+async def load_analysis_documents(conn: asyncpg.Connection, analysis_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Return the decoded, normalized analysis documents for several row ids,
+    fetching every cache miss in a single query.
+    """
+    documents: Dict[int, Dict[str, Any]] = {}
+    missing: List[int] = []
+    for analysis_id in analysis_ids:
+        cached = analysis_documents.get(analysis_id)
+        if cached is None:
+            missing.append(analysis_id)
+        else:
+            documents[analysis_id] = cached.document
+
+    if missing:
+        rows = await conn.fetch('''
+            SELECT id, analysis_json FROM cross_source_analyses WHERE id = ANY($1::int[])
+        ''', missing)
+        for row in rows:
+            documents[row['id']] = _cache_analysis(row['id'], row['analysis_json']).document
+
+    return documents
+
+
+def _cache_analysis(analysis_id: int, value: Any) -> CachedAnalysis:
+    # Connections without the JSONB codec return the raw text
+    if isinstance(value, str):
+        value = loads(value)
+    document = normalize_analysis_document(value or {})
+    cached = CachedAnalysis(document, TopicIndex(document.get("unified_topics", [])))
+    analysis_documents.set(analysis_id, cached)
+    return cached
+
+
+async def load_analysis_document(conn: asyncpg.Connection, analysis_id: int) -> Dict[str, Any]:
+    """Return the decoded, normalized analysis document for a row id."""
+    return (await load_cached_analysis(conn, analysis_id)).document
+
+
+async def load_topic_index(conn: asyncpg.Connection, analysis_id: int) -> TopicIndex:
+    """Return the topic index of the analysis with the given row id."""
+    return (await load_cached_analysis(conn, analysis_id)).topic_index
+
+
+# Fields a projection may select, per level of the analysis document
+TOPIC_FIELDS = frozenset({"topic_id", "name", "comparative_analysis"})
+COVERAGE_FIELDS = frozenset({
+    "domain", "original_topic_name", "sentiment", "political_leaning",
+    "key_phrases", "framing", "article_urls",
+})
+# Always kept so projected documents can still be normalized and keyed by topic
+REQUIRED_TOPIC_FIELDS = frozenset({"topic_id", "name"})
+REQUIRED_COVERAGE_FIELDS = frozenset({"domain"})
+
+
+class AnalysisProjection(NamedTuple):
+    topic_fields: FrozenSet[str]
+    coverage_fields: FrozenSet[str]
+
+    @property
+    def cache_part(self) -> str:
+        """Stable identifier of the projection for cache keys."""
+        return "fields=" + ",".join(sorted(self.topic_fields | self.coverage_fields))
+
+
+# The slim projection used by topic cards and the sentiment dashboard
+SUMMARY_PROJECTION = AnalysisProjection(
+    frozenset({"topic_id", "name", "comparative_analysis"}),
+    frozenset({"domain", "sentiment", "political_leaning"}),
+)
+
+
+def make_projection(fields: List[str]) -> AnalysisProjection:
+    """Build a projection from requested field names; unknown names are ignored."""
+    requested = {field.strip() for field in fields}
+    return AnalysisProjection(
+        frozenset((requested & TOPIC_FIELDS) | REQUIRED_TOPIC_FIELDS),
+        frozenset((requested & COVERAGE_FIELDS) | REQUIRED_COVERAGE_FIELDS),
+    )
+
+
+# Rebuilds the stored document keeping only the selected keys of every topic and
+# source coverage entry, so the unselected text never leaves the database
+ANALYSIS_PROJECTION_QUERY = '''
+    SELECT
+        (a.analysis_json - 'unified_topics') || jsonb_build_object('unified_topics', COALESCE((
+            SELECT jsonb_agg(
+                (
+                    SELECT COALESCE(jsonb_object_agg(tk.key, tk.value), '{}'::jsonb)
+                    FROM jsonb_each(t.topic) AS tk
+                    WHERE tk.key = ANY($2::text[])
+                ) || jsonb_build_object('source_coverage', COALESCE((
+                    SELECT jsonb_agg((
+                        SELECT COALESCE(jsonb_object_agg(ck.key, ck.value), '{}'::jsonb)
+                        FROM jsonb_each(c.coverage) AS ck
+                        WHERE ck.key = ANY($3::text[])
+                    ) ORDER BY c.ord)
+                    FROM jsonb_array_elements(t.topic->'source_coverage') WITH ORDINALITY AS c(coverage, ord)
+                ), '[]'::jsonb))
+                ORDER BY t.ord
+            )
+            FROM jsonb_array_elements(a.analysis_json->'unified_topics') WITH ORDINALITY AS t(topic, ord)
+        ), '[]'::jsonb))
+    FROM cross_source_analyses a
+    WHERE a.id = $1
+'''
+
+
+async def load_analysis_projection(
+    conn: asyncpg.Connection,
+    analysis_id: int,
+    projection: AnalysisProjection
+) -> Dict[str, Any]:
+    """
+    Return the analysis document for a row id reduced to the projected fields.
+
+    A fully decoded cached document is projected in memory; otherwise the
+    projection runs in the database. Projected documents are not cached here,
+    the response cache keeps their rendered bodies.
+    """
+    cached = analysis_documents.get(analysis_id)
+    if cached is not None:
+        return project_analysis_document(cached.document, projection)
+
+    value = await conn.fetchval(
+        ANALYSIS_PROJECTION_QUERY, analysis_id,
+        sorted(projection.topic_fields), sorted(projection.coverage_fields)
+    )
+    if isinstance(value, str):
+        value = loads(value)
+    return normalize_analysis_document(value or {})
+
+
+def project_analysis_document(document: Dict[str, Any], projection: AnalysisProjection) -> Dict[str, Any]:
+    """In-memory equivalent of ANALYSIS_PROJECTION_QUERY for already decoded documents."""
+    projected = {key: value for key, value in document.items() if key != "unified_topics"}
+    projected["unified_topics"] = [
+        {
+            **{key: value for key, value in topic.items() if key in projection.topic_fields},
+            "source_coverage": [
+                {key: value for key, value in source.items() if key in projection.coverage_fields}
+                for source in topic.get("source_coverage", [])
+            ],
+        }
+        for topic in document.get("unified_topics", [])
+    ]
+    return projected
@@ -1,19 +1,81 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Any, Dict, Optional, List
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Any, Callable, Dict, Optional, List
 from datetime import date as dt_date
 import asyncpg
-import json
 
-from backend.database import get_connection
-from backend.utils.textutils import normalize_domain 
+from backend.cache import PreparedResponse, response_cache
+from backend.documents import (
+    SUMMARY_PROJECTION,
+    AnalysisProjection,
+    load_analysis_document,
+    load_analysis_documents,
+    load_analysis_projection,
+    load_topic_index,
+    make_projection,
+)
+from backend.queries import queries
+from backend.ranges import ndjson_range_response, resolve_date_range
+from backend.snapshots import snapshot_store
+from backend.utils.jsonutils import dumps
+from backend.utils.topicindex import TopicIndex
 
 router = APIRouter(tags=["analysis"])
 
+# Both branches are primary-key lookups on latest_cross_source_analysis;
+# the fallback branch only runs when the requested date has no analysis
+LATEST_ANALYSIS_WITH_FALLBACK_QUERY = queries.register("latest_analysis_with_fallback", '''
+    (
+        SELECT analysis_id AS id, date, language, created_at, 0 AS priority
+        FROM latest_cross_source_analysis
+        WHERE language = $1 AND date = $2
+    )
+    UNION ALL
+    (
+        SELECT analysis_id AS id, date, language, created_at, 1 AS priority
+        FROM latest_cross_source_analysis
+        WHERE language = $1
+        ORDER BY date DESC
+        LIMIT 1
+    )
+    ORDER BY priority
+    LIMIT 1
+''')
+
+LATEST_ANALYSIS_QUERY = queries.register("latest_analysis", '''
+    SELECT
+        analysis_id AS id,
+        created_at
+    FROM
+        latest_cross_source_analysis
+    WHERE
+        language = $1 AND
+        date = $2
+''')
+
+
+def _prepared(
+    conn: asyncpg.Connection,
+    row: Optional[asyncpg.Record],
+    render: Callable[[Any], Dict[str, Any]],
+    load=load_analysis_document
+) -> PreparedResponse:
+    """Defer loading the analysis document (or its topic index) of `row` until the body is actually rendered."""
+    async def render_body() -> bytes:
+        loaded = await load(conn, row['id']) if row else None
+        return dumps(render(loaded))
+
+    return PreparedResponse([row] if row else [], render_body)
+
+
 @router.get("/cross-source-analysis")
 async def get_cross_source_analysis(
+    request: Request,
     date: Optional[dt_date] = Query(default=None, description="Date to retrieve analysis for (default: today)"),
     language: str = Query(default="hu", description="Language code (hu, en)"),
-    conn: asyncpg.Connection = Depends(get_connection)
+    date_from: Optional[dt_date] = Query(default=None, alias="from", description="First date of a range"),
+    date_to: Optional[dt_date] = Query(default=None, alias="to", description="Last date of a range (default: today)"),
+    view: str = Query(default="full", description="Response view (full, summary)"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated topic and source coverage fields to include"),
 ):
     """
     Retrieve the cross-source news analysis for a specific date.
@@ -25,88 +87,138 @@ async def get_cross_source_analysis(
         - JSON object containing unified topics across sources
         - Each topic includes coverage from different sources
         - Comparative analysis of how each topic is presented by different media outlets
+
+    With `from` (and optionally `to`) the analyses of every date in the range that has one
+    are streamed as NDJSON instead, one response object per line, without the fallback.
+
+    `view=summary` keeps only topic names, comparative analyses, and each source's
+    domain, sentiment and political leaning. `fields=` selects the topic and source
+    coverage fields explicitly (names, topic ids and domains are always included).
+    Both are projected in the database, so unselected fields are never decoded.
     """
     current_date = date if date is not None else dt_date.today()
 
     if language not in ["hu", "en"]:
         language = "hu" #Default
+
+    if view not in ["full", "summary"]:
+        view = "full" #Default
+
+    projection = resolve_projection(view, fields)
+
+    if date_from is not None:
+        start, end = resolve_date_range(date_from, date_to)
+        return stream_cross_source_analysis_range(language, start, end, projection)
     
+    async def prepare(conn: asyncpg.Connection) -> PreparedResponse:
+        row = await fetch_cross_source_analysis(conn, current_date, language)
+        return _prepared(
+            conn, row,
+            lambda document: render_cross_source_analysis(row, document, current_date),
+            load=_document_loader(projection)
+        )
+
+    extra = [projection.cache_part] if projection is not None else []
+    # Snapshots only hold the full view
+    if projection is None:
+        snapshot = await snapshot_store.respond(request, "cross-source-analysis", current_date, language)
+        if snapshot is not None:
+            return snapshot
+
     try:
-        # Query the cross_source_analyses table
-        row = await conn.fetchrow('''
-            SELECT 
-                id,
-                date,
-                analysis_json,
-                language,
-                created_at
-            FROM 
-                cross_source_analyses
-            WHERE 
-                date = $1 AND
-                language = $2
-            ORDER BY 
-                created_at DESC
-            LIMIT 1
-        ''', current_date, language)
-        
-        if not row:
-            # If no analysis for the requested date, try to find the most recent one
-            row = await conn.fetchrow('''
-                SELECT 
-                    id,
-                    date,
-                    analysis_json,
-                    language,
-                    created_at
-                FROM 
-                    cross_source_analyses
-                WHERE
-                    language = $1
-                ORDER BY 
-                    date DESC, created_at DESC
-                LIMIT 1
-            ''', language)
-            
-            if not row:
-                return {
-                    "success": False,
-                    "message": "No cross-source analysis found in the database",
-                    "date": current_date.isoformat(),
-                    "analysis": None
-                }
-        
-        # Parse the JSON data
-        analysis_data = json.loads(row['analysis_json'])
-
-        # Normalize domain names in the data
-        if "unified_topics" in analysis_data:
-            for topic in analysis_data["unified_topics"]:
-                if "source_coverage" in topic:
-                    for source in topic["source_coverage"]:
-                        if "domain" in source:
-                            source["domain"] = normalize_domain(source["domain"])
-        
-        return {
-            "success": True,
-            "date": row['date'].isoformat(),
-            "analysis": analysis_data,
-            "language": row['language'],
-            "created_at": row['created_at'].isoformat() if row['created_at'] else None,
-            "requested_date": current_date.isoformat() if current_date != row['date'] else None
-        }
-        
+        cache_key = await response_cache.make_key("cross-source-analysis", current_date, language, *extra)
+        return await response_cache.respond(request, cache_key, prepare)
     except Exception as e:
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail=f"Failed to fetch cross-source analysis: {str(e)}"
         )
 
+async def fetch_cross_source_analysis(
+    conn: asyncpg.Connection,
+    current_date: dt_date,
+    language: str
+) -> Optional[asyncpg.Record]:
+    """Query the latest cross-source analysis for the date, falling back to the most recent one."""
+    return await queries.fetchrow(conn, LATEST_ANALYSIS_WITH_FALLBACK_QUERY, language, current_date)
+
+def resolve_projection(view: str, fields: Optional[str]) -> Optional[AnalysisProjection]:
+    """Return the requested projection of the analysis document, or None for the full document."""
+    if fields:
+        return make_projection(fields.split(","))
+    if view == "summary":
+        return SUMMARY_PROJECTION
+    return None
+
+def _document_loader(projection: Optional[AnalysisProjection]):
+    if projection is None:
+        return load_analysis_document
+
+    async def load(conn: asyncpg.Connection, analysis_id: int) -> Dict[str, Any]:
+        return await load_analysis_projection(conn, analysis_id, projection)
+
+    return load
+
+def stream_cross_source_analysis_range(
+    language: str,
+    start: dt_date,
+    end: dt_date,
+    projection: Optional[AnalysisProjection] = None
+):
+    """Stream the latest cross-source analysis of every date in [start, end] as NDJSON."""
+    load_document = _document_loader(projection)
+
+    async def fetch_page(conn: asyncpg.Connection, after: dt_date, end: dt_date, limit: int) -> List[asyncpg.Record]:
+        rows = await conn.fetch('''
+            SELECT analysis_id AS id, date, language, created_at
+            FROM latest_cross_source_analysis
+            WHERE
+                language = $1 AND
+                date > $2 AND
+                date <= $3
+            ORDER BY date
+            LIMIT $4
+        ''', language, after, end, limit)
+        if projection is None:
+            # Decode the whole page's documents with one query; render_day then hits the cache
+            await load_analysis_documents(conn, [row['id'] for row in rows])
+        return rows
+
+    async def render_day(conn: asyncpg.Connection, rows: List[asyncpg.Record]) -> bytes:
+        row = rows[0]
+        document = await load_document(conn, row['id'])
+        return dumps(render_cross_source_analysis(row, document, row['date']))
+
+    return ndjson_range_response(start, end, fetch_page, render_day)
+
+def render_cross_source_analysis(
+    row: Optional[asyncpg.Record],
+    document: Optional[Dict[str, Any]],
+    current_date: dt_date
+) -> Dict[str, Any]:
+    """Build the /cross-source-analysis response from an analysis row and its decoded document."""
+    if not row:
+        return {
+            "success": False,
+            "message": "No cross-source analysis found in the database",
+            "date": current_date.isoformat(),
+            "analysis": None
+        }
+            
+    return {
+        "success": True,
+        "date": row['date'].isoformat(),
+        "analysis": document,
+        "language": row['language'],
+        "created_at": row['created_at'].isoformat() if row['created_at'] else None,
+        "requested_date": current_date.isoformat() if current_date != row['date'] else None
+    }
+
 @router.get("/unified-topics")
 async def get_unified_topics(
+    request: Request,
     date: Optional[dt_date] = Query(default=None, description="Date to retrieve topics for (default: today)"),
     language: str = Query(default="hu", description="Language code (hu, en)"),
-    conn: asyncpg.Connection = Depends(get_connection)
 ):
     """
     Retrieve just the list of unified topics for a specific date.
@@ -118,60 +230,66 @@ async def get_unified_topics(
     if language not in ["hu", "en"]:
         language = "hu" #Default
     
+    async def prepare(conn: asyncpg.Connection) -> PreparedResponse:
+        row = await fetch_analysis_for_date(conn, current_date, language)
+        return _prepared(conn, row, lambda document: render_unified_topics(document, current_date, language))
+
+    snapshot = await snapshot_store.respond(request, "unified-topics", current_date, language)
+    if snapshot is not None:
+        return snapshot
+
     try:
-        # Query the cross_source_analyses table
-        row = await conn.fetchrow('''
-            SELECT 
-                analysis_json
-            FROM 
-                cross_source_analyses
-            WHERE 
-                date = $1 AND
-                language = $2
-            ORDER BY 
-                created_at DESC
-            LIMIT 1
-        ''', current_date, language)
-        
-        if not row:
-            return {
-                "success": False,
-                "message": f"No analysis found for date {current_date.isoformat()}",
-                "topics": []
-            }
-        
-        # Parse the JSON data and extract just the topic names
-        analysis_data = json.loads(row['analysis_json'])
-        topics = []
-        
-        if "unified_topics" in analysis_data:
-            for topic in analysis_data["unified_topics"]:
-                sources = [source["domain"] for source in topic.get("source_coverage", [])]
-                topics.append({
-                    "name": topic["name"],
-                    "sources": sources,
-                    "source_count": len(sources)
-                })
-        
-        return {
-            "success": True,
-            "date": current_date.isoformat(),
-            "topics": topics,
-            "language": language,
-        }
-        
+        cache_key = await response_cache.make_key("unified-topics", current_date, language)
+        return await response_cache.respond(request, cache_key, prepare)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to fetch unified topics: {str(e)}"
         )
 
+async def fetch_analysis_for_date(
+    conn: asyncpg.Connection,
+    current_date: dt_date,
+    language: str
+) -> Optional[asyncpg.Record]:
+    """Query the latest cross-source analysis for exactly the given date."""
+    return await queries.fetchrow(conn, LATEST_ANALYSIS_QUERY, language, current_date)
+
+def render_unified_topics(document: Optional[Dict[str, Any]], current_date: dt_date, language: str) -> Dict[str, Any]:
+    """Build the /unified-topics response from a decoded analysis document."""
+    if document is None:
+        return {
+            "success": False,
+            "message": f"No analysis found for date {current_date.isoformat()}",
+            "topics": []
+        }
+
+    # Extract just the topic names
+    topics = []
+
+    if "unified_topics" in document:
+        for topic in document["unified_topics"]:
+            sources = [source["domain"] for source in topic.get("source_coverage", [])]
+            topics.append({
+                "topic_id": topic.get("topic_id"),
+                "name": topic["name"],
+                "sources": sources,
+                "source_count": len(sources)
+            })
+
+    return {
+        "success": True,
+        "date": current_date.isoformat(),
+        "topics": topics,
+        "language": language,
+    }
+
 @router.get("/topic-coverage/{topic_name}")
 async def get_topic_coverage(
+    request: Request,
     topic_name: str,
     date: Optional[dt_date] = Query(default=None, description="Date to retrieve topic coverage for (default: today)"),
     language: str = Query(default="hu", description="Language code (hu, en)"),
-    conn: asyncpg.Connection = Depends(get_connection)
 ):
     """
     Retrieve detailed coverage information for a specific topic.
@@ -184,53 +302,67 @@ async def get_topic_coverage(
     if language not in ["hu", "en"]:
         language = "hu" #Default
     
+    async def prepare(conn: asyncpg.Connection) -> PreparedResponse:
+        row = await fetch_analysis_for_date(conn, current_date, language)
+        return _prepared(
+            conn, row,
+            lambda topic_index: render_topic_coverage(topic_index, topic_name, current_date, language),
+            load=load_topic_index
+        )
+
+    snapshot = await snapshot_store.respond(request, "topic-coverage", current_date, language, topic_name.lower())
+    if snapshot is not None:
+        return snapshot
+
     try:
-        # Query the cross_source_analyses table
-        row = await conn.fetchrow('''
-            SELECT 
-                analysis_json
-            FROM 
-                cross_source_analyses
-            WHERE 
-                date = $1 AND
-                language = $2
-            ORDER BY 
-                created_at DESC
-            LIMIT 1
-        ''', current_date, language)
-        
-        if not row:
-            return {
-                "success": False,
-                "message": f"No analysis found for date {current_date.isoformat()}",
-                "topic": None,
-                "coverage": []
-            }
-        
-        # Parse the JSON data and find the requested topic
-        analysis_data = json.loads(row['analysis_json'])
-        
-        for topic in analysis_data.get("unified_topics", []):
-            # Case-insensitive partial matching for topic name
-            if topic_name.lower() in topic["name"].lower():
-                return {
-                    "success": True,
-                    "date": current_date.isoformat(),
-                    "topic": topic["name"],
-                    "coverage": topic.get("source_coverage", []),
-                    "comparative_analysis": topic.get("comparative_analysis", ""),
-                    "language": language,
-                }
-        
-        return {
-            "success": False,
-            "message": f"Topic '{topic_name}' not found for date {current_date.isoformat()}",
-            "topic": topic_name,
-            "coverage": []
-        }
-        
+        cache_key = await response_cache.make_key("topic-coverage", current_date, language, topic_name.lower())
+        return await response_cache.respond(request, cache_key, prepare)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to fetch topic coverage: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+def render_topic_coverage(
+    topic_index: Optional[TopicIndex],
+    topic_name: str,
+    current_date: dt_date,
+    language: str
+) -> Dict[str, Any]:
+    """
+    Look the requested topic up in the analysis' topic index and build the /topic-coverage response.
+
+    The best match is returned in full; every match is listed in `matches`, ranked by score.
+    """
+    if topic_index is None:
+        return {
+            "success": False,
+            "message": f"No analysis found for date {current_date.isoformat()}",
+            "topic": None,
+            "coverage": []
+        }
+
+    # Accent- and case-insensitive lookup by topic id, name, prefix or similarity
+    matches = topic_index.search(topic_name)
+    if matches:
+        topic = matches[0][0]
+        return {
+            "success": True,
+            "date": current_date.isoformat(),
+            "topic_id": topic.get("topic_id"),
+            "topic": topic["name"],
+            "coverage": topic.get("source_coverage", []),
+            "comparative_analysis": topic.get("comparative_analysis", ""),
+            "language": language,
+            "matches": [
+                {"topic_id": match.get("topic_id"), "name": match["name"], "score": score}
+                for match, score in matches
+            ],
+        }
+
+    return {
+        "success": False,
+        "message": f"Topic '{topic_name}' not found for date {current_date.isoformat()}",
+        "topic": topic_name,
+        "coverage": []
+    }
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from backend.database import pool_metrics
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+async def get_health():
+    """
+    Report service health and connection pool statistics.
+
+    Pool statistics cover connection usage and acquire wait times (recent
+    p50/p99, maximum, total) and failures since startup, for capacity planning.
+    """
+    return {
+        "status": "ok",
+        "database_pool": pool_metrics.snapshot(),
+    }
@@ -0,0 +1,206 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, List, Optional
+from datetime import date as dt_date
+import html
+
+import asyncpg
+
+from backend.config import settings
+from backend.database import acquire_connection
+from backend.queries import queries
+
+router = APIRouter(tags=["search"])
+
+SEARCH_TYPES = ["article", "topic", "summary"]
+
+# Unlikely in any scraped text; replaced by <mark> after the snippet is HTML-escaped
+HIGHLIGHT_START = "[[[hl]]]"
+HIGHLIGHT_STOP = "[[[/hl]]]"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    'MaxFragments=2, MaxWords=35, MinWords=15, FragmentDelimiter=" … "'
+)
+
+# Matches are ranked from the GIN-indexed search vectors alone; titles, URLs and
+# snippets are only fetched (and ts_headline only run) for the rows of the page.
+# Topics match on their name, framing or any of their key phrases.
+# Article, topic and key phrase vectors are always built with hungarian_unaccent
+# (a generated column cannot see the language of its domain analysis), so they
+# are matched with a hungarian_unaccent query in both languages; only summaries
+# have English vectors.
+# The total is counted apart from the page and the page is joined onto it, so
+# an offset past the last match still returns the total, in a row without a match.
+SEARCH_QUERY = queries.register("search", '''
+    WITH search AS (
+        SELECT
+            websearch_to_tsquery('hungarian_unaccent'::regconfig, $1) AS hu_query,
+            websearch_to_tsquery(
+                CASE WHEN $2 = 'en' THEN 'english' ELSE 'hungarian_unaccent' END::regconfig, $1
+            ) AS summary_query
+    ),
+    hits AS (
+        SELECT 'article'::text AS type, a.id, ts_rank_cd(a.search_vector, search.hu_query) AS rank, a.publication_date AS date
+        FROM scraped_articles a, search
+        WHERE 'article' = ANY($3) AND $2 = 'hu'
+            AND a.search_vector @@ search.hu_query
+            AND ($4::date IS NULL OR a.publication_date >= $4)
+            AND ($5::date IS NULL OR a.publication_date <= $5)
+        UNION ALL
+        SELECT 'topic', matches.id, max(matches.rank), da.date
+        FROM (
+            SELECT ta.id, ts_rank_cd(ta.search_vector, search.hu_query) AS rank
+            FROM topic_analyses ta, search
+            WHERE 'topic' = ANY($3) AND ta.search_vector @@ search.hu_query
+            UNION ALL
+            SELECT kp.topic_analysis_id, ts_rank_cd(kp.search_vector, search.hu_query)
+            FROM key_phrases kp, search
+            WHERE 'topic' = ANY($3) AND kp.search_vector @@ search.hu_query
+        ) matches
+        JOIN topic_analyses ta ON ta.id = matches.id
+        JOIN domain_analyses da ON da.id = ta.domain_analysis_id
+        WHERE da.language = $2
+            AND ($4::date IS NULL OR da.date >= $4)
+            AND ($5::date IS NULL OR da.date <= $5)
+        GROUP BY matches.id, da.date
+        UNION ALL
+        SELECT 'summary', s.id, ts_rank_cd(s.search_vector, search.summary_query), s.date
+        FROM summaries s, search
+        WHERE 'summary' = ANY($3) AND s.language = $2
+            AND s.search_vector @@ search.summary_query
+            AND ($4::date IS NULL OR s.date >= $4)
+            AND ($5::date IS NULL OR s.date <= $5)
+    ),
+    total AS (
+        SELECT count(*) AS total FROM hits
+    ),
+    page AS (
+        SELECT type, id, rank, date
+        FROM hits
+        ORDER BY rank DESC, date DESC NULLS LAST, type, id
+        LIMIT $6 OFFSET $7
+    )
+    SELECT
+        page.type, page.id, page.rank, page.date, total.total,
+        coalesce(a.domain, da.domain, s.domain) AS domain,
+        coalesce(a.title, ta.topic_name, s.short_summary) AS title,
+        a.url,
+        CASE WHEN page.type = 'summary' THEN
+            ts_headline(
+                CASE WHEN $2 = 'en' THEN 'english' ELSE 'hungarian_unaccent' END::regconfig,
+                regexp_replace(s.content, '\\[(START|END)_[A-Z_]+\\]', ' ', 'g'),
+                search.summary_query,
+                $8
+            )
+        ELSE
+            ts_headline(
+                'hungarian_unaccent'::regconfig,
+                coalesce(a.content, concat_ws(' ', ta.framing, phrases.text)),
+                search.hu_query,
+                $8
+            )
+        END AS snippet
+    FROM total
+    CROSS JOIN search
+    LEFT JOIN page ON true
+    LEFT JOIN scraped_articles a ON page.type = 'article' AND a.id = page.id
+    LEFT JOIN topic_analyses ta ON page.type = 'topic' AND ta.id = page.id
+    LEFT JOIN domain_analyses da ON da.id = ta.domain_analysis_id
+    LEFT JOIN LATERAL (
+        SELECT string_agg(kp.phrase, ' | ') AS text FROM key_phrases kp WHERE kp.topic_analysis_id = ta.id
+    ) phrases ON page.type = 'topic'
+    LEFT JOIN summaries s ON page.type = 'summary' AND s.id = page.id
+    ORDER BY page.rank DESC, page.date DESC NULLS LAST, page.type, page.id
+''')
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Search terms; supports \"quoted phrases\", OR and -exclusion"),
+    language: str = Query(default="hu", description="Language code (hu, en)"),
+    types: Optional[str] = Query(default=None, description="Comma-separated result types (article, topic, summary; default: all)"),
+    date_from: Optional[dt_date] = Query(default=None, alias="from", description="First date to search"),
+    date_to: Optional[dt_date] = Query(default=None, alias="to", description="Last date to search"),
+    limit: int = Query(default=20, description="Results per page"),
+    offset: int = Query(default=0, description="Results to skip"),
+):
+    """
+    Search article texts, topic names, framings and key phrases, and summaries.
+
+    Hungarian text is matched with accent folding and stemming, so "fovaros"
+    finds "fővárosban". Results are ranked by relevance, newest first among
+    equal ranks, and each carries a snippet with the matches wrapped in <mark>.
+
+    Articles are Hungarian only, so `language=en` searches the English topics and
+    summaries. Topic names, framings and key phrases are indexed with the
+    Hungarian configuration in both languages, so English topics are matched
+    with accent folding but without English stemming.
+
+    Returns:
+        - `total`: number of matches
+        - `results`: one page of matches, with type, id, domain, date, title, url (articles) and snippet
+    """
+    if language not in ["hu", "en"]:
+        language = "hu" #Default
+
+    selected = [t for t in SEARCH_TYPES if types is None or t in types.split(",")] or SEARCH_TYPES
+    limit = max(1, min(limit, settings.SEARCH_MAX_LIMIT))
+    offset = max(0, offset)
+
+    try:
+        async with acquire_connection() as conn:
+            rows = await queries.fetch(
+                conn, SEARCH_QUERY, q, language, selected, date_from, date_to, limit, offset, HEADLINE_OPTIONS
+            )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search: {str(e)}"
+        )
+
+    return render_search_results(rows, q, language, limit, offset)
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a ts_headline snippet and turn its match delimiters into <mark> tags."""
+    if snippet is None:
+        return None
+    escaped = html.escape(" ".join(snippet.split()))
+    return escaped.replace(html.escape(HIGHLIGHT_START), "<mark>").replace(html.escape(HIGHLIGHT_STOP), "</mark>")
+
+def render_search_results(
+    rows: List[asyncpg.Record],
+    q: str,
+    language: str,
+    limit: int,
+    offset: int
+) -> Dict[str, Any]:
+    """
+    Build the /search response from one page of matches.
+
+    Every row carries the total; when the page is past the last match the
+    query returns a single row with the total and no match.
+    """
+    results = [
+        {
+            "type": row['type'],
+            "id": row['id'],
+            "domain": row['domain'],
+            "date": row['date'].isoformat() if row['date'] else None,
+            "title": row['title'],
+            "url": row['url'],
+            "snippet": highlight(row['snippet']),
+            "rank": round(row['rank'], 4),
+        }
+        for row in rows
+        if row['type'] is not None
+    ]
+    total = rows[0]['total'] if rows else 0
+    return {
+        "success": True,
+        "query": q,
+        "language": language,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if offset + limit < total else None,
+        "results": results,
+    }
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Any, Dict, List, Optional
+from datetime import date as dt_date, timedelta
+import asyncpg
+
+from backend.cache import PreparedResponse, response_cache
+from backend.config import settings
+from backend.stats import LEANINGS, SENTIMENTS, SOURCES, coverage_stats
+from backend.utils.jsonutils import dumps
+from backend.utils.textutils import normalize_domain
+
+router = APIRouter(tags=["stats"])
+
+
+@router.get("/stats/coverage")
+async def get_coverage_stats(
+    request: Request,
+    date_from: Optional[dt_date] = Query(default=None, alias="from", description="First date (default: STATS_DEFAULT_DAYS before `to`)"),
+    date_to: Optional[dt_date] = Query(default=None, alias="to", description="Last date (default: today)"),
+    language: str = Query(default="hu", description="Language code (hu, en)"),
+    source: str = Query(default="topics", description="Counted analyses (topics, cross-source)"),
+    outlets: Optional[str] = Query(default=None, description="Comma-separated outlets to include (default: all)"),
+):
+    """
+    Retrieve sentiment and political leaning statistics over a date range.
+
+    `source=topics` counts the topics of each outlet's latest domain analysis per
+    date; `source=cross-source` counts the source coverage entries of the latest
+    cross-source analysis per date.
+
+    Returns:
+        - Totals over the range: topic count, sentiment and leaning distributions
+        - The same distributions per outlet
+        - A per-date trend for the dates that have data
+        - `mean_leaning` on a scale from -2 (bal) to 2 (jobb)
+
+    The counts come from a precomputed per-date, per-outlet cube, so long ranges
+    cost the same as short ones.
+    """
+    end = date_to if date_to is not None else dt_date.today()
+    start = date_from if date_from is not None else end - timedelta(days=settings.STATS_DEFAULT_DAYS - 1)
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be earlier than 'from'")
+
+    if language not in ["hu", "en"]:
+        language = "hu" #Default
+
+    if source not in SOURCES:
+        source = "topics" #Default
+
+    selected = sorted({normalize_domain(outlet) for outlet in outlets.split(",") if outlet.strip()}) if outlets else None
+
+    async def prepare(conn: asyncpg.Connection) -> PreparedResponse:
+        version = await response_cache.current_version()
+        await coverage_stats.refresh(conn, version)
+        validator = {"id": f"coverage-stats:{version}", "created_at": coverage_stats.last_modified}
+
+        async def render_body() -> bytes:
+            return dumps(render_coverage_stats(start, end, language, source, selected))
+
+        return PreparedResponse([validator], render_body)
+
+    try:
+        cache_key = await response_cache.make_key(
+            "coverage-stats", end, language, start.isoformat(), source, ",".join(selected or [])
+        )
+        return await response_cache.respond(request, cache_key, prepare)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch coverage statistics: {str(e)}"
+        )
+
+def render_coverage_stats(
+    start: dt_date,
+    end: dt_date,
+    language: str,
+    source: str,
+    outlets: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Build the /stats/coverage response from the current coverage cube."""
+    response: Dict[str, Any] = {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "language": language,
+        "source": source,
+        "sentiments": SENTIMENTS,
+        "political_leanings": LEANINGS,
+    }
+
+    cube = coverage_stats.cube(source, language)
+    if cube is None:
+        return {
+            "success": False,
+            "message": f"No {source} statistics found for language {language}",
+            **response,
+        }
+
+    return {"success": True, **response, **cube.aggregate(start, end, outlets)}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from backend.models import response as response_models
 from typing import List, Optional
 from datetime import date as dt_date
@@ -6,83 +6,185 @@ import asyncpg
 
 router = APIRouter(tags=["summaries"])
 
-from backend.database import get_connection
+from backend.cache import PreparedResponse, response_cache
+from backend.queries import queries
+from backend.ranges import ndjson_range_response, resolve_date_range
+from backend.snapshots import snapshot_store
+from backend.utils.jsonutils import dumps
 from backend.utils.textutils import normalize_domain
+from backend.utils.summaryutils import parse_summary_content
 
+# Latest summary per domain for the most recent date that has any, among the
+# requested day and the day before. Both the max(date) lookup and the DISTINCT ON
+# are served by idx_summaries_language_date_domain_created.
+LATEST_SUMMARIES_QUERY = queries.register("latest_summaries", '''
+    WITH latest_date AS (
+        SELECT max(date) AS date
+        FROM summaries
+        WHERE
+            language = $1
+            AND date BETWEEN $2::date - 1 AND $2::date
+    )
+    SELECT DISTINCT ON (s.domain)
+        s.id,
+        s.domain,
+        s.language,
+        s.date,
+        s.content,
+        s.short_summary,
+        s.sections,
+        s.created_at
+    FROM
+        summaries s
+        JOIN latest_date l ON s.date = l.date
+    WHERE
+        s.language = $1
+    ORDER BY
+        s.domain, s.created_at DESC
+''')
 
-@router.get("/summaries", response_model=response_models.SummaryResponseModel)
+# Latest summary per domain for every date of one keyset page of a date range
+SUMMARIES_RANGE_PAGE_QUERY = '''
+    WITH page_dates AS (
+        SELECT DISTINCT date
+        FROM summaries
+        WHERE
+            language = $1
+            AND date > $2
+            AND date <= $3
+        ORDER BY date
+        LIMIT $4
+    )
+    SELECT DISTINCT ON (s.date, s.domain)
+        s.id,
+        s.domain,
+        s.language,
+        s.date,
+        s.content,
+        s.short_summary,
+        s.sections,
+        s.created_at
+    FROM
+        summaries s
+        JOIN page_dates p ON s.date = p.date
+    WHERE
+        s.language = $1
+    ORDER BY
+        s.date, s.domain, s.created_at DESC
+'''
+
+
+@router.get(
+    "/summaries",
+    response_model=response_models.SummaryResponseModel,
+    response_model_exclude_none=True,
+)
 async def get_summaries(
+    request: Request,
     language: str = Query(default="hu", description="Language code (hu, en)"),
     date: Optional[dt_date] = Query(default=None),
-    conn: asyncpg.Connection = Depends(get_connection)
+    mode: str = Query(default="raw", description="Response mode (raw, parsed)"),
+    date_from: Optional[dt_date] = Query(default=None, alias="from", description="First date of a range"),
+    date_to: Optional[dt_date] = Query(default=None, alias="to", description="Last date of a range (default: today)"),
 ):
     """
     Retrieves news summaries from the database for a specific language and date.
     If no summaries are found for the requested date, returns the most recent from the previous day.
+
+    With `from` (and optionally `to`) the summaries of every date in the range that has any
+    are streamed as NDJSON instead, one `{"date", "summaries", "success"}` line per date.
+
+    In "raw" mode each summary carries the marker-delimited LLM output in `content`.
+    In "parsed" mode it carries the pre-parsed `short_summary` and `sections` instead;
+    `content` is only included for rows whose markers could not be parsed.
     """
     current_date = date if date is not None else dt_date.today()
+
+    if mode not in ["raw", "parsed"]:
+        mode = "raw" #Default
+
+    if date_from is not None:
+        start, end = resolve_date_range(date_from, date_to)
+        return stream_summaries_range(language, start, end, mode)
     
+    async def prepare(conn: asyncpg.Connection) -> PreparedResponse:
+        rows = await fetch_latest_summaries(conn, language, current_date)
+
+        async def render() -> bytes:
+            return render_summaries(rows, mode).model_dump_json(exclude_none=True).encode("utf-8")
+
+        return PreparedResponse(rows, render)
+
+    snapshot = await snapshot_store.respond(request, "summaries", current_date, language, mode)
+    if snapshot is not None:
+        return snapshot
+
     try:
-        rows = await conn.fetch('''
-            WITH LatestSummaries AS (
-                SELECT 
-                    id,
-                    domain,
-                    language,
-                    date,
-                    content,
-                    created_at,
-                    ROW_NUMBER() OVER (PARTITION BY domain ORDER BY created_at DESC) as row_num
-                FROM 
-                    summaries
-                WHERE 
-                    language = $1 
-                    AND date = $2
-            )
-            SELECT id, domain, language, date, content
-            FROM LatestSummaries
-            WHERE row_num = 1
-            ORDER BY domain
-        ''', language, current_date)
-        
-        # If no results, try previous day
-        if not rows:
-            previous_date = current_date - dt_date.resolution
-            rows = await conn.fetch('''
-                WITH LatestSummaries AS (
-                    SELECT 
-                        id,
-                        domain,
-                        language,
-                        date,
-                        content,
-                        created_at,
-                        ROW_NUMBER() OVER (PARTITION BY domain ORDER BY created_at DESC) as row_num
-                    FROM 
-                        summaries
-                    WHERE 
-                        language = $1 
-                        AND date = $2
-                )
-                SELECT id, domain, language, date, content
-                FROM LatestSummaries
-                WHERE row_num = 1
-                ORDER BY domain
-            ''', language, previous_date)
-        
-        # Convert rows to response models
-        response_summaries: List[response_models.Summary] = []
-        for row in rows:
-            response_summaries.append(
-                response_models.Summary(
-                    domain=normalize_domain(row['domain']),
-                    language=row['language'],
-                    date=row['date'],
-                    content=row['content']
-                )
-            )
-            
-        return response_models.SummaryResponseModel(summaries=response_summaries, success=True)
+        cache_key = await response_cache.make_key("summaries", current_date, language, mode)
+        return await response_cache.respond(request, cache_key, prepare)
     except Exception as e:
         # Log the error
-        raise HTTPException(status_code=500, detail=f"Failed to fetch summaries: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to fetch summaries: {str(e)}")
+
+
+async def fetch_latest_summaries(
+    conn: asyncpg.Connection,
+    language: str,
+    current_date: dt_date
+) -> List[asyncpg.Record]:
+    """Query the latest summary per domain, falling back to the previous day, in a single round-trip."""
+    return await queries.fetch(conn, LATEST_SUMMARIES_QUERY, language, current_date)
+
+
+def stream_summaries_range(language: str, start: dt_date, end: dt_date, mode: str):
+    """Stream the latest summaries of every date in [start, end] as NDJSON."""
+    async def fetch_page(conn: asyncpg.Connection, after: dt_date, end: dt_date, limit: int) -> List[asyncpg.Record]:
+        return await conn.fetch(SUMMARIES_RANGE_PAGE_QUERY, language, after, end, limit)
+
+    async def render_day(conn: asyncpg.Connection, rows: List[asyncpg.Record]) -> bytes:
+        body = render_summaries(rows, mode).model_dump(mode="json", exclude_none=True)
+        return dumps({"date": rows[0]['date'].isoformat(), **body})
+
+    return ndjson_range_response(start, end, fetch_page, render_day)
+
+
+def render_summaries(rows: List[asyncpg.Record], mode: str = "raw") -> response_models.SummaryResponseModel:
+    """Build the /summaries response from the latest summary rows."""
+    # Convert rows to response models
+    response_summaries: List[response_models.Summary] = []
+    for row in rows:
+        if mode == "parsed":
+            summary = _parsed_summary_from_row(row)
+        else:
+            summary = response_models.Summary(
+                domain=normalize_domain(row['domain']),
+                language=row['language'],
+                date=row['date'],
+                content=row['content']
+            )
+        response_summaries.append(summary)
+
+    return response_models.SummaryResponseModel(summaries=response_summaries, success=True)
+
+
+def _parsed_summary_from_row(row) -> response_models.Summary:
+    """
+    Build a parsed summary from a row, parsing the raw content on the fly
+    for rows written before the structured columns existed.
+    """
+    if row['sections'] is not None:
+        short_summary = row['short_summary']
+        sections = row['sections']
+    else:
+        parsed = parse_summary_content(row['content'])
+        short_summary = parsed['short_summary']
+        sections = parsed['sections']
+
+    return response_models.Summary(
+        domain=normalize_domain(row['domain']),
+        language=row['language'],
+        date=row['date'],
+        content=row['content'] if sections is None else None,
+        short_summary=short_summary,
+        sections=sections
+    )
@@ -3,7 +3,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
-from backend.endpoints import summaries, analysis
+from backend.compression import CompressionMiddleware
+from backend.metrics import MetricsMiddleware
+from backend.profiling import ProfilingMiddleware
+from backend.responses import FastJSONResponse
+from backend.endpoints import summaries, analysis, health, metrics, stats, search
 from backend.database import lifespan_context
 
 logging.basicConfig(
@@ -20,8 +24,20 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.API_TITLE,
         version=settings.API_VERSION,
-        lifespan=lifespan_context
+        lifespan=lifespan_context,
+        default_response_class=FastJSONResponse
     )
+
+    if settings.PROFILING_ENABLED:
+        if not settings.PROFILING_TOKEN:
+            raise RuntimeError("PROFILING_ENABLED requires PROFILING_TOKEN to be set")
+        app.add_middleware(
+            ProfilingMiddleware,
+            interval=settings.PROFILING_INTERVAL_MS / 1000,
+            token=settings.PROFILING_TOKEN,
+        )
+
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
     
     app.add_middleware(
         CORSMiddleware,
@@ -29,10 +45,20 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "Last-Modified"],
     )
+
+    # Outermost, so latency and sizes cover CORS and compression too
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
     
     app.include_router(summaries.router)
     app.include_router(analysis.router)
+    app.include_router(stats.router)
+    app.include_router(search.router)
+    app.include_router(health.router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router)
     
     return app
 
@@ -0,0 +1,237 @@
+import time
+import bisect
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+ACQUIRE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def collect(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = defaultdict(float)
+        if not self.labelnames:
+            self._values[()] = 0.0
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._values[self._key(labels)] += amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self._values[self._key(labels)] -= amount
+
+
+class GaugeFunction(_Metric):
+    """A gauge whose value is computed when the metrics are rendered."""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        function: Callable[[], Union[float, Mapping[LabelValues, float]]],
+        labelnames: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def collect(self) -> Iterable[str]:
+        value = self.function()
+        values = value if isinstance(value, Mapping) else {(): value}
+        for key, sample in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(sample)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative count per bucket (the last one is +Inf), sum, count
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def collect(self) -> Iterable[str]:
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    The metrics of this process, rendered in the Prometheus text exposition format.
+
+    Each server worker keeps its own registry; scrape every worker (or run one
+    worker per scrape target) to see all traffic.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def gauge_function(self, name: str, documentation: str, function, labelnames: Sequence[str] = ()) -> GaugeFunction:
+        return self.register(GaugeFunction(name, documentation, function, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines += metric.header()
+            lines += metric.collect()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time to send the complete response, by route template.",
+    ["method", "route", "status"],
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes", "Response body size as sent (after compression), by route template.",
+    ["route"], buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = registry.gauge("http_requests_in_progress", "Requests currently being handled.")
+CACHE_LOOKUPS = registry.counter(
+    "cache_lookups_total", "Lookups in the response cache, snapshot store and analysis document cache.",
+    ["cache", "endpoint", "result"],
+)
+
+
+def _hit_ratios() -> Dict[LabelValues, float]:
+    lookups: Dict[LabelValues, List[float]] = defaultdict(lambda: [0.0, 0.0])
+    for (cache, endpoint, result), value in CACHE_LOOKUPS._values.items():
+        lookups[(cache, endpoint)][0 if result == "hit" else 1] += value
+    return {key: hits / (hits + misses) for key, (hits, misses) in lookups.items() if hits + misses}
+
+
+registry.gauge_function(
+    "cache_hit_ratio", "Share of lookups served from the cache since startup.",
+    _hit_ratios, ["cache", "endpoint"],
+)
+
+
+def record_cache_lookup(cache: str, endpoint: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, endpoint=endpoint, result="hit" if hit else "miss")
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status and size of every HTTP response.
+
+    Routes are labelled by their template (`/topic-coverage/{topic_name}`), so
+    the label set stays bounded; requests that match no route share one label.
+    Latency covers the whole response, including streamed bodies.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+        content_length = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size, content_length
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_length = int(Headers(raw=message.get("headers", [])).get("content-length", 0) or 0)
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.observe(time.perf_counter() - started, method=scope["method"], route=route, status=str(status))
+            # Files sent with the pathsend extension carry no body messages
+            RESPONSE_SIZE.observe(size or content_length, route=route)
@@ -39,6 +39,16 @@ class PoliticalLeaning(str, Enum):
             print(f"Warning: Invalid political leaning '{value}', defaulting to 'közép'")
             return cls.CENTER
 
+    @property
+    def code(self) -> int:
+        """Position on a left (-2) to right (+2) scale, as stored in source_coverage."""
+        return list(PoliticalLeaning).index(self) - 2
+
+    @classmethod
+    def from_code(cls, code: int) -> 'PoliticalLeaning':
+        """Convert a stored code back to the enum."""
+        return list(cls)[code + 2]
+
 class Sentiment(str, Enum):
     """Enumeration of possible sentiment values."""
     POSITIVE = "pozitív"
@@ -71,4 +81,14 @@ class Sentiment(str, Enum):
         except ValueError:
             # If no match, return default value
             print(f"Warning: Invalid sentiment '{value}', defaulting to 'semleges'")
-            return cls.NEUTRAL
\ No newline at end of file
+            return cls.NEUTRAL
+
+    @property
+    def code(self) -> int:
+        """-1 (negatív), 0 (semleges) or 1 (pozitív), as stored in source_coverage."""
+        return {Sentiment.NEGATIVE: -1, Sentiment.NEUTRAL: 0, Sentiment.POSITIVE: 1}[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> 'Sentiment':
+        """Convert a stored code back to the enum."""
+        return {-1: cls.NEGATIVE, 0: cls.NEUTRAL, 1: cls.POSITIVE}[code]
@@ -2,11 +2,20 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date as dt_date
 
+class SummarySections(BaseModel):
+    bevezeto: Optional[str] = None
+    belfold: Optional[str] = None
+    kulfold: Optional[str] = None
+    tarsadalom: Optional[str] = None
+    zaras: Optional[str] = None
+
 class Summary(BaseModel):
     domain: str
     language: str
     date: dt_date
-    content: str
+    content: Optional[str] = None
+    short_summary: Optional[str] = None
+    sections: Optional[SummarySections] = None
 
 class SummaryResponseModel(BaseModel):
     summaries: List[Summary]
@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRegistry:
+    """
+    Named SQL statements of the hot read paths, prepared once per connection.
+
+    Pool connections prepare every registered statement when they are opened
+    (see `database.init_connection`); other connections, such as the scripts'
+    direct connections, prepare a statement on first use. A statement that fails
+    to prepare, e.g. because its table does not exist yet, is logged and retried
+    on first use, so it only fails the queries that need it. A statement invalidated
+    by a schema change is prepared again and its query retried once. Prepared
+    statements are dropped when their connection terminates.
+    """
+
+    def __init__(self):
+        self._queries: Dict[str, str] = {}
+        # Prepared statements per connection, keyed by the backend process id
+        self._statements: Dict[int, Dict[str, asyncpg.prepared_stmt.PreparedStatement]] = {}
+
+    def register(self, name: str, sql: str) -> str:
+        """Register `sql` under `name` and return the name for use with fetch/fetchrow/fetchval."""
+        if self._queries.get(name, sql) != sql:
+            raise ValueError(f"Query '{name}' is already registered with different SQL")
+        self._queries[name] = sql
+        return name
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._queries)
+
+    async def prepare_all(self, conn: asyncpg.Connection) -> int:
+        """Prepare every registered statement on `conn`; returns how many were prepared."""
+        prepared = 0
+        for name in self._queries:
+            try:
+                await self._statement(conn, name)
+                prepared += 1
+            except asyncpg.PostgresError as e:
+                logger.warning(f"Failed to prepare query '{name}', it will be prepared on first use: {e}")
+        return prepared
+
+    async def _statement(self, conn: asyncpg.Connection, name: str) -> asyncpg.prepared_stmt.PreparedStatement:
+        pid = conn.get_server_pid()
+        statements = self._statements.get(pid)
+        if statements is None:
+            statements = self._statements[pid] = {}
+            conn.add_termination_listener(lambda _conn: self._statements.pop(pid, None))
+
+        statement = statements.get(name)
+        if statement is None:
+            statement = statements[name] = await conn.prepare(self._queries[name])
+        return statement
+
+    async def _run(self, conn: asyncpg.Connection, name: str, method: str, *args) -> Any:
+        try:
+            return await getattr(await self._statement(conn, name), method)(*args)
+        except asyncpg.InvalidCachedStatementError:
+            # A migration changed a table the statement reads; prepare it again and retry
+            # once, unless the failure aborted the caller's transaction
+            self._statements.get(conn.get_server_pid(), {}).pop(name, None)
+            if conn.is_in_transaction():
+                raise
+            logger.info(f"Re-preparing query '{name}' after a schema change")
+            return await getattr(await self._statement(conn, name), method)(*args)
+
+    async def fetch(self, conn: asyncpg.Connection, name: str, *args) -> List[asyncpg.Record]:
+        return await self._run(conn, name, "fetch", *args)
+
+    async def fetchrow(self, conn: asyncpg.Connection, name: str, *args) -> Optional[asyncpg.Record]:
+        return await self._run(conn, name, "fetchrow", *args)
+
+    async def fetchval(self, conn: asyncpg.Connection, name: str, *args) -> Any:
+        return await self._run(conn, name, "fetchval", *args)
+
+
+queries = QueryRegistry()
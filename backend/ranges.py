@@ -0,0 +1,84 @@
+import logging
+from datetime import date as dt_date
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+import asyncpg
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.config import settings
+from backend.database import acquire_connection
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Fetches the rows of at most `limit` dates after `after` and up to `end`, ordered by date
+PageFetcher = Callable[[asyncpg.Connection, dt_date, dt_date, int], Awaitable[List[asyncpg.Record]]]
+# Renders the rows of one date into an NDJSON line (without the newline)
+DayRenderer = Callable[[asyncpg.Connection, List[asyncpg.Record]], Awaitable[bytes]]
+
+
+def resolve_date_range(start: dt_date, end: Optional[dt_date]) -> Tuple[dt_date, dt_date]:
+    """
+    Validate a `from`/`to` query range; `to` defaults to today.
+
+    Raises:
+        HTTPException: 400 if the range is reversed or longer than RANGE_MAX_DAYS.
+    """
+    end = end if end is not None else dt_date.today()
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be earlier than 'from'")
+    if (end - start).days + 1 > settings.RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date ranges are limited to {settings.RANGE_MAX_DAYS} days"
+        )
+    return start, end
+
+
+async def iter_date_pages(
+    conn: asyncpg.Connection,
+    start: dt_date,
+    end: dt_date,
+    fetch_page: PageFetcher
+) -> AsyncIterator[List[asyncpg.Record]]:
+    """
+    Walk a date range with keyset pagination (`date > last seen date`),
+    yielding the rows of one date at a time.
+    """
+    after = start - dt_date.resolution
+    while True:
+        rows = await fetch_page(conn, after, end, settings.RANGE_PAGE_DAYS)
+        if not rows:
+            return
+
+        day_rows: List[asyncpg.Record] = []
+        for row in rows:
+            if day_rows and row['date'] != day_rows[0]['date']:
+                yield day_rows
+                day_rows = []
+            day_rows.append(row)
+        yield day_rows
+
+        after = rows[-1]['date']
+
+
+def ndjson_range_response(
+    start: dt_date,
+    end: dt_date,
+    fetch_page: PageFetcher,
+    render_day: DayRenderer
+) -> StreamingResponse:
+    """
+    Stream one NDJSON line per date that has data in [start, end].
+
+    The connection is held only while the stream is being produced, and
+    at most one page of dates is in memory at a time.
+    """
+    async def lines() -> AsyncIterator[bytes]:
+        async with acquire_connection() as conn:
+            async for day_rows in iter_date_pages(conn, start, end, fetch_page):
+                yield await render_day(conn, day_rows) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
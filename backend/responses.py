@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from backend.utils.jsonutils import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that serializes with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
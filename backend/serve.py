@@ -0,0 +1,52 @@
+"""
+Production entry point: python -m backend.serve
+
+Runs uvicorn with one worker process per CPU (or SERVER_WORKERS), using uvloop
+and httptools when they are installed. Workers share nothing: each one opens
+its own connection pool and warms its own caches in the lifespan handler
+before accepting requests. Use CACHE_BACKEND=redis to share rendered responses
+between workers.
+
+On SIGTERM/SIGINT uvicorn stops accepting connections, waits up to
+SERVER_GRACEFUL_SHUTDOWN_SECONDS for in-flight requests, then runs the
+lifespan shutdown that closes the pool.
+"""
+import os
+import argparse
+import importlib.util
+
+import uvicorn
+
+from backend.config import settings
+
+
+def default_workers() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "backend.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
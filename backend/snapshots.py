@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import logging
+from datetime import date as dt_date
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from backend.cache import JSON_MEDIA_TYPE, CacheEntry, cache_headers, not_modified, response_cache
+from backend.config import settings
+from backend.metrics import record_cache_lookup
+from backend.utils.httputils import negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "index.json"
+
+# File suffixes of the pre-compressed variants next to each snapshot
+ENCODING_SUFFIXES = {
+    "identity": "",
+    "gzip": ".gz",
+    "br": ".br",
+}
+
+
+def snapshot_key(endpoint: str, date: dt_date, language: str, *extra) -> str:
+    """Relative snapshot path (without extension) of one endpoint response."""
+    parts = [endpoint, date.isoformat(), language, *[quote(str(part), safe="") for part in extra]]
+    return "/".join(parts)
+
+
+class SnapshotStore:
+    """
+    Serves the static JSON snapshots published by the scraper straight from disk.
+
+    The manifest written by the publisher maps every snapshot key to its versioned
+    file, validators, available encodings and the data version it was rendered
+    from. It is re-read when its mtime changes, checked at most every `reload_seconds`.
+    Entries of another data version than the API's current one are ignored, so a
+    snapshot left over from before a scraper write never hides the newer data.
+    """
+
+    def __init__(self, directory: str, reload_seconds: float):
+        self.directory = directory
+        self.reload_seconds = reload_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[float] = None
+        self._checked_at: Optional[float] = None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+            return
+        self._checked_at = now
+
+        manifest_path = os.path.join(self.directory, MANIFEST_FILENAME)
+        try:
+            mtime = os.stat(manifest_path).st_mtime
+        except FileNotFoundError:
+            self._entries, self._manifest_mtime = {}, None
+            return
+        if mtime == self._manifest_mtime:
+            return
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load snapshot manifest {manifest_path}: {e}")
+            return
+        self._entries = manifest.get("entries", {})
+        self._manifest_mtime = mtime
+        logger.info(f"Loaded snapshot manifest version {manifest.get('version')} with {len(self._entries)} entries")
+
+    def preload(self) -> int:
+        """Load the manifest now instead of on the first request; returns the number of entries."""
+        if settings.SNAPSHOT_SERVE:
+            self._refresh()
+        return len(self._entries)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._entries.get(key)
+
+    async def respond(self, request: Request, endpoint: str, date: dt_date, language: str, *extra) -> Optional[Response]:
+        """Serve a published snapshot for the request, or return None if there is no current one."""
+        if not settings.SNAPSHOT_SERVE:
+            return None
+        entry = self.lookup(snapshot_key(endpoint, date, language, *extra))
+        if entry is not None and entry.get("data_version") != await response_cache.current_version():
+            entry = None
+        record_cache_lookup("snapshot", endpoint, entry is not None)
+        if entry is None:
+            return None
+
+        validators = CacheEntry(entry["etag"], entry.get("last_modified"), b"")
+        headers = cache_headers(validators)
+        if not_modified(request, validators):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), entry["encodings"])
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        path = os.path.join(self.directory, entry["path"] + ENCODING_SUFFIXES[encoding])
+        return FileResponse(path, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+snapshot_store = SnapshotStore(settings.SNAPSHOT_DIR, settings.CACHE_VERSION_CHECK_SECONDS)
@@ -0,0 +1,202 @@
+import time
+import asyncio
+import logging
+from datetime import date as dt_date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import asyncpg
+import numpy as np
+
+from backend.models.enums import PoliticalLeaning, Sentiment
+from backend.queries import queries
+
+logger = logging.getLogger(__name__)
+
+SENTIMENTS = [sentiment.value for sentiment in Sentiment]
+LEANINGS = [leaning.value for leaning in PoliticalLeaning]
+# Position of each leaning on a left (-2) to right (+2) scale, for the mean leaning
+LEANING_SCALE = np.array([-2.0, -1.0, 0.0, 1.0, 2.0])
+
+SOURCES = ["topics", "cross-source"]
+
+# Only the latest domain analysis of an outlet per date counts; earlier runs of the day cover the same articles
+TOPIC_COUNTS_QUERY = queries.register("stats_topic_counts", '''
+    WITH latest AS (
+        SELECT DISTINCT ON (domain, date, language) id, domain, date, language, created_at
+        FROM domain_analyses
+        ORDER BY domain, date, language, created_at DESC
+    )
+    SELECT
+        latest.date, latest.language, latest.domain,
+        ta.sentiment, ta.political_leaning,
+        count(*) AS topics,
+        max(latest.created_at) AS created_at
+    FROM latest
+    JOIN topic_analyses ta ON ta.domain_analysis_id = latest.id
+    GROUP BY 1, 2, 3, 4, 5
+''')
+
+# Sentiment and leaning come back as their smallint codes
+CROSS_SOURCE_COUNTS_QUERY = queries.register("stats_cross_source_counts", '''
+    SELECT
+        latest.date, latest.language, coverage.domain,
+        coverage.sentiment, coverage.political_leaning,
+        count(*) AS topics,
+        max(latest.created_at) AS created_at
+    FROM latest_cross_source_analysis latest
+    JOIN source_coverage coverage ON coverage.analysis_id = latest.analysis_id
+    GROUP BY 1, 2, 3, 4, 5
+''')
+
+
+@lru_cache(maxsize=256)
+def _sentiment_index(value: Union[str, int, None]) -> int:
+    """Cube index of a sentiment label or smallint code."""
+    sentiment = Sentiment.from_code(value) if isinstance(value, int) else Sentiment.from_string(value or "")
+    return SENTIMENTS.index(sentiment.value)
+
+
+@lru_cache(maxsize=256)
+def _leaning_index(value: Union[str, int, None]) -> int:
+    """Cube index of a political leaning label or smallint code."""
+    leaning = PoliticalLeaning.from_code(value) if isinstance(value, int) else PoliticalLeaning.from_string(value or "")
+    return LEANINGS.index(leaning.value)
+
+
+def _distribution(labels: Sequence[str], counts: np.ndarray) -> Dict[str, int]:
+    return {label: int(count) for label, count in zip(labels, counts)}
+
+
+def _mean_leaning(counts: np.ndarray) -> Optional[float]:
+    total = counts.sum()
+    return round(float(counts @ LEANING_SCALE / total), 3) if total else None
+
+
+class CoverageCube:
+    """
+    Sentiment and political leaning counts per date and outlet.
+
+    `sentiment[d, o, s]` is the number of topics outlet `o` covered on `dates[d]`
+    with sentiment `SENTIMENTS[s]`; `leaning` likewise over `LEANINGS`. Dates
+    are kept sorted, so a date range is a contiguous slice.
+    """
+
+    def __init__(self, dates: np.ndarray, outlets: List[str], sentiment: np.ndarray, leaning: np.ndarray):
+        self.dates = dates
+        self.outlets = outlets
+        self.sentiment = sentiment
+        self.leaning = leaning
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "CoverageCube":
+        """Build a cube from rows of date, domain, sentiment, political_leaning and topics."""
+        rows = [row for row in rows if row['domain']]
+        dates = np.unique(np.array([row['date'].toordinal() for row in rows], dtype=np.int32))
+        outlets = sorted({row['domain'] for row in rows})
+        outlet_index = {outlet: i for i, outlet in enumerate(outlets)}
+
+        date_idx = np.searchsorted(dates, np.array([row['date'].toordinal() for row in rows], dtype=np.int32))
+        outlet_idx = np.array([outlet_index[row['domain']] for row in rows], dtype=np.intp)
+        sentiment_idx = np.array([_sentiment_index(row['sentiment']) for row in rows], dtype=np.intp)
+        leaning_idx = np.array([_leaning_index(row['political_leaning']) for row in rows], dtype=np.intp)
+        counts = np.array([row['topics'] for row in rows], dtype=np.int32)
+
+        sentiment = np.zeros((len(dates), len(outlets), len(SENTIMENTS)), dtype=np.int32)
+        leaning = np.zeros((len(dates), len(outlets), len(LEANINGS)), dtype=np.int32)
+        np.add.at(sentiment, (date_idx, outlet_idx, sentiment_idx), counts)
+        np.add.at(leaning, (date_idx, outlet_idx, leaning_idx), counts)
+        return cls(dates, outlets, sentiment, leaning)
+
+    def aggregate(self, start: dt_date, end: dt_date, outlets: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Totals, per-outlet distributions and a per-date trend over [start, end]."""
+        first, last = np.searchsorted(self.dates, [start.toordinal(), end.toordinal() + 1])
+        selected = [i for i, outlet in enumerate(self.outlets) if outlets is None or outlet in outlets]
+        sentiment = self.sentiment[first:last][:, selected]
+        leaning = self.leaning[first:last][:, selected]
+
+        by_outlet_sentiment = sentiment.sum(axis=0)
+        by_outlet_leaning = leaning.sum(axis=0)
+        by_date_sentiment = sentiment.sum(axis=1)
+        by_date_leaning = leaning.sum(axis=1)
+        total_sentiment = by_outlet_sentiment.sum(axis=0)
+        total_leaning = by_outlet_leaning.sum(axis=0)
+
+        return {
+            "totals": {
+                "topics": int(total_sentiment.sum()),
+                "sentiment": _distribution(SENTIMENTS, total_sentiment),
+                "political_leaning": _distribution(LEANINGS, total_leaning),
+                "mean_leaning": _mean_leaning(total_leaning),
+            },
+            "outlets": [
+                {
+                    "domain": self.outlets[outlet],
+                    "topics": int(by_outlet_sentiment[i].sum()),
+                    "sentiment": _distribution(SENTIMENTS, by_outlet_sentiment[i]),
+                    "political_leaning": _distribution(LEANINGS, by_outlet_leaning[i]),
+                    "mean_leaning": _mean_leaning(by_outlet_leaning[i]),
+                }
+                for i, outlet in enumerate(selected)
+                if by_outlet_sentiment[i].any()
+            ],
+            "trend": [
+                {
+                    "date": dt_date.fromordinal(int(self.dates[first + d])).isoformat(),
+                    "topics": int(by_date_sentiment[d].sum()),
+                    "sentiment": _distribution(SENTIMENTS, by_date_sentiment[d]),
+                    "political_leaning": _distribution(LEANINGS, by_date_leaning[d]),
+                    "mean_leaning": _mean_leaning(by_date_leaning[d]),
+                }
+                for d in range(last - first)
+                if by_date_sentiment[d].any()
+            ],
+        }
+
+
+class CoverageStats:
+    """
+    The coverage cubes of this worker, one per source ("topics" for the per-domain
+    topic analyses, "cross-source" for the latest cross-source analyses) and language.
+
+    The cubes are built from two GROUP BY queries and rebuilt when the data
+    version changes, so requests aggregate small arrays instead of scanning
+    topic rows or analysis JSON.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.last_modified: Optional[datetime] = None
+        self._cubes: Dict[tuple, CoverageCube] = {}
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, conn: asyncpg.Connection, version: int) -> None:
+        """Rebuild the cubes unless they were built for `version`."""
+        if self.version == version:
+            return
+        async with self._lock:
+            if self.version == version:
+                return
+            started = time.perf_counter()
+            cubes: Dict[tuple, CoverageCube] = {}
+            last_modified = None
+            for source, query in [("topics", TOPIC_COUNTS_QUERY), ("cross-source", CROSS_SOURCE_COUNTS_QUERY)]:
+                rows = await queries.fetch(conn, query)
+                by_language: Dict[str, List[asyncpg.Record]] = {}
+                for row in rows:
+                    by_language.setdefault(row['language'], []).append(row)
+                    if row['created_at'] and (last_modified is None or row['created_at'] > last_modified):
+                        last_modified = row['created_at']
+                for language, language_rows in by_language.items():
+                    cubes[(source, language)] = CoverageCube.from_rows(language_rows)
+
+            self._cubes = cubes
+            self.last_modified = last_modified
+            self.version = version
+            logger.info(f"Built coverage statistics for data version {version} in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def cube(self, source: str, language: str) -> Optional[CoverageCube]:
+        return self._cubes.get((source, language))
+
+
+coverage_stats = CoverageStats()
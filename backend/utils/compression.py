@@ -0,0 +1,57 @@
+import gzip
+import zlib
+from typing import Dict, Tuple
+
+from backend.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing; everything else is passed through untouched
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content codings this process can produce, besides "identity"."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.lower().startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with the configured level for `encoding` ("br" or "gzip")."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """Every available compressed variant of `body`, or none if it is below the size threshold."""
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding) for encoding in available_encodings()}
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed bodies, flushing after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        # Flush so every streamed line reaches the client without waiting for the next one
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
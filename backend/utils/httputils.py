@@ -0,0 +1,49 @@
+from typing import Dict, Iterable
+
+# Preferred order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into a mapping of coding -> q value."""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str, available: Iterable[str]) -> str:
+    """
+    Pick the best content coding for an Accept-Encoding header.
+
+    Args:
+        header: The raw Accept-Encoding request header (may be empty).
+        available: The codings the server can produce, besides "identity".
+
+    Returns:
+        "br", "gzip" or "identity".
+    """
+    if not header:
+        return "identity"
+    accepted = parse_accept_encoding(header)
+    available = set(available)
+    best, best_quality = "identity", 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
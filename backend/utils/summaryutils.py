@@ -0,0 +1,76 @@
+import re
+from typing import Dict, Optional, TypedDict
+
+# Section markers emitted by the narrative prompt, mapped to their stored keys
+SECTION_KEYS = {
+    "BEVEZETO": "bevezeto",
+    "BELFOLD": "belfold",
+    "KULFOLD": "kulfold",
+    "TARSADALOM": "tarsadalom",
+    "ZARAS": "zaras",
+}
+
+_START_MARKER_PATTERN = re.compile(r'\[START_(?:SHORT|MAIN)_SUMMARY\]')
+_SHORT_SUMMARY_PATTERN = re.compile(r'\[START_SHORT_SUMMARY\]([\s\S]*?)\[END_SHORT_SUMMARY\]')
+_MAIN_SUMMARY_PATTERN = re.compile(r'\[START_MAIN_SUMMARY\]([\s\S]*?)\[END_MAIN_SUMMARY\]')
+_SECTION_PATTERN = re.compile(r'\[START_([A-Z_]+)\]([\s\S]*?)\[END_\1\]')
+_ANY_SECTION_START_PATTERN = re.compile(r'\[START_[A-Z_]+\]')
+_SECTION_TITLE_PATTERN = re.compile(r'^\*\*[^*\n]+\*\*\s*\n?')
+
+
+class ParsedSummary(TypedDict):
+    short_summary: Optional[str]
+    sections: Optional[Dict[str, Optional[str]]]
+
+
+def parse_summary_content(raw_content: str) -> ParsedSummary:
+    """
+    Parse the marker-delimited LLM summary output into its structured parts.
+
+    Mirrors the client-side parser in frontend/src/utils/parseSummary.ts:
+    1. Drops anything the model wrote before the first summary marker
+    2. Extracts the short preview summary
+    3. Splits the main summary into the bevezető, belföld, külföld,
+       társadalom and zárás sections, stripping any echoed section title
+
+    Returns:
+        A dict with the short summary and a section mapping. The section mapping
+        is None when no section markers could be found at all.
+    """
+    if not raw_content:
+        return {"short_summary": None, "sections": None}
+
+    start_match = _START_MARKER_PATTERN.search(raw_content)
+    content = raw_content[start_match.start():] if start_match else raw_content
+
+    short_match = _SHORT_SUMMARY_PATTERN.search(content)
+    short_summary = short_match.group(1).strip() if short_match else None
+
+    main_match = _MAIN_SUMMARY_PATTERN.search(content)
+    content_to_parse = main_match.group(1) if main_match else content
+
+    sections: Dict[str, Optional[str]] = {key: None for key in SECTION_KEYS.values()}
+    found_section = False
+    for match in _SECTION_PATTERN.finditer(content_to_parse):
+        key = SECTION_KEYS.get(match.group(1))
+        if key is None:
+            continue
+        section_text = _SECTION_TITLE_PATTERN.sub('', match.group(2).strip()).strip()
+        found_section = True
+        sections[key] = section_text or None
+
+    # Text inside MAIN_SUMMARY but before the first section acts as the introduction
+    if main_match:
+        text_before_first_section = _ANY_SECTION_START_PATTERN.split(content_to_parse)[0].strip()
+        if text_before_first_section and not sections["bevezeto"]:
+            sections["bevezeto"] = text_before_first_section
+            found_section = True
+
+    # Fall back to the introduction for the preview, like the client does
+    if short_summary is None and sections["bevezeto"]:
+        short_summary = sections["bevezeto"]
+
+    return {
+        "short_summary": short_summary or None,
+        "sections": sections if found_section else None,
+    }
@@ -1,13 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Any, Dict, Optional, List
-from datetime import date as dt_date
-import asyncpg
-import json
 import unicodedata
 import re
+from functools import lru_cache
 
-from backend.database import get_connection
+_SCHEME_PATTERN = re.compile(r'^https?:\/\/')
+_WWW_PATTERN = re.compile(r'^www\.')
+_TLD_PATTERN = re.compile(r'\.\w+$')
 
+@lru_cache(maxsize=256)
 def normalize_domain(domain: str) -> str:
     """
     Normalize a domain name by:
@@ -15,28 +14,43 @@ def normalize_domain(domain: str) -> str:
     2. Converting to lowercase
     3. Removing accents (ékezetek)
     4. Handling special cases
+
+    The set of outlet domains is small and fixed, so results are memoized.
     """
     if not domain:
         return ""
-        
+
     # Handle special case for 24.hu (keep the dot)
     if domain.startswith("24."):
         return "24.hu"
-        
+
     # Remove http(s):// if present
-    domain = re.sub(r'^https?:\/\/', '', domain)
-    
+    domain = _SCHEME_PATTERN.sub('', domain)
+
     # Remove www. if present
-    domain = re.sub(r'^www\.', '', domain)
-    
+    domain = _WWW_PATTERN.sub('', domain)
+
     # Remove TLD (.hu, .com, etc.)
-    domain = re.sub(r'\.\w+$', '', domain)
-    
+    domain = _TLD_PATTERN.sub('', domain)
+
     # Convert to lowercase
     domain = domain.lower()
-    
+
     # Remove accents
     domain = ''.join(c for c in unicodedata.normalize('NFD', domain)
                      if unicodedata.category(c) != 'Mn')
-                     
-    return domain
\ No newline at end of file
+
+    return domain
+
+_NON_ALNUM_PATTERN = re.compile(r'[^0-9a-z]+')
+
+def fold_text(text: str) -> str:
+    """
+    Fold text for accent- and case-insensitive matching:
+    lowercase, strip accents and collapse punctuation into single spaces.
+    """
+    if not text:
+        return ""
+    text = ''.join(c for c in unicodedata.normalize('NFD', text.lower())
+                   if unicodedata.category(c) != 'Mn')
+    return _NON_ALNUM_PATTERN.sub(' ', text).strip()
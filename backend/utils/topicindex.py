@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Set, Tuple
+
+from backend.utils.textutils import fold_text
+
+# Scores of the different match kinds, best first
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+WORD_PREFIX_SCORE = 0.8
+SUBSTRING_SCORE = 0.7
+# Trigram matches score up to this value, scaled by their similarity
+TRIGRAM_MAX_SCORE = 0.6
+MIN_TRIGRAM_SIMILARITY = 0.3
+TRIGRAM_SIZE = 3
+
+
+def _trigrams(folded: str) -> Set[str]:
+    padded = f"  {folded} "
+    return {padded[i:i + TRIGRAM_SIZE] for i in range(len(padded) - TRIGRAM_SIZE + 1)}
+
+
+def topic_slug(name: str) -> str:
+    return fold_text(name).replace(' ', '-') or "topic"
+
+
+def assign_topic_ids(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Give every unified topic of an analysis document a stable `topic_id` in place.
+
+    The id is the accent-folded slug of the topic name, suffixed on collisions,
+    so it stays the same for every reader of the same stored document.
+    """
+    seen: Set[str] = set()
+    for topic in document.get("unified_topics", []):
+        if topic.get("topic_id"):
+            seen.add(topic["topic_id"])
+            continue
+        base = topic_slug(topic.get("name", ""))
+        topic_id, suffix = base, 2
+        while topic_id in seen:
+            topic_id, suffix = f"{base}-{suffix}", suffix + 1
+        topic["topic_id"] = topic_id
+        seen.add(topic_id)
+    return document
+
+
+class TopicIndex:
+    """
+    Lookup index over the unified topics of one analysis document.
+
+    Exact names, topic ids, name prefixes and word prefixes are resolved with
+    dictionary lookups; trigram postings back the fuzzy fallback.
+    """
+
+    def __init__(self, topics: List[Dict[str, Any]]):
+        self.topics = topics
+        self._exact: Dict[str, int] = {}
+        self._prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._word_prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._folded_names: List[str] = []
+        self._trigram_sets: List[Set[str]] = []
+
+        for position, topic in enumerate(topics):
+            folded = fold_text(topic.get("name", ""))
+            self._folded_names.append(folded)
+            self._exact.setdefault(folded, position)
+            if topic.get("topic_id"):
+                self._exact.setdefault(topic["topic_id"], position)
+
+            for length in range(1, len(folded) + 1):
+                self._prefixes[folded[:length]].append(position)
+            for word in folded.split(' ')[1:]:
+                for length in range(1, len(word) + 1):
+                    self._word_prefixes[word[:length]].append(position)
+
+            trigrams = _trigrams(folded)
+            self._trigram_sets.append(trigrams)
+            for trigram in trigrams:
+                self._trigram_postings[trigram].add(position)
+
+    def search(self, query: str) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the topics matching `query`, best match first.
+
+        Returns:
+            A list of (topic, score) pairs with scores between 0 and 1.
+        """
+        folded = fold_text(query)
+        if not folded:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        def offer(position: int, score: float) -> None:
+            if score > scores.get(position, 0.0):
+                scores[position] = score
+
+        exact_position = self._exact.get(folded, self._exact.get(query))
+        if exact_position is not None:
+            offer(exact_position, EXACT_SCORE)
+        for position in self._prefixes.get(folded, []):
+            offer(position, PREFIX_SCORE)
+        for position in self._word_prefixes.get(folded, []):
+            offer(position, WORD_PREFIX_SCORE)
+
+        if len(folded) < TRIGRAM_SIZE:
+            # Too short to share a trigram with a mid-word occurrence: scan the names instead
+            for position, name in enumerate(self._folded_names):
+                if position not in scores and folded in name:
+                    offer(position, SUBSTRING_SCORE)
+        else:
+            query_trigrams = _trigrams(folded)
+            candidates: Set[int] = set()
+            for trigram in query_trigrams:
+                candidates |= self._trigram_postings.get(trigram, set())
+            for position in candidates:
+                if position in scores:
+                    continue
+                if folded in self._folded_names[position]:
+                    offer(position, SUBSTRING_SCORE)
+                    continue
+                topic_trigrams = self._trigram_sets[position]
+                similarity = len(query_trigrams & topic_trigrams) / len(query_trigrams | topic_trigrams)
+                if similarity >= MIN_TRIGRAM_SIMILARITY:
+                    offer(position, TRIGRAM_MAX_SCORE * similarity)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.topics[position], round(score, 3)) for position, score in ranked]
@@ -0,0 +1,46 @@
+import time
+import logging
+from datetime import date as dt_date
+
+from backend.cache import response_cache
+from backend.database import acquire_connection
+from backend.documents import load_cached_analysis
+from backend.endpoints.analysis import fetch_cross_source_analysis
+from backend.snapshots import snapshot_store
+from backend.stats import coverage_stats
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ["hu", "en"]
+
+
+async def prewarm_caches() -> None:
+    """
+    Fill this worker's in-process caches before it accepts requests: the data
+    version marker, the snapshot manifest, the decoded latest analysis and
+    topic index per language, and the coverage statistics cubes.
+
+    Caches are per process, so every worker warms its own. Failures are logged
+    and leave the cache to fill on demand.
+    """
+    started = time.perf_counter()
+    try:
+        version = await response_cache.current_version()
+        snapshot_entries = snapshot_store.preload()
+
+        analyses = 0
+        async with acquire_connection() as conn:
+            await coverage_stats.refresh(conn, version)
+            for language in LANGUAGES:
+                row = await fetch_cross_source_analysis(conn, dt_date.today(), language)
+                if row:
+                    await load_cached_analysis(conn, row['id'])
+                    analyses += 1
+    except Exception as e:
+        logger.warning(f"Cache pre-warm failed, caches will fill on demand: {e}")
+        return
+
+    logger.info(
+        f"Pre-warmed caches in {(time.perf_counter() - started) * 1000:.1f} ms: "
+        f"{analyses} analyses, {snapshot_entries} snapshot entries"
+    )
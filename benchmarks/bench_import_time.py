@@ -0,0 +1,104 @@
+"""
+Import-time regression benchmark for the API and scraper entry points.
+
+Imports each target in a fresh interpreter with `python -X importtime`, best
+of --repeat runs, and reports its cumulative import time together with the
+heaviest modules it pulled in. Exits with status 1 when a target exceeds its
+budget or imports a module that must stay lazy (the LLM client stack), so it
+can run as a CI check:
+
+    python benchmarks/bench_import_time.py --repeat 5
+
+Budgets are generous wall-clock ceilings for slow CI runners; the forbidden
+module check is the precise regression guard.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, NamedTuple, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+scripts_dir = os.path.join(project_root, "scripts")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# Modules that must only be loaded on first LLM use
+LAZY_MODULES = ("langchain_google_genai", "langchain_core", "google.generativeai", "google.genai")
+
+
+class Target(NamedTuple):
+    name: str
+    module: str
+    # Extra sys.path entry, for the scripts that are run from their own directory
+    path: str
+    budget_ms: float
+
+
+TARGETS = [
+    Target("api", "backend.main", project_root, 1500),
+    Target("scraper", "scraper", scripts_dir, 1500),
+    Target("publisher", "publisher", scripts_dir, 1500),
+]
+
+
+def profile_import(target: Target) -> Tuple[float, Dict[str, float]]:
+    """Import the target in a fresh interpreter; return its total ms and per-module cumulative ms."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([target.path, project_root]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target.module}"],
+        cwd=target.path, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target.module} failed:\n{result.stderr[-2000:]}")
+
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    return modules.get(target.module, 0.0), modules
+
+
+def top_level_heaviest(modules: Dict[str, float], target: str, count: int) -> List[Tuple[str, float]]:
+    """Heaviest top-level packages besides the target itself."""
+    packages: Dict[str, float] = {}
+    for module, ms in modules.items():
+        if module == target:
+            continue
+        package = module.split(".", 1)[0]
+        packages[package] = max(packages.get(package, 0.0), ms)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target (best run counts)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest packages to list per target")
+    args = parser.parse_args()
+
+    failures = []
+    for target in TARGETS:
+        runs = [profile_import(target) for _ in range(args.repeat)]
+        total_ms, modules = min(runs, key=lambda run: run[0])
+
+        print(f"{target.name:<10} {target.module:<14} {total_ms:8.1f} ms (budget {target.budget_ms:.0f} ms)")
+        for package, ms in top_level_heaviest(modules, target.module, args.top):
+            print(f"{'':<26}{package:<28}{ms:8.1f} ms")
+
+        if total_ms > target.budget_ms:
+            failures.append(f"{target.name}: {total_ms:.0f} ms exceeds the {target.budget_ms:.0f} ms budget")
+        eager = sorted(module for module in modules if module.startswith(LAZY_MODULES))
+        if eager:
+            failures.append(f"{target.name}: imports {', '.join(eager[:3])} eagerly")
+
+    if failures:
+        print("\nImport-time regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark for normalize_domain on the read path.
+
+Compares the original per-call implementation (three re.sub calls, NFD
+normalization and accent stripping on every call) with the memoized version
+in backend.utils.textutils, for the number of calls a typical request makes:
+one per summary row plus one per source_coverage entry of the analysis.
+
+Usage:
+    python benchmarks/bench_normalize_domain.py [--repeat N]
+"""
+import os
+import re
+import sys
+import timeit
+import argparse
+import unicodedata
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.utils.textutils import normalize_domain
+
+# Domains as they appear in stored rows and LLM output
+DOMAINS = [
+    "telex", "origo", "hvg", "mandiner", "444", "24.hu", "vadhajtasok",
+    "magyarjelen", "nyugatifeny", "index", "magyarnemzet",
+    "Telex.hu", "https://www.origo.hu", "HVG.hu", "Vadhajtások", "www.index.hu",
+]
+
+# 11 summaries + 6 unified topics x 11 source_coverage entries
+CALLS_PER_REQUEST = 11 + 6 * 11
+
+
+def normalize_domain_uncached(domain: str) -> str:
+    """The implementation before memoization, kept as the baseline."""
+    if not domain:
+        return ""
+    if domain.startswith("24."):
+        return "24.hu"
+    domain = re.sub(r'^https?:\/\/', '', domain)
+    domain = re.sub(r'^www\.', '', domain)
+    domain = re.sub(r'\.\w+$', '', domain)
+    domain = domain.lower()
+    domain = ''.join(c for c in unicodedata.normalize('NFD', domain)
+                     if unicodedata.category(c) != 'Mn')
+    return domain
+
+
+def simulate_request(normalize) -> None:
+    for i in range(CALLS_PER_REQUEST):
+        normalize(DOMAINS[i % len(DOMAINS)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5000, help="Simulated requests per measurement")
+    args = parser.parse_args()
+
+    for domain in DOMAINS:
+        assert normalize_domain(domain) == normalize_domain_uncached(domain), domain
+
+    results = {}
+    for name, normalize in [("uncached", normalize_domain_uncached), ("memoized", normalize_domain)]:
+        best = min(timeit.repeat(lambda: simulate_request(normalize), number=args.repeat, repeat=5))
+        results[name] = best / args.repeat * 1e6
+        print(f"{name:>10}: {results[name]:8.2f} us/request ({CALLS_PER_REQUEST} calls)")
+
+    saving = results["uncached"] - results["memoized"]
+    print(f"{'saving':>10}: {saving:8.2f} us/request ({results['uncached'] / results['memoized']:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
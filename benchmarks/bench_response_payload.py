@@ -0,0 +1,141 @@
+"""
+Payload-size and latency benchmark for the analysis response pipeline.
+
+For each saved cross-source analysis, measures:
+  * serialization: FastAPI's default path (jsonable_encoder + json.dumps)
+    against backend.utils.jsonutils.dumps (orjson when installed)
+  * compressed size and compression time for gzip and brotli at the levels
+    configured in backend.config (what the cache stores once per fill)
+
+Analyses are read from the database (latest --limit rows of
+cross_source_analyses, DATABASE_URL from .env) or from JSON files given with
+--file, e.g. published snapshots or exported analysis_json values. Without
+either, a synthetic 6 topics x 11 outlets document is used.
+
+Usage:
+    python benchmarks/bench_response_payload.py [--limit N] [--file PATH ...] [--repeat N]
+"""
+import os
+import sys
+import json
+import timeit
+import asyncio
+import argparse
+from typing import Any, Dict, List, Tuple
+
+import asyncpg
+from dotenv import load_dotenv
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.utils.compression import available_encodings, compress
+from backend.utils.jsonutils import dumps
+
+OUTLETS = [
+    "telex", "origo", "hvg", "mandiner", "444", "24.hu", "vadhajtasok",
+    "magyarjelen", "nyugatifeny", "index", "magyarnemzet",
+]
+
+
+def synthetic_analysis(topics: int = 6) -> Dict[str, Any]:
+    """A document shaped like the LLM output, with every outlet covering every topic."""
+    return {
+        "date": "2025-05-01",
+        "language": "hu",
+        "unified_topics": [
+            {
+                "name": f"Téma {t}: a kormány és az ellenzék vitája",
+                "comparative_analysis": "Az orgánumok eltérően keretezik az eseményeket. " * 12,
+                "source_coverage": [
+                    {
+                        "domain": outlet,
+                        "original_topic_name": f"{outlet} cím {t}",
+                        "sentiment": ["pozitív", "semleges", "negatív"][(t + i) % 3],
+                        "political_leaning": ["bal", "közép", "jobb"][(t * i) % 3],
+                        "key_phrases": [f"kulcskifejezés {k}" for k in range(8)],
+                        "framing": "A cikk a gazdasági következményekre helyezi a hangsúlyt. " * 4,
+                        "article_urls": [f"https://{outlet}.hu/{t}/{k}-hosszu-cikk-cim" for k in range(4)],
+                    }
+                    for i, outlet in enumerate(OUTLETS)
+                ],
+            }
+            for t in range(topics)
+        ],
+    }
+
+
+async def load_saved_analyses(limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+    load_dotenv()
+    conn = await asyncpg.connect(os.getenv("DATABASE_URL"))
+    try:
+        rows = await conn.fetch('''
+            SELECT id, date, language, analysis_json::text AS analysis_json
+            FROM cross_source_analyses
+            ORDER BY created_at DESC
+            LIMIT $1
+        ''', limit)
+    finally:
+        await conn.close()
+    return [(f"#{row['id']} {row['date']} {row['language']}", json.loads(row['analysis_json'])) for row in rows]
+
+
+def load_documents(args) -> List[Tuple[str, Dict[str, Any]]]:
+    if args.file:
+        documents = []
+        for path in args.file:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            # Accept both raw analysis_json and /cross-source-analysis responses
+            documents.append((os.path.basename(path), document.get("analysis") or document))
+        return documents
+    try:
+        documents = asyncio.run(load_saved_analyses(args.limit))
+        if documents:
+            return documents
+        print("No saved analyses in the database, using a synthetic document")
+    except Exception as e:
+        print(f"Could not read saved analyses ({e}), using a synthetic document")
+    return [("synthetic 6x11", synthetic_analysis())]
+
+
+def best_us(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10, help="Saved analyses to read from the database")
+    parser.add_argument("--file", nargs="*", help="JSON files to use instead of the database")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    documents = load_documents(args)
+    encodings = available_encodings()
+    header = f"{'analysis':<28}{'identity':>10}" + "".join(f"{e:>10}" for e in encodings)
+    header += f"{'default us':>12}{'fast us':>10}" + "".join(f"{e + ' us':>10}" for e in encodings)
+    print(header)
+
+    for name, document in documents:
+        payload = {"success": True, "date": document.get("date"), "analysis": document, "language": document.get("language")}
+        body = dumps(payload)
+
+        default_us = best_us(lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8"), args.repeat)
+        fast_us = best_us(lambda: dumps(payload), args.repeat)
+
+        sizes, times = [], []
+        for encoding in encodings:
+            sizes.append(len(compress(body, encoding)))
+            times.append(best_us(lambda: compress(body, encoding), max(args.repeat // 10, 1)))
+
+        line = f"{name[:27]:<28}{len(body):>10}" + "".join(f"{size:>10}" for size in sizes)
+        line += f"{default_us:>12.1f}{fast_us:>10.1f}" + "".join(f"{t:>10.1f}" for t in times)
+        print(line)
+
+    print("\nSizes in bytes. Compression runs once per cache fill; cache hits send the stored variant.")
+
+
+if __name__ == "__main__":
+    main()
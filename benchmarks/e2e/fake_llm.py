@@ -0,0 +1,207 @@
+"""
+A stand-in for the Gemini chat model with configurable latency and canned output.
+
+FakeChatModel implements the two call shapes scripts/llm.py uses: `invoke`
+returning a message with `.content`, and `with_structured_output(schema)`
+returning a model whose `invoke` builds an instance of `schema`. The canned
+output is derived from the prompt (article URLs, source domains, the input
+JSON of a translation), so every downstream step receives data with the same
+shape and cross-references as a real response.
+"""
+import re
+import json
+import time
+import random
+import threading
+from typing import Any, Dict, List
+
+from backend.models.ai_models import CrossSourceAnalysis, DomainAnalysisLLM
+
+CANNED_TOPICS = [
+    "Költségvetési vita", "Infláció", "Ukrajnai béketárgyalások", "Egészségügyi reform",
+    "Tanárok bérkövetelései", "Uniós források", "Energiaárak", "Választási kampány",
+]
+SENTIMENTS = ["pozitív", "negatív", "semleges"]
+LEANINGS = ["bal", "közép-bal", "közép", "közép-jobb", "jobb"]
+
+CANNED_SUMMARY = (
+    "[START_SHORT_SUMMARY]A nap legfontosabb hírei röviden.[END_SHORT_SUMMARY]\n"
+    "[START_MAIN_SUMMARY]\n"
+    "[START_BEVEZETO]**Bevezető**\n{intro}[END_BEVEZETO]\n"
+    "[START_BELFOLD]**Belföld**\n{body}[END_BELFOLD]\n"
+    "[START_KULFOLD]**Külföld**\n{body}[END_KULFOLD]\n"
+    "[START_TARSADALOM]**Társadalom**\n{body}[END_TARSADALOM]\n"
+    "[START_ZARAS]**Zárás**\n{intro}[END_ZARAS]\n"
+    "[END_MAIN_SUMMARY]"
+)
+
+_URL_PATTERN = re.compile(r'^URL: (\S+)$', re.MULTILINE)
+_SOURCE_PATTERN = re.compile(r'^Source: (.+)$', re.MULTILINE)
+_TOPIC_PATTERN = re.compile(r'^\s+Topic \d+: (.+)$', re.MULTILINE)
+_TEXT_PATTERN = re.compile(r'--- START OF TEXT ---\n([\s\S]*)\n--- END OF TEXT ---')
+
+
+def prompt_text(prompt: Any) -> str:
+    """Flatten a string or a langchain prompt value into plain text."""
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    return str(prompt)
+
+
+class FakeMessage:
+    def __init__(self, content: str, prompt: str = ""):
+        self.content = content
+        # Roughly four characters per token for Hungarian and English text
+        self.usage_metadata = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+
+
+class LLMStats:
+    """Call counts and prompt/completion sizes, shared by every fake model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_chars = 0
+        self.completion_chars = 0
+        self.latency_seconds = 0.0
+
+    def record(self, prompt: str, completion: str, latency: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            self.completion_chars += len(completion)
+            self.latency_seconds += latency
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens_est": self.prompt_chars // 4,
+            "completion_tokens_est": self.completion_chars // 4,
+            "simulated_latency_s": round(self.latency_seconds, 3),
+        }
+
+
+class FakeChatModel:
+    """
+    Args:
+        latency: Mean seconds each call blocks for, like the synchronous client does.
+        jitter: Maximum random deviation from `latency`, in seconds.
+        seed: Seed for the latency jitter and the canned values.
+        stats: Shared statistics collector.
+    """
+
+    model = "fake-chat-model"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0, stats: LLMStats = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.stats = stats or LLMStats()
+
+    def _wait(self) -> float:
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def invoke(self, prompt: Any) -> FakeMessage:
+        text = prompt_text(prompt)
+        delay = self._wait()
+        translated = _TEXT_PATTERN.search(text)
+        if translated:
+            content = translated.group(1)
+        else:
+            body = " ".join(f"Ez a(z) {i + 1}. mondat a hírösszefoglalóban." for i in range(12))
+            content = CANNED_SUMMARY.format(intro=body[:200], body=body)
+        self.stats.record(text, content, delay)
+        return FakeMessage(content, text)
+
+    def with_structured_output(self, schema, include_raw: bool = False):
+        return FakeStructuredModel(self, schema, include_raw)
+
+
+class FakeStructuredModel:
+    def __init__(self, model: FakeChatModel, schema, include_raw: bool = False):
+        self.model = model
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def invoke(self, prompt: Any):
+        text = prompt_text(prompt)
+        delay = self.model._wait()
+        if self.schema is DomainAnalysisLLM:
+            result = self._domain_analysis(text)
+        elif self.schema is CrossSourceAnalysis and "Input JSON" in text:
+            result = self._translated_analysis(text)
+        elif self.schema is CrossSourceAnalysis:
+            result = self._cross_source_analysis(text)
+        else:
+            raise TypeError(f"No canned output for {self.schema.__name__}")
+        completion = result.model_dump_json()
+        self.model.stats.record(text, completion, delay)
+        if self.include_raw:
+            return {"raw": FakeMessage(completion, text), "parsed": result, "parsing_error": None}
+        return result
+
+    def _pick(self, seq: List[str], *key) -> str:
+        # Deterministic across runs, unlike hash()
+        return seq[sum(map(ord, "".join(map(str, key)))) % len(seq)]
+
+    def _domain_analysis(self, text: str) -> DomainAnalysisLLM:
+        urls = _URL_PATTERN.findall(text)
+        domain_match = re.search(r'articles from (\S+) and identify', text)
+        domain = domain_match.group(1) if domain_match else "unknown"
+        topics = []
+        for i, url in enumerate(urls):
+            name = CANNED_TOPICS[(i + len(domain)) % len(CANNED_TOPICS)]
+            topics.append({
+                "topic": name,
+                "sentiment": self._pick(SENTIMENTS, domain, name),
+                "political_leaning": self._pick(LEANINGS, domain),
+                "framing": f"A(z) {domain} a(z) {name.lower()} témát tárgyilagosan mutatja be.",
+                "key_phrases": [f"{name}: az első kulcsmondat.", f"{name}: a második kulcsmondat."],
+                "article_urls": [url],
+            })
+        return DomainAnalysisLLM(domain=domain, topics=topics)
+
+    def _cross_source_analysis(self, text: str) -> CrossSourceAnalysis:
+        date_match = re.search(r'Date: (\d{4}-\d{2}-\d{2})', text)
+        coverage: Dict[str, List[Dict[str, Any]]] = {}
+        # Split the source data into per-source blocks and group identical topic names across them
+        blocks = _SOURCE_PATTERN.split(text)[1:]
+        for domain, block in zip(blocks[0::2], blocks[1::2]):
+            for name in _TOPIC_PATTERN.findall(block):
+                coverage.setdefault(name.strip(), []).append({
+                    "domain": domain.strip(),
+                    "original_topic_name": name.strip(),
+                    "sentiment": self._pick(SENTIMENTS, domain, name),
+                    "political_leaning": self._pick(LEANINGS, domain),
+                    "key_phrases": [f"{name.strip()}: kulcsmondat."],
+                    "framing": f"A(z) {domain.strip()} saját szemszögéből tárgyalja.",
+                    "article_urls": [],
+                })
+        return CrossSourceAnalysis(
+            date=date_match.group(1) if date_match else "",
+            unified_topics=[
+                {
+                    "name": name,
+                    "source_coverage": sources,
+                    "comparative_analysis": f"{len(sources)} forrás eltérő hangsúllyal foglalkozott a témával.",
+                }
+                for name, sources in coverage.items()
+            ],
+        )
+
+    def _translated_analysis(self, text: str) -> CrossSourceAnalysis:
+        start = text.index("{", text.index("Input JSON"))
+        data = json.loads(text[start:text.rindex("}") + 1])
+        for topic in data.get("unified_topics", []):
+            topic["name"] = f"{topic['name']} (EN)"
+        data["language"] = "en"
+        return CrossSourceAnalysis(**data)
@@ -0,0 +1,202 @@
+"""
+Recorded HTML fixtures for the end-to-end benchmark and the fakes that serve them.
+
+A fixture set is a directory with an index.json mapping every URL the scrapers
+request to an HTML file, plus the date it was recorded on. Replaying a set
+patches `requests.get` in the scraper module to serve those files and freezes
+"today" in the scraper and LLM modules to the recording date, so the scrapers'
+date filters keep the same articles as on the day of the recording.
+"""
+import os
+import json
+import hashlib
+import inspect
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+INDEX_FILENAME = "index.json"
+
+
+class FixtureResponse:
+    """The subset of requests.Response the scrapers use."""
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.encoding = "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+
+class FixtureStore:
+    """
+    A set of HTML pages keyed by URL.
+
+    Args:
+        directory: Directory holding index.json and the page files.
+        recorded_on: Date the pages were recorded (the scrapers' "today").
+        source: "recorded" for live captures, "synthetic" for generated sets.
+    """
+
+    def __init__(self, directory: str, recorded_on: Optional[date] = None, source: str = "recorded"):
+        self.directory = directory
+        self.recorded_on = recorded_on or date.today()
+        self.source = source
+        self.pages: Dict[str, str] = {}
+        self.requests = 0
+        self.bytes_served = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, directory: str) -> "FixtureStore":
+        with open(os.path.join(directory, INDEX_FILENAME), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        store = cls(directory, date.fromisoformat(index["recorded_on"]), index.get("source", "recorded"))
+        store.pages = index["pages"]
+        return store
+
+    def save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        index = {
+            "recorded_on": self.recorded_on.isoformat(),
+            "source": self.source,
+            "pages": dict(sorted(self.pages.items())),
+        }
+        with open(os.path.join(self.directory, INDEX_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+    def add(self, outlet: str, url: str, html: str) -> None:
+        """Store a page under `outlet/` with a file name derived from its URL."""
+        parts = urlsplit(url)
+        name = (parts.path.strip("/").replace("/", "_") or "homepage")[:120]
+        if parts.query:
+            name += "_" + hashlib.sha1(parts.query.encode("utf-8")).hexdigest()[:10]
+        relative_path = f"{outlet}/{name}.html"
+        path = os.path.join(self.directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        self.pages[url] = relative_path
+
+    def get(self, url: str, *args, **kwargs) -> FixtureResponse:
+        """Drop-in replacement for requests.get; unknown URLs get an empty 404 page."""
+        self.requests += 1
+        relative_path = self.pages.get(url)
+        if relative_path is None:
+            self.misses += 1
+            return FixtureResponse(url, b"<html><head></head><body></body></html>", 404)
+        with open(os.path.join(self.directory, relative_path), "rb") as f:
+            content = f.read()
+        self.bytes_served += len(content)
+        return FixtureResponse(url, content)
+
+
+def recording_get(store: FixtureStore, outlet_of: Callable[[str], str], real_get: Callable) -> Callable:
+    """Wrap a real requests.get so every successful response is also saved into `store`."""
+    def get(url: str, *args, **kwargs):
+        kwargs.setdefault("timeout", 30)
+        response = real_get(url, *args, **kwargs)
+        store.requests += 1
+        if response.status_code == 200:
+            store.add(outlet_of(url), url, response.text)
+            store.bytes_served += len(response.content)
+        return response
+    return get
+
+
+class _Frozen(type):
+    # isinstance(x, date) must stay true for real dates after the module's `date` is swapped
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, cls.__mro__[1])
+
+
+def frozen_clock(today: date):
+    """
+    Return `date` and `datetime` subclasses whose today()/now() fall on `today`,
+    keeping the current time of day.
+    """
+    class FrozenDate(date, metaclass=_Frozen):
+        # Constructed values stay plain dates
+        def __new__(cls, *args, **kwargs):
+            return date(*args, **kwargs)
+
+        @classmethod
+        def today(cls):
+            return date(today.year, today.month, today.day)
+
+    class FrozenDateTime(datetime, metaclass=_Frozen):
+        def __new__(cls, *args, **kwargs):
+            return datetime(*args, **kwargs)
+
+        @classmethod
+        def now(cls, tz=None):
+            real = datetime.now(tz)
+            return real.replace(year=today.year, month=today.month, day=today.day)
+
+    return FrozenDate, FrozenDateTime
+
+
+def install_clock(modules, today: date) -> None:
+    """Freeze today in every module that imported `date`/`datetime` by name."""
+    frozen_date, frozen_datetime = frozen_clock(today)
+    for module in modules:
+        if hasattr(module, "date"):
+            module.date = frozen_date
+        if hasattr(module, "datetime"):
+            module.datetime = frozen_datetime
+
+
+class NoSleepAsyncio:
+    """
+    Stand-in for the scraper's `asyncio` module that skips politeness delays
+    (scrape_index sleeps 3 s per article) while recording how long they would
+    have taken.
+    """
+
+    def __init__(self, real_asyncio):
+        self._asyncio = real_asyncio
+        self.skipped_seconds = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._asyncio, name)
+
+    async def sleep(self, delay, result=None):
+        self.skipped_seconds += delay
+        await self._asyncio.sleep(0)
+        return result
+
+
+def timed(func: Callable, record: Callable[[float, bool], None]) -> Callable:
+    """Wrap a sync or async function so each call's wall time and success are passed to `record`."""
+    if inspect.iscoroutinefunction(func):
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = await func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                record(time.perf_counter() - start, ok)
+        return async_wrapper
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            record(time.perf_counter() - start, ok)
+    return wrapper
@@ -0,0 +1,68 @@
+"""
+Record a fixture set for the end-to-end benchmark from the live outlets.
+
+Runs every scraper in scripts/scraper.py against the real sites, saving each
+page it downloads under the outlet's directory, with a fake LLM and without
+touching the database. The recorded set replaces the one in --output only
+after every outlet was recorded, so a failed run leaves the old set intact.
+
+Usage:
+    python benchmarks/e2e/record_fixtures.py [--output DIR]
+"""
+import os
+import sys
+import shutil
+import asyncio
+import argparse
+from datetime import date
+
+from fixtures import DEFAULT_FIXTURES_DIR, FixtureStore, NoSleepAsyncio, recording_get
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path[:0] = [project_root, os.path.join(project_root, "scripts")]
+
+
+async def record(output: str) -> FixtureStore:
+    import scraper
+    import llm
+    from fake_llm import FakeChatModel
+    from run_e2e import SCRAPERS
+
+    staging = output.rstrip("/") + ".recording"
+    shutil.rmtree(staging, ignore_errors=True)
+    store = FixtureStore(staging, recorded_on=date.today(), source="recorded")
+    current = {"outlet": None}
+    scraper.requests.get = recording_get(store, lambda url: current["outlet"], scraper.requests.get)
+    scraper.asyncio = NoSleepAsyncio(asyncio)
+    llm.get_chat_model = lambda *args, **kwargs: FakeChatModel()
+
+    kept = {}
+
+    async def keep_articles(articles, domain):
+        kept[domain] = len(articles)
+
+    scraper.process_articles_multilingual = keep_articles
+
+    for outlet, function_name in SCRAPERS.items():
+        current["outlet"] = outlet
+        print(f"Recording {outlet}...")
+        await getattr(scraper, function_name)()
+        print(f"  {kept.get(outlet, 0)} articles from today")
+
+    store.save()
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(staging, output)
+    store.directory = output
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_FIXTURES_DIR)
+    args = parser.parse_args()
+    store = asyncio.run(record(os.path.abspath(args.output)))
+    print(f"Recorded {len(store.pages)} pages ({store.bytes_served / 1024:.0f} KB) on {store.recorded_on} to {store.directory}")
+
+
+if __name__ == "__main__":
+    main()
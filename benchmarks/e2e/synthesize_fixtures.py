@@ -0,0 +1,223 @@
+"""
+Generate the HTML fixture set for the end-to-end benchmark.
+
+Writes a homepage and ARTICLES_PER_OUTLET article pages for each of the eleven
+outlets scraped by scripts/scraper.py, built from the selectors each scraper
+reads (link classes, title/lead/body elements, published-time meta tags, date
+formats in URLs) plus navigation and boilerplate it has to skip. One article
+per outlet is dated the day before so the date filter is exercised. Text is
+generated deterministically, so the set is reproducible.
+
+Use record_fixtures.py instead to capture the live sites.
+
+Usage:
+    python benchmarks/e2e/synthesize_fixtures.py [--output DIR] [--date YYYY-MM-DD]
+"""
+import random
+import argparse
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from fixtures import DEFAULT_FIXTURES_DIR, FixtureStore
+
+ARTICLES_PER_OUTLET = 4
+
+HU_MONTHS = ["jan.", "feb.", "márc.", "ápr.", "máj.", "jún.", "júl.", "aug.", "szept.", "okt.", "nov.", "dec."]
+
+WORDS = (
+    "a kormány parlament ellenzék miniszter javaslat törvény költségvetés választás önkormányzat "
+    "gazdaság infláció forint jegybank kamat adó nyugdíj egészségügy kórház oktatás iskola tanár "
+    "Brüsszel uniós támogatás háború Ukrajna béke tárgyalás NATO Amerika Kína energia gázár "
+    "szerdán csütörtökön bejelentette szerint közölte hétfőn reggel budapesti vidéki magyar "
+    "ügyészség rendőrség bíróság ítélet nyomozás tüntetés szakszervezet sztrájk bérek fizetés"
+).split()
+
+TOPIC_SLUGS = [
+    "koltsegvetes-vita", "inflacio-lassul", "ukrajna-beketargyalas", "egeszsegugyi-reform",
+    "tanarsztrajk", "unios-forrasok", "gazar-emelkedes", "valasztasi-kampany",
+]
+
+
+def sentence(rng: random.Random, words: int = 14) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraphs(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(sentence(rng) for _ in range(rng.randint(3, 6))) for _ in range(count)]
+
+
+def page(head: str, body: str) -> str:
+    boilerplate = "".join(
+        f'<li><a class="menu-item" href="#section-{i}">Rovat {i}</a></li>' for i in range(40)
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"hu\"><head><meta charset=\"utf-8\">"
+        f"{head}<script>window.dataLayer=[];</script></head><body>"
+        f"<header><nav><ul>{boilerplate}</ul></nav></header><main>{body}</main>"
+        f"<footer><ul>{boilerplate}</ul><p>Minden jog fenntartva.</p></footer></body></html>"
+    )
+
+
+def ps(rng: random.Random, count: int = 6) -> str:
+    return "".join(f"<p>{text}</p>" for text in paragraphs(rng, count))
+
+
+class Outlet:
+    """Homepage and article builders for one outlet."""
+
+    def __init__(self, name: str, homepage_url: str,
+                 article_url: Callable[[date, str, int], Tuple[str, str]],
+                 homepage: Callable[[List[str]], str],
+                 article: Callable[[random.Random, str, date], str],
+                 extra_pages: Dict[str, str] = None):
+        self.name = name
+        self.homepage_url = homepage_url
+        # Returns (link as it appears on the homepage, absolute URL the scraper fetches)
+        self.article_url = article_url
+        self.homepage = homepage
+        self.article = article
+        self.extra_pages = extra_pages or {}
+
+
+def iso(day: date) -> str:
+    return f"{day.isoformat()}T08:30:00+02:00"
+
+
+def links(hrefs: List[str], attrs: str = "") -> str:
+    return "".join(f'<a {attrs} href="{href}">Cikk</a>' for href in hrefs)
+
+
+OUTLETS = [
+    Outlet(
+        "telex", "https://www.telex.hu",
+        lambda d, slug, i: (f"/belfold/{d:%Y/%m/%d}/{slug}", f"https://www.telex.hu/belfold/{d:%Y/%m/%d}/{slug}"),
+        lambda hrefs: page("<title>Telex</title>",
+                           links(hrefs, 'class="item__title"') + links(["https://www.telex.hu/english"], 'class="item__title"')),
+        lambda rng, title, d: page(f"<title>{title}</title>",
+                                   f"<h1>{title}</h1><div class=\"article-html-content\">{ps(rng)}"
+                                   "<div class=\"ad\">Hirdetés</div></div>"),
+    ),
+    Outlet(
+        "origo", "https://www.origo.hu",
+        lambda d, slug, i: (f"/itthon/{d:%Y/%m}/{slug}", f"https://www.origo.hu/itthon/{d:%Y/%m}/{slug}"),
+        lambda hrefs: page("<title>Origo</title>", links(hrefs, 'class="article-card-link"')),
+        lambda rng, title, d: page(f'<meta name="article:published_time" content="{iso(d)}">',
+                                   f"<h1 class=\"article-title\">{title}</h1><div class=\"article-lead\">{sentence(rng)}</div>"
+                                   f"<div class=\"block-content\">{ps(rng)}</div>"),
+    ),
+    Outlet(
+        "mandiner", "https://www.mandiner.hu",
+        lambda d, slug, i: (f"/belfold/{d:%Y/%m}/{slug}", f"https://www.mandiner.hu/belfold/{d:%Y/%m}/{slug}"),
+        lambda hrefs: page("<title>Mandiner</title>", links(hrefs, 'class="article-card-link"')),
+        lambda rng, title, d: page(f'<meta name="article:published_time" content="{iso(d)}">',
+                                   f"<h1 class=\"article-page-title\">{title}</h1><div class=\"article-page-lead\">{sentence(rng)}</div>"
+                                   f"<div class=\"block-content\"><i>Nyitókép: MTI</i>{ps(rng, 3)}</div>"
+                                   f"<div class=\"block-content\">{ps(rng, 3)}</div>"),
+    ),
+    Outlet(
+        "hvg", "https://www.hvg.hu",
+        lambda d, slug, i: (f"/itthon/{d:%Y%m%d}_{slug}", f"https://www.hvg.hu/itthon/{d:%Y%m%d}_{slug}"),
+        lambda hrefs: page("<title>HVG</title>",
+                           "".join(f'<h1><a href="{href}">Cikk</a></h1>' for href in hrefs)
+                           + '<h1><a href="/360/20250101_zart_cikk">Zárt cikk</a></h1>'),
+        lambda rng, title, d: page(f'<meta property="article:published_time" content="{iso(d)}">',
+                                   f"<h1>{title}</h1><p class=\"article-lead\">{sentence(rng)}</p>"
+                                   "<div class=\"article-content\">Megosztás</div>"
+                                   f"<div class=\"article-content\">{ps(rng)}</div>"),
+    ),
+    Outlet(
+        "444", "https://www.444.hu",
+        lambda d, slug, i: (f"https://444.hu/{d:%Y/%m/%d}/{slug}",) * 2,
+        lambda hrefs: page("<title>444</title>", links(hrefs + [
+            "https://444.hu/kor", "https://444.hu/szerzoi-jogok", "https://444.hu/adatvedelmi-nyilatkozat",
+            "https://444.hu/mediaajanlat", "https://444.hu/tamogatas-altalanos-szerzodesi-feltetelek",
+        ])),
+        lambda rng, title, d: page(f'<meta property="article:published_time" content="{iso(d)}">',
+                                   f"<h1 class=\"_18v5wa35\">{title}</h1><div class=\"jogfs53\">{ps(rng)}"
+                                   "<figure><img src=\"/kep.jpg\"><figcaption>Fotó</figcaption></figure></div>"),
+    ),
+    Outlet(
+        "24.hu", "https://www.24.hu",
+        lambda d, slug, i: (f"https://24.hu/belfold/{d:%Y/%m/%d}/{slug}/",) * 2,
+        lambda hrefs: page("<title>24.hu</title>", links(hrefs + ["https://24.hu/szerzo/", "https://24.hu/belfold/"])),
+        lambda rng, title, d: page(f'<meta property="article:published_time" content="{iso(d)}">',
+                                   f"<h1 class=\"o-post__title\">{title}</h1><div class=\"u-onlyArticlePages\">{ps(rng)}"
+                                   "<div class=\"related\">Kapcsolódó</div></div>"),
+    ),
+    Outlet(
+        "vadhajtasok", "https://www.vadhajtasok.hu",
+        lambda d, slug, i: (f"https://www.vadhajtasok.hu/{d:%Y/%m/%d}/{slug}",) * 2,
+        lambda hrefs: page("<title>Vadhajtások</title>", links(hrefs + [
+            "https://www.vadhajtasok.hu/", "https://www.vadhajtasok.hu/impresszum",
+            "https://www.vadhajtasok.hu/szerzoi-jogok", "https://www.vadhajtasok.hu/adatvedelmi-szabalyzat",
+        ])),
+        lambda rng, title, d: page(f'<meta property="og:title" content="{title}">',
+                                   f"<div class=\"post-content\">{ps(rng)}<div class=\"share\">Megosztás</div></div>"),
+    ),
+    Outlet(
+        "magyarjelen", "https://www.magyarjelen.hu",
+        lambda d, slug, i: (f"/belfold/{slug}-{i}", f"https://www.magyarjelen.hu/belfold/{slug}-{i}"),
+        lambda hrefs: page("<title>Magyar Jelen</title>", links(hrefs + ["/kapcsolat", "/in-english/news-1"])),
+        lambda rng, title, d: page(f'<meta property="og:title" content="{title}">',
+                                   f"<div class=\"newsDate\">{d.year}. {HU_MONTHS[d.month - 1]} {d.day}. 08:30</div>"
+                                   f"<div class=\"newsPageDescription\">{ps(rng)}</div>"),
+    ),
+    Outlet(
+        "nyugatifeny", "https://www.nyugatifeny.hu",
+        lambda d, slug, i: (f"https://www.nyugatifeny.hu/{slug}/",) * 2,
+        lambda hrefs: page("<title>Nyugati Fény</title>", links(hrefs)),
+        lambda rng, title, d: page(f'<title>{title}</title><meta property="article:published_time" content="{iso(d)}">',
+                                   f"<div class=\"entry-content\">{ps(rng)}</div>"),
+    ),
+    Outlet(
+        "index", "https://index.hu",
+        lambda d, slug, i: (
+            f"https://dex.hu/x.php?id=index&url=https%3A%2F%2Findex.hu%2Fbelfold%2F{d.year}%2F{d.month}%2F{d.day}%2F{slug}%2F",
+            f"https://index.hu/belfold/{d.year}/{d.month}/{d.day}/{slug}/",
+        ),
+        lambda hrefs: page("<title>Index</title>", links(hrefs + ["https://index.hu/belfold/"])),
+        lambda rng, title, d: page(f'<meta property="og:title" content="{title}">'
+                                   f'<meta property="article:published_time" content="{iso(d)}">',
+                                   f"<div class=\"lead\">{sentence(rng)}</div><div class=\"cikk-torzs\">{ps(rng)}</div>"),
+    ),
+    Outlet(
+        "magyarnemzet", "https://www.magyarnemzet.hu",
+        lambda d, slug, i: (f"/belfold/{d:%Y/%m}/{slug}", f"https://www.magyarnemzet.hu/belfold/{d:%Y/%m}/{slug}"),
+        lambda hrefs: page("<title>Magyar Nemzet</title>", links(hrefs + ["/publicapi/hu/rss/magyar_nemzet/articles"])),
+        lambda rng, title, d: page(f'<meta property="og:title" content="{title}">'
+                                   f'<meta property="article:published_time" content="{iso(d)}">',
+                                   f"<h2 class=\"lead\">{sentence(rng)}</h2><app-article-text>{ps(rng)}</app-article-text>"),
+    ),
+]
+
+
+def synthesize(output: str, recorded_on: date) -> FixtureStore:
+    store = FixtureStore(output, recorded_on=recorded_on, source="synthetic")
+    for outlet in OUTLETS:
+        rng = random.Random(outlet.name)
+        homepage_links = []
+        for i in range(ARTICLES_PER_OUTLET):
+            # The last article is from the day before and must be skipped by the date filter
+            day = recorded_on if i < ARTICLES_PER_OUTLET - 1 else recorded_on - timedelta(days=1)
+            slug = TOPIC_SLUGS[(i + len(outlet.name)) % len(TOPIC_SLUGS)]
+            link, url = outlet.article_url(day, slug, i)
+            homepage_links.append(link)
+            title = sentence(rng, 8).rstrip(".")
+            store.add(outlet.name, url, outlet.article(rng, title, day))
+        store.add(outlet.name, outlet.homepage_url, outlet.homepage(homepage_links))
+    store.save()
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--date", type=date.fromisoformat, default=date(2025, 5, 14), help="Recording date of the set")
+    args = parser.parse_args()
+    store = synthesize(args.output, args.date)
+    print(f"Wrote {len(store.pages)} pages for {len(OUTLETS)} outlets to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
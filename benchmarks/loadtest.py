@@ -0,0 +1,153 @@
+"""
+Load-test harness for the production server profile (backend.serve).
+
+For each worker count, starts `python -m backend.serve --workers N` against the
+database in DATABASE_URL (a local Postgres with scraped data), waits for
+/health, drives it with a fixed number of concurrent keep-alive clients for a
+fixed duration, then stops it with SIGTERM. Reports requests per second and
+latency percentiles per worker count.
+
+The client runs in a single process; when requests per second stop scaling
+with the worker count, check whether this process is CPU-bound before
+blaming the server.
+
+Usage:
+    python benchmarks/loadtest.py [--workers 1 2 4] [--concurrency 64] [--duration 15]
+    python benchmarks/loadtest.py --url http://localhost:8000   # an already running server
+"""
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List, Optional
+
+import httpx
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Read endpoints in roughly the proportions the frontend requests them
+DEFAULT_PATHS = [
+    "/summaries?language=hu",
+    "/summaries?language=hu&mode=parsed",
+    "/cross-source-analysis?language=hu",
+    "/cross-source-analysis?language=hu&view=summary",
+    "/unified-topics?language=hu",
+    "/summaries?language=en",
+    "/cross-source-analysis?language=en",
+]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "backend.serve", "--workers", str(workers), "--port", str(port), "--host", "127.0.0.1"],
+        cwd=project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {url} did not become ready within {timeout:.0f}s")
+
+
+async def run_load(url: str, paths: List[str], concurrency: int, duration: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0,
+                                 headers={"Accept-Encoding": "br, gzip"}) as client:
+        # One untimed pass so every worker's caches are warm for the measured paths
+        await asyncio.gather(*(client.get(path) for path in paths))
+        deadline = time.monotonic() + duration
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            i = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "errors": errors,
+    }
+
+
+def print_result(label: str, result: Dict[str, float]) -> None:
+    print(f"{label:>8}{result['requests']:>10}{result['rps']:>10.0f}"
+          f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+
+
+async def main_async(args) -> None:
+    paths = args.paths or DEFAULT_PATHS
+    print(f"{'workers':>8}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+    if args.url:
+        print_result("ext", await run_load(args.url, paths, args.concurrency, args.duration))
+        return
+
+    for workers in args.workers:
+        process = start_server(workers, args.port)
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            await wait_ready(url)
+            result = await run_load(url, paths, args.concurrency, args.duration)
+        finally:
+            stop_server(process)
+        print_result(str(workers), result)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per worker count")
+    parser.add_argument("--port", type=int, default=8100, help="Port for the servers started by the harness")
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--paths", nargs="*", help="Request paths to cycle through")
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
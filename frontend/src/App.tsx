@@ -8,6 +8,7 @@ import AboutPage from './components/AboutPage';
 import TopicAnalysisPage from './components/TopicAnalysisPage';
 import { Summary, SummaryApiResponse } from './types';
 import { API_URL } from './config';
+import { fetchSnapshot } from './utils/snapshots';
 import DelayedLoadingMessage from './components/DelayedLoadingMessage';
 import { useLanguage } from './contexts/LanguageContext';
 
@@ -25,19 +26,22 @@ const HomePage = () => {
       setLoading(true);
       setError(null);
       try {
-        console.log("API URL:", API_URL);
-        const response = await fetch(`${API_URL}/summaries?language=${language}`);
-        if (!response.ok) {
-          let errorDetail = `HTTP error! status: ${response.status}`;
-          try {
-            const errorData = await response.json();
-            errorDetail = errorData.detail || errorDetail;
-          } catch (parseError) {
-            console.warn("Could not parse error response:", parseError);
+        let data = await fetchSnapshot<SummaryApiResponse>('summaries', language, null, 'raw');
+        if (!data) {
+          console.log("API URL:", API_URL);
+          const response = await fetch(`${API_URL}/summaries?language=${language}`);
+          if (!response.ok) {
+            let errorDetail = `HTTP error! status: ${response.status}`;
+            try {
+              const errorData = await response.json();
+              errorDetail = errorData.detail || errorDetail;
+            } catch (parseError) {
+              console.warn("Could not parse error response:", parseError);
+            }
+            throw new Error(errorDetail);
           }
-          throw new Error(errorDetail);
+          data = await response.json() as SummaryApiResponse;
         }
-        const data: SummaryApiResponse = await response.json();
         if (data.success && Array.isArray(data.summaries)) {
           setSummaries(data.summaries);
         } else {
@@ -6,6 +6,7 @@ import TopicCard from './TopicCard';
 import TopicAnalysisModal from './TopicAnalysisModal';
 import SentimentDashboard from './SentimentDashboard';
 import { formatDate } from '../utils/dateUtils';
+import { fetchSnapshot } from '../utils/snapshots';
 import DelayedLoadingMessage from './DelayedLoadingMessage';
 import { useLanguage } from '../contexts/LanguageContext';
 
@@ -59,18 +60,21 @@ const TopicAnalysisPage: React.FC = () => {
       setError(null);
       
       try {
-        const url = dateParam 
-          ? `${API_URL}/cross-source-analysis?date=${dateParam}&language=${language}`
-          : `${API_URL}/cross-source-analysis?language=${language}`;
+        let data = await fetchSnapshot<CrossSourceAnalysisResponse>('cross-source-analysis', language, dateParam);
+        if (!data) {
+          const url = dateParam 
+            ? `${API_URL}/cross-source-analysis?date=${dateParam}&language=${language}`
+            : `${API_URL}/cross-source-analysis?language=${language}`;
+            
+          const response = await fetch(url);
           
-        const response = await fetch(url);
-        
-        if (!response.ok) {
-          throw new Error(`HTTP error! Status: ${response.status}`);
+          if (!response.ok) {
+            throw new Error(`HTTP error! Status: ${response.status}`);
+          }
+          
+          data = await response.json() as CrossSourceAnalysisResponse;
         }
         
-        const data: CrossSourceAnalysisResponse = await response.json();
-        
         if (data.success && data.analysis) {
           setAnalysis(data);
         } else {
@@ -2,6 +2,10 @@
 
 export const API_URL = import.meta.env.VITE_API_URL;
 
+// Static snapshots published next to the site by the scraper workflow; set
+// VITE_SNAPSHOT_URL to an empty string to always read from the API
+export const SNAPSHOT_URL: string = import.meta.env.VITE_SNAPSHOT_URL ?? `${import.meta.env.BASE_URL}snapshots`;
+
 // News source configuration
 export interface NewsSourceConfig {
   name: string;
@@ -1,8 +1,19 @@
-export interface Summary {
+export interface SummarySections {
+    bevezeto?: string;
+    belfold?: string;
+    kulfold?: string;
+    tarsadalom?: string;
+    zaras?: string;
+  }
+
+  export interface Summary {
     domain: string;
     language: string;
     date: string;
     content: string;
+    // Only present when requested with mode=parsed
+    short_summary?: string;
+    sections?: SummarySections;
   }
   
   export interface SummaryApiResponse {
@@ -0,0 +1,73 @@
+// Static JSON snapshots of the API responses, published next to the site by the
+// scraper workflow (scripts/publisher.py). Reads fall back to the API whenever a
+// response has no snapshot.
+import { SNAPSHOT_URL } from '../config';
+
+interface SnapshotEntry {
+  path: string;
+}
+
+interface SnapshotManifest {
+  version: string;
+  entries: Record<string, SnapshotEntry>;
+}
+
+let manifestPromise: Promise<SnapshotManifest | null> | null = null;
+
+const loadManifest = (): Promise<SnapshotManifest | null> => {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${SNAPSHOT_URL}/index.json`, { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+};
+
+// Manifest keys are "<endpoint>/<date>/<language>[/<extra>...]", see backend/snapshots.py
+const findKey = (
+  manifest: SnapshotManifest,
+  endpoint: string,
+  language: string,
+  date: string | null,
+  extra: string[]
+): string | null => {
+  const suffix = [language, ...extra.map(encodeURIComponent)].join('/');
+  if (date) {
+    const key = `${endpoint}/${date}/${suffix}`;
+    return key in manifest.entries ? key : null;
+  }
+  // Without a date the API serves the latest data, which is the newest published date
+  const keys = Object.keys(manifest.entries).filter(key => {
+    const parts = key.split('/');
+    return parts[0] === endpoint && parts.slice(2).join('/') === suffix;
+  });
+  return keys.sort().pop() ?? null;
+};
+
+/**
+ * Load the published snapshot of an API response.
+ *
+ * @returns The parsed response body, or null if there is no snapshot for it.
+ */
+export const fetchSnapshot = async <T>(
+  endpoint: string,
+  language: string,
+  date: string | null = null,
+  ...extra: string[]
+): Promise<T | null> => {
+  if (!SNAPSHOT_URL) {
+    return null;
+  }
+  try {
+    const manifest = await loadManifest();
+    const key = manifest ? findKey(manifest, endpoint, language, date, extra) : null;
+    if (!manifest || !key) {
+      return null;
+    }
+    const response = await fetch(`${SNAPSHOT_URL}/${manifest.entries[key].path}`);
+    return response.ok ? ((await response.json()) as T) : null;
+  } catch (err) {
+    console.warn(`Loading the ${endpoint} snapshot failed, using the API:`, err);
+    return null;
+  }
+};
@@ -0,0 +1,135 @@
+"""
+Near-duplicate detection for scraped articles.
+
+Wire-service stories (MTI and others) show up on several outlets, and some
+outlets link the same story under several URLs. Each article's content is
+split into word shingles and summarized by a MinHash signature; locality
+sensitive hashing over signature bands finds candidate pairs, which are then
+confirmed by the Jaccard similarity of their shingle sets.
+
+Within an outlet, near-duplicates are collapsed to the first occurrence before
+the articles reach the LLM. Across outlets the articles are kept, and the
+outlets sharing a story are reported so the cross-source step can be told.
+"""
+import re
+import zlib
+import random
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set
+
+from backend.models.db_models import ScrapedArticle
+from backend.utils.textutils import normalize_domain
+
+_WORD_RE = re.compile(r"\w+")
+# Smallest prime above 2**32, so the permutations are exact over crc32 shingle hashes
+_PRIME = 4294967311
+
+
+class IndexedArticle(NamedTuple):
+    url: str
+    outlet: str
+    shingles: FrozenSet[int]
+
+
+def shingles(text: str, size: int) -> FrozenSet[int]:
+    """Hashes of the overlapping `size`-word windows of the lowercased text."""
+    words = _WORD_RE.findall(text.lower())
+    return frozenset(
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(max(len(words) - size + 1, 1))
+    )
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ArticleDedupIndex:
+    """
+    MinHash/LSH index of the articles seen during one pipeline run.
+
+    Args:
+        threshold: Minimum Jaccard similarity of two articles' shingle sets to count as duplicates.
+        min_words: Articles with fewer words are never treated as duplicates (teasers, paywalled stubs).
+        shingle_size: Words per shingle.
+        num_perm: MinHash permutations per signature.
+        bands: LSH bands; num_perm must be divisible by it.
+    """
+
+    def __init__(self, threshold: float = 0.8, min_words: int = 50, shingle_size: int = 5, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.min_words = min_words
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(20250514)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.reset()
+
+    def reset(self) -> None:
+        self._articles: Dict[str, IndexedArticle] = {}
+        self._buckets: Dict[tuple, List[str]] = defaultdict(list)
+        # URL of a collapsed article -> URL of the article kept in its place
+        self.collapsed: Dict[str, str] = {}
+        # URL -> URLs of near-duplicates on other outlets
+        self._cross_outlet: Dict[str, Set[str]] = defaultdict(set)
+
+    def _signature(self, hashes: FrozenSet[int]) -> List[int]:
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._permutations]
+
+    def _band_keys(self, signature: List[int]) -> Iterable[tuple]:
+        for band in range(self.bands):
+            yield (band, *signature[band * self.rows:(band + 1) * self.rows])
+
+    def _matches(self, article: IndexedArticle, keys: List[tuple]) -> List[IndexedArticle]:
+        candidates = {url for key in keys for url in self._buckets.get(key, ())}
+        matches = [self._articles[url] for url in candidates]
+        return [other for other in matches if jaccard(article.shingles, other.shingles) >= self.threshold]
+
+    def collapse(self, articles: List[ScrapedArticle], outlet: str) -> List[ScrapedArticle]:
+        """
+        Return `articles` without near-duplicates of an earlier article of the same
+        outlet, and add the kept ones to the index.
+
+        Near-duplicates on other outlets are kept and linked, see `shared_outlets`.
+        """
+        kept = []
+        for scraped in articles:
+            if scraped.url in self._articles:
+                self.collapsed[scraped.url] = scraped.url
+                continue
+            if len(_WORD_RE.findall(scraped.content)) < self.min_words:
+                kept.append(scraped)
+                continue
+
+            article = IndexedArticle(scraped.url, normalize_domain(outlet), shingles(scraped.content, self.shingle_size))
+            keys = list(self._band_keys(self._signature(article.shingles)))
+            matches = self._matches(article, keys)
+
+            same_outlet = next((other for other in matches if other.outlet == article.outlet), None)
+            if same_outlet is not None:
+                self.collapsed[scraped.url] = same_outlet.url
+                continue
+
+            for other in matches:
+                self._cross_outlet[article.url].add(other.url)
+                self._cross_outlet[other.url].add(article.url)
+            self._articles[article.url] = article
+            for key in keys:
+                self._buckets[key].append(article.url)
+            kept.append(scraped)
+        return kept
+
+    def shared_outlets(self, urls: Iterable[str], outlet: str) -> List[str]:
+        """Other outlets that published a near-duplicate of any of `urls`."""
+        own = normalize_domain(outlet)
+        outlets = set()
+        for url in urls:
+            for other in self._cross_outlet.get(self.collapsed.get(url, url), ()):
+                outlets.add(self._articles[other].outlet)
+        outlets.discard(own)
+        return sorted(outlets)
@@ -1,7 +1,16 @@
 import os
+import sys
+import json
 import asyncio
 from dotenv import load_dotenv
 import asyncpg
+from datetime import date
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from retention import PARTITIONED_TABLES, add_months, convert_to_partitioned, ensure_partitions, is_partitioned
+from backend.documents import normalize_analysis_document, unified_topic_rows
 
 # Load environment variables from root .env file
 load_dotenv()
@@ -9,6 +18,56 @@ load_dotenv()
 # Get the database URL from the environment variable
 db_url = os.getenv("DATABASE_URL")
 
+async def backfill_unified_topics(conn, batch_size: int = 200):
+    """
+    Writes unified_topics and source_coverage rows for the analyses that have none,
+    built like the scraper builds them: normalized domains, slug topic ids and the
+    Sentiment/PoliticalLeaning codes.
+    """
+    last_id = 0
+    while True:
+        analyses = await conn.fetch('''
+        SELECT csa.id, csa.date, csa.language, csa.analysis_json
+        FROM cross_source_analyses csa
+        WHERE csa.id > $1
+            AND NOT EXISTS (SELECT 1 FROM unified_topics existing WHERE existing.analysis_id = csa.id)
+        ORDER BY csa.id LIMIT $2
+        ''', last_id, batch_size)
+        if not analyses:
+            return
+        last_id = analyses[-1]['id']
+
+        topic_rows, coverage_rows = [], []
+        for analysis in analyses:
+            document = analysis['analysis_json']
+            if isinstance(document, str):
+                document = json.loads(document)
+            if not isinstance(document, dict) or not isinstance(document.get("unified_topics"), list):
+                continue
+            topics, coverage = unified_topic_rows(normalize_analysis_document(document)["unified_topics"])
+            keys = (analysis['id'], analysis['date'], analysis['language'])
+            topic_rows.extend((*keys, *row) for row in topics)
+            coverage_rows.extend((keys, row) for row in coverage)
+        if not topic_rows:
+            continue
+
+        async with conn.transaction():
+            rows = await conn.fetch('''
+            INSERT INTO unified_topics (analysis_id, date, language, position, topic_id, name, comparative_analysis)
+            SELECT * FROM unnest($1::int[], $2::date[], $3::text[], $4::smallint[], $5::text[], $6::text[], $7::text[])
+            RETURNING id, analysis_id, position
+            ''', *(list(column) for column in zip(*topic_rows)))
+            topic_row_ids = {(row['analysis_id'], row['position']): row['id'] for row in rows}
+            await conn.executemany('''
+            INSERT INTO source_coverage
+            (unified_topic_id, analysis_id, date, language, domain, original_topic_name,
+             sentiment, political_leaning, framing, key_phrases, article_urls)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+            ''', [
+                (topic_row_ids[(keys[0], row.position)], *keys, *row[1:])
+                for keys, row in coverage_rows
+            ])
+
 async def create_tables():
     """Create database tables directly using asyncpg."""
     print(f"Using DATABASE_URL: {db_url}")
@@ -52,25 +111,27 @@ async def create_tables():
     
     await conn.execute('''
     CREATE TABLE IF NOT EXISTS summaries (
-        id SERIAL PRIMARY KEY,
+        id SERIAL,
         domain VARCHAR(255) NOT NULL,
         language VARCHAR(5) NOT NULL,
         date DATE NOT NULL,
         content TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, date)
+    ) PARTITION BY RANGE (date)
     ''')
     
     await conn.execute('''
     CREATE TABLE IF NOT EXISTS scraped_articles (
-        id SERIAL PRIMARY KEY,
+        id SERIAL,
         url VARCHAR(512) NOT NULL,
         domain VARCHAR(255) NOT NULL,
         title TEXT NOT NULL,
         content TEXT NOT NULL,
         publication_date DATE,
-        scraped_at TIMESTAMP NOT NULL
-    )
+        scraped_at TIMESTAMPTZ NOT NULL,
+        PRIMARY KEY (id, scraped_at)
+    ) PARTITION BY RANGE (scraped_at)
     ''')
 
     await conn.execute('''
@@ -123,7 +184,240 @@ async def create_tables():
     await conn.execute('''
     ALTER TABLE domain_analyses ADD COLUMN IF NOT EXISTS language VARCHAR(5) NOT NULL DEFAULT 'hu'
     ''')
-        
+
+    await conn.execute('''
+    ALTER TABLE summaries ADD COLUMN IF NOT EXISTS short_summary TEXT
+    ''')
+
+    await conn.execute('''
+    ALTER TABLE summaries ADD COLUMN IF NOT EXISTS sections JSONB
+    ''')
+
+    # Version marker bumped by the scraper after each write, used to invalidate API caches
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id SMALLINT PRIMARY KEY DEFAULT 1,
+        version BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    await conn.execute('''
+    INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING
+    ''')
+
+    # Serves the latest-per-domain lookup of /summaries
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_summaries_language_date_domain_created
+        ON summaries (language, date, domain, created_at DESC)
+    ''')
+
+    # Serves latest-per-date scans over the analysis history
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_cross_source_analyses_language_date_created
+        ON cross_source_analyses (language, date, created_at DESC)
+    ''')
+
+    # Latest analysis per (language, date), upserted by the scraper so the
+    # analysis endpoints resolve their row with a single primary-key lookup
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS latest_cross_source_analysis (
+        language VARCHAR(5) NOT NULL,
+        date DATE NOT NULL,
+        analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+        created_at TIMESTAMP,
+        PRIMARY KEY (language, date) INCLUDE (analysis_id, created_at)
+    )
+    ''')
+
+    await conn.execute('''
+    INSERT INTO latest_cross_source_analysis (language, date, analysis_id, created_at)
+    SELECT DISTINCT ON (language, date) language, date, id, created_at
+    FROM cross_source_analyses
+    ORDER BY language, date, created_at DESC
+    ON CONFLICT (language, date) DO NOTHING
+    ''')
+
+    # One row per LLM call of the scraper pipeline, for token and cost reports
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS llm_calls (
+        id BIGSERIAL PRIMARY KEY,
+        run_id VARCHAR(32) NOT NULL,
+        call VARCHAR(64) NOT NULL,
+        outlet VARCHAR(255),
+        language VARCHAR(5),
+        model VARCHAR(128) NOT NULL,
+        input_tokens INTEGER NOT NULL,
+        output_tokens INTEGER NOT NULL,
+        latency_seconds DOUBLE PRECISION NOT NULL,
+        succeeded BOOLEAN NOT NULL,
+        cost_usd DOUBLE PRECISION NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_llm_calls_created_at ON llm_calls (created_at)
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_llm_calls_run_id ON llm_calls (run_id)
+    ''')
+
+    # Full-text search: Hungarian stemming on accent-folded words, generated
+    # tsvector columns computed on insert, and GIN indexes over them
+    await conn.execute('''
+    CREATE EXTENSION IF NOT EXISTS unaccent
+    ''')
+
+    await conn.execute('''
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'hungarian_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION hungarian_unaccent (COPY = hungarian);
+            ALTER TEXT SEARCH CONFIGURATION hungarian_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, hungarian_stem;
+        END IF;
+    END
+    $$
+    ''')
+
+    await conn.execute('''
+    ALTER TABLE scraped_articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('hungarian_unaccent', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('hungarian_unaccent', coalesce(content, '')), 'B')
+    ) STORED
+    ''')
+
+    await conn.execute('''
+    ALTER TABLE topic_analyses ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('hungarian_unaccent', coalesce(topic_name, '')), 'A') ||
+        setweight(to_tsvector('hungarian_unaccent', coalesce(framing, '')), 'B')
+    ) STORED
+    ''')
+
+    await conn.execute('''
+    ALTER TABLE key_phrases ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('hungarian_unaccent', coalesce(phrase, '')), 'B')
+    ) STORED
+    ''')
+
+    await conn.execute('''
+    ALTER TABLE summaries ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector(
+            CASE WHEN language = 'en' THEN 'english'::regconfig ELSE 'hungarian_unaccent'::regconfig END,
+            coalesce(short_summary, '')), 'A') ||
+        setweight(to_tsvector(
+            CASE WHEN language = 'en' THEN 'english'::regconfig ELSE 'hungarian_unaccent'::regconfig END,
+            regexp_replace(coalesce(content, ''), '\\[(START|END)_[A-Z_]+\\]', ' ', 'g')), 'B')
+    ) STORED
+    ''')
+
+    for table in ["scraped_articles", "topic_analyses", "key_phrases", "summaries"]:
+        await conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN (search_vector)
+        ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_key_phrases_topic_analysis_id ON key_phrases (topic_analysis_id)
+    ''')
+
+    # Monthly partitions for scraped_articles and summaries; tables created before
+    # partitioning are converted, keeping their rows
+    today = date.today()
+    for table in PARTITIONED_TABLES.values():
+        if not await is_partitioned(conn, table):
+            print(f"Converting {table.name} to a partitioned table...")
+            await convert_to_partitioned(conn, table)
+        await ensure_partitions(conn, table, today, add_months(today, 1))
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_scraped_articles_url ON scraped_articles (url)
+    ''')
+
+    # Unique index of stored article URLs, which the partitioned table cannot have
+    # without scraped_at; the scraper claims a URL here before inserting the article
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS article_urls (
+        url VARCHAR(512) PRIMARY KEY,
+        scraped_at TIMESTAMPTZ NOT NULL
+    )
+    ''')
+
+    await conn.execute('''
+    INSERT INTO article_urls (url, scraped_at)
+    SELECT url, min(scraped_at) FROM scraped_articles GROUP BY url
+    ON CONFLICT (url) DO NOTHING
+    ''')
+
+    # Unified topics and their source coverage as rows, written next to the JSONB
+    # analysis document so per-topic and per-outlet queries need no JSON decoding
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS unified_topics (
+        id SERIAL PRIMARY KEY,
+        analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+        date DATE NOT NULL,
+        language VARCHAR(5) NOT NULL,
+        position SMALLINT NOT NULL,
+        topic_id VARCHAR(255) NOT NULL,
+        name TEXT NOT NULL,
+        comparative_analysis TEXT,
+        UNIQUE (analysis_id, position)
+    )
+    ''')
+
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS source_coverage (
+        id SERIAL PRIMARY KEY,
+        unified_topic_id INTEGER NOT NULL REFERENCES unified_topics(id) ON DELETE CASCADE,
+        analysis_id INTEGER NOT NULL REFERENCES cross_source_analyses(id) ON DELETE CASCADE,
+        date DATE NOT NULL,
+        language VARCHAR(5) NOT NULL,
+        domain VARCHAR(255) NOT NULL,
+        original_topic_name TEXT,
+        sentiment SMALLINT NOT NULL CHECK (sentiment BETWEEN -1 AND 1),
+        political_leaning SMALLINT NOT NULL CHECK (political_leaning BETWEEN -2 AND 2),
+        framing TEXT,
+        key_phrases TEXT[] NOT NULL DEFAULT '{}',
+        article_urls TEXT[] NOT NULL DEFAULT '{}'
+    )
+    ''')
+
+    await conn.execute('''
+    COMMENT ON COLUMN source_coverage.sentiment IS '-1 negatív, 0 semleges, 1 pozitív'
+    ''')
+
+    await conn.execute('''
+    COMMENT ON COLUMN source_coverage.political_leaning IS '-2 bal, -1 közép-bal, 0 közép, 1 közép-jobb, 2 jobb'
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_unified_topics_topic_id ON unified_topics (topic_id, language, date)
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_source_coverage_unified_topic_id ON source_coverage (unified_topic_id)
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_source_coverage_analysis_id ON source_coverage (analysis_id)
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_source_coverage_domain ON source_coverage (domain, language, date)
+    ''')
+
+    await conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_source_coverage_leaning ON source_coverage (language, political_leaning, date)
+    ''')
+
+    # Rows for analyses stored before the tables existed
+    await backfill_unified_topics(conn)
+
     print("Database tables created successfully!")
     await conn.close()
 
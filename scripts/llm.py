@@ -1,39 +1,117 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-import google.generativeai as genai
 from backend.config import settings
 from backend.models.db_models import ScrapedArticle, DomainAnalysis, TopicAnalysis, Language
-from typing import List
+from typing import List, Optional
 from datetime import date, datetime
+from functools import lru_cache
+import time
 import json
 import re
 from backend.models.ai_models import CrossSourceAnalysis
 from backend.models.ai_models import DomainAnalysisLLM, TopicAnalysisLLM
 from backend.models.enums import PoliticalLeaning, Sentiment
+from pipeline_telemetry import telemetry
+from llm_ledger import llm_ledger
 
 #load .env
 from dotenv import load_dotenv
 import os
-import sys
 load_dotenv()
 
-gemini_api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GOOGLE_GEMINI_API_KEY not found in environment variables.")
+# The langchain / Google client stack takes seconds to import, so it is only
+# loaded when the first prompt is built or the first model is invoked.
 
-# Create LLM client using Langchain
-try:
-    llm = ChatGoogleGenerativeAI(
-        model=settings.GEMINI_MODEL,
+
+@lru_cache(maxsize=None)
+def get_chat_model(model: str = settings.GEMINI_MODEL, temperature: float = settings.GEMINI_TEMPERATURE):
+    """
+    Return a chat model client, created on first use and reused afterwards.
+
+    Raises:
+        ValueError: If GOOGLE_GEMINI_API_KEY is not set.
+    """
+    gemini_api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
+    if not gemini_api_key:
+        raise ValueError("GOOGLE_GEMINI_API_KEY not found in environment variables.")
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model,
         google_api_key=gemini_api_key,
-        temperature=settings.GEMINI_TEMPERATURE
+        temperature=temperature
     )
-except Exception as e:
-    print(f"Error initializing ChatGoogleGenerativeAI: {e}")
-    sys.exit(1)
 
 
-narrative_template = ChatPromptTemplate.from_messages([
+class LazyPromptTemplate:
+    """A ChatPromptTemplate built from its messages on the first invoke."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self._template = None
+
+    def invoke(self, values):
+        if self._template is None:
+            from langchain_core.prompts import ChatPromptTemplate
+            self._template = ChatPromptTemplate.from_messages(self.messages)
+        return self._template.invoke(values)
+
+
+def _record_call(model, call: str, message, started: float, succeeded: bool, language: Optional[str]) -> None:
+    """Add the token counts the provider reported to the telemetry counters and the call to the ledger."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    telemetry.count("llm.input_tokens", input_tokens)
+    telemetry.count("llm.output_tokens", output_tokens)
+    llm_ledger.record(
+        run_id=telemetry.run_id,
+        call=call,
+        model=getattr(model, "model", "unknown"),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        latency_seconds=time.perf_counter() - started,
+        succeeded=succeeded,
+        outlet=telemetry.attributes().get("outlet"),
+        language=language,
+    )
+
+
+def invoke_model(model, prompt, call: str, language: Optional[str] = None):
+    """Invoke a chat model, recording the call's latency and token usage under `call`."""
+    started = time.perf_counter()
+    response = None
+    try:
+        with telemetry.span(f"llm.{call}", model=getattr(model, "model", "unknown")):
+            response = model.invoke(prompt)
+    finally:
+        _record_call(model, call, response, started, response is not None, language)
+    return response
+
+
+def invoke_structured(model, schema, prompt, call: str, language: Optional[str] = None):
+    """
+    Invoke a chat model with structured output into `schema`, recording the call's
+    latency and token usage under `call`.
+
+    Raises:
+        The parsing error if the response did not match the schema.
+    """
+    # include_raw keeps the provider's message, which carries the token usage
+    structured_llm = model.with_structured_output(schema, include_raw=True)
+    started = time.perf_counter()
+    result = None
+    try:
+        with telemetry.span(f"llm.{call}", model=getattr(model, "model", "unknown")):
+            result = structured_llm.invoke(prompt)
+    finally:
+        raw = result["raw"] if result is not None else None
+        _record_call(model, call, raw, started, result is not None and result.get("parsing_error") is None, language)
+    if result.get("parsing_error") is not None:
+        raise result["parsing_error"]
+    return result["parsed"]
+
+
+narrative_template = LazyPromptTemplate([
     ("system", """
         You are the Editor-in-Chief at MagyarMa.
         Your task is to process the provided Hungarian article excerpts and generate TWO distinct outputs:
@@ -98,7 +176,7 @@ narrative_template = ChatPromptTemplate.from_messages([
     """),
 ])
 
-domain_topic_template = ChatPromptTemplate.from_messages([
+domain_topic_template = LazyPromptTemplate([
     ("system", """
         You are an expert media analyst specializing in Hungarian news content.
         Your task is to identify key topics from articles from a single news source
@@ -127,7 +205,7 @@ domain_topic_template = ChatPromptTemplate.from_messages([
 ])
 
 
-cross_source_template = ChatPromptTemplate.from_messages([
+cross_source_template = LazyPromptTemplate([
     ("system", """
         You are an expert media analyst specializing in Hungarian news content and political bias analysis.
         Your task is to identify common topics across different news sources and analyze how each source
@@ -156,6 +234,10 @@ cross_source_template = ChatPromptTemplate.from_messages([
         5. Emeld ki a keretezésben és nézőpontban tapasztalható főbb különbségeket {language} nyelven
         6. Ha esetleg egy cikk többször szerepelne a keretezésben, akkor csak egyszer említsd meg
         7. Add meg az eredeti cikkek URL-jeit, hogy azok elérhetőek legyenek az elemzésben
+
+        Ha a bemenet "Candidate cluster" csoportokra van bontva, a témák előzetesen, automatikusan
+        lettek csoportosítva. Ezek csak javaslatok: ha egy csoport több különálló eseményt fed le, bontsd szét,
+        ha két csoport ugyanarról az eseményről szól, vond össze őket.
         
         KRITIKUS: A kimenetnek a következő Pydantic modell struktúrát KELL követnie:
         
@@ -193,7 +275,7 @@ cross_source_template = ChatPromptTemplate.from_messages([
     """)
 ])
 
-translate_cross_source_analysis_template = ChatPromptTemplate.from_messages([
+translate_cross_source_analysis_template = LazyPromptTemplate([
     ("system", """
         You are an expert multilingual translator and media analyst.
         Your task is to translate a given CrossSourceAnalysis JSON object from {source_lang} to {target_lang}.
@@ -263,7 +345,7 @@ class LLMService:
 
             # Invoke the LLM
             print(f"Invoking LLM for {language} summarization...")
-            response = llm.invoke(prompt)
+            response = invoke_model(get_chat_model(), prompt, "summarize", language)
             print(f"LLM invocation complete for {language} summary.")
 
             with open("response.txt", "w", encoding="utf-8") as f:
@@ -311,15 +393,9 @@ class LLMService:
                 "language": language
             })
 
-            structured_llm = ChatGoogleGenerativeAI(
-                model=settings.GEMINI_MODEL,
-                google_api_key=gemini_api_key,
-                temperature=settings.GEMINI_TEMPERATURE
-            ).with_structured_output(DomainAnalysisLLM)
-            
             # Invoke the LLM
             print(f"Extracting topics for domain: {domain}...")
-            response = structured_llm.invoke(prompt)
+            response = invoke_structured(get_chat_model(), DomainAnalysisLLM, prompt, "domain_topics", language)
             
             # Save response for debugging with domain name
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
@@ -394,13 +470,9 @@ class LLMService:
                 f"--- END OF TEXT ---"
             )
             
-            translation_llm = ChatGoogleGenerativeAI(
-                model=settings.GEMINI_MODEL,
-                google_api_key=gemini_api_key,
-                temperature=0.2
-            )
+            translation_llm = get_chat_model(settings.GEMINI_MODEL, 0.2)
 
-            response = translation_llm.invoke(prompt_text)
+            response = invoke_model(translation_llm, prompt_text, "translate_text", target_lang)
             translated_text = response.content.strip()
             
             print(f"Translation to '{target_lang}' complete.")
@@ -452,15 +524,10 @@ class LLMService:
                 "input_analysis_json": input_analysis_json
             })
 
-            big_llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash-preview-04-17",
-                google_api_key=gemini_api_key,
-                temperature=settings.GEMINI_TEMPERATURE
-            )
-            structured_llm = big_llm.with_structured_output(CrossSourceAnalysis)
+            big_llm = get_chat_model("gemini-2.5-flash-preview-04-17", settings.GEMINI_TEMPERATURE)
 
             print(f"Translating CrossSourceAnalysis from '{source_lang}' to '{target_lang}' for date {analysis_to_translate.date}...")
-            translated_analysis = structured_llm.invoke(prompt)
+            translated_analysis = invoke_structured(big_llm, CrossSourceAnalysis, prompt, "translate_analysis", target_lang)
 
             #save the analysis in txt for debugging
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
@@ -506,16 +573,9 @@ class LLMService:
             })
 
             # Initialize the LLM
-            big_llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash-preview-04-17",
-                google_api_key=gemini_api_key,
-                temperature=settings.GEMINI_TEMPERATURE
-            )
+            big_llm = get_chat_model("gemini-2.5-flash-preview-04-17", settings.GEMINI_TEMPERATURE)
             
-            # Set up structured output
-            structured_llm = big_llm.with_structured_output(CrossSourceAnalysis)
-            
-            result = structured_llm.invoke(prompt)
+            result = invoke_structured(big_llm, CrossSourceAnalysis, prompt, "cross_source", language)
             
             # Save for debugging
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
@@ -0,0 +1,215 @@
+"""
+Token and cost accounting for the LLM calls of the scraper pipeline.
+
+Every call made through llm.invoke_model / llm.invoke_structured is recorded
+with its prompt type, outlet, language, model, token counts, latency and an
+estimated cost. The calls of a run are written to the llm_calls table when the
+run finishes.
+
+Run this module to see which prompt types and outlets dominate spend:
+
+Usage:
+    python scripts/llm_ledger.py                # last 7 days
+    python scripts/llm_ledger.py --days 30 --top 15
+    python scripts/llm_ledger.py --run 3f2a9c1d0b7e
+    python scripts/llm_ledger.py --reprice      # recompute stored costs from LLM_MODEL_PRICES
+"""
+import os
+import sys
+import asyncio
+import argparse
+import threading
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Set
+
+import asyncpg
+from dotenv import load_dotenv
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.config import settings
+
+
+class LLMCall(NamedTuple):
+    run_id: str
+    call: str
+    outlet: Optional[str]
+    language: Optional[str]
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_seconds: float
+    succeeded: bool
+    cost_usd: float
+    created_at: datetime
+
+
+_unpriced_models: Set[str] = set()
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """
+    Estimated USD cost of a call at the per-million-token prices of its model.
+
+    Models missing from LLM_MODEL_PRICES are counted at no cost, with a warning
+    the first time, so they never get another model's price.
+    """
+    prices = settings.LLM_MODEL_PRICES.get(model.removeprefix("models/"))
+    if prices is None:
+        if model not in _unpriced_models:
+            _unpriced_models.add(model)
+            print(f"Warning: no price for LLM model '{model}' in LLM_MODEL_PRICES, its calls are recorded at no cost")
+        return 0.0
+    input_price, output_price = prices
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+class LLMLedger:
+    """The LLM calls of the current run, kept in memory until the run is flushed to the database."""
+
+    def __init__(self):
+        self._calls: List[LLMCall] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        run_id: str,
+        call: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_seconds: float,
+        succeeded: bool,
+        outlet: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> None:
+        entry = LLMCall(
+            run_id, call, outlet, language, model, input_tokens, output_tokens,
+            latency_seconds, succeeded, estimate_cost(model, input_tokens, output_tokens),
+            datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+        with self._lock:
+            self._calls.append(entry)
+
+    @property
+    def calls(self) -> List[LLMCall]:
+        with self._lock:
+            return list(self._calls)
+
+    def summary_table(self) -> str:
+        """Calls, tokens, latency and cost of the buffered calls per prompt type."""
+        calls = self.calls
+        rows = {}
+        for entry in calls:
+            row = rows.setdefault(entry.call, [0, 0, 0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += entry.input_tokens
+            row[2] += entry.output_tokens
+            row[3] += entry.latency_seconds
+            row[4] += entry.cost_usd
+        total_cost = sum(entry.cost_usd for entry in calls)
+        lines = [f"{'prompt type':<22}{'calls':>7}{'tokens in':>12}{'tokens out':>12}{'llm s':>9}{'cost $':>10}{'share':>8}"]
+        for call, (count, tokens_in, tokens_out, seconds, cost) in sorted(rows.items(), key=lambda item: -item[1][4]):
+            share = cost / total_cost * 100 if total_cost else 0.0
+            lines.append(f"{call:<22}{count:>7}{tokens_in:>12}{tokens_out:>12}{seconds:>9.1f}{cost:>10.4f}{share:>7.1f}%")
+        lines.append(f"{'total':<22}{len(calls):>7}{sum(e.input_tokens for e in calls):>12}"
+                     f"{sum(e.output_tokens for e in calls):>12}{sum(e.latency_seconds for e in calls):>9.1f}{total_cost:>10.4f}")
+        return "\n".join(lines)
+
+    async def flush(self, conn: asyncpg.Connection) -> int:
+        """Write the buffered calls to llm_calls in one batch and clear the buffer."""
+        with self._lock:
+            calls, self._calls = self._calls, []
+        if not calls:
+            return 0
+        await conn.executemany('''
+        INSERT INTO llm_calls
+        (run_id, call, outlet, language, model, input_tokens, output_tokens,
+         latency_seconds, succeeded, cost_usd, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+        ''', calls)
+        return len(calls)
+
+
+llm_ledger = LLMLedger()
+
+
+async def print_report(db_url: str, days: int, run_id: Optional[str], top: int) -> None:
+    """Print the spend of the selected calls by prompt type, by outlet and by both."""
+    if run_id:
+        condition, argument, scope = "run_id = $1", run_id, f"run {run_id}"
+    else:
+        condition, argument, scope = "created_at >= CURRENT_TIMESTAMP - make_interval(days => $1)", days, f"the last {days} days"
+
+    conn = await asyncpg.connect(db_url)
+    try:
+        total = await conn.fetchrow(f'''
+        SELECT count(*) AS calls, count(DISTINCT run_id) AS runs, coalesce(sum(cost_usd), 0) AS cost,
+               coalesce(sum(input_tokens), 0) AS tokens_in, coalesce(sum(output_tokens), 0) AS tokens_out
+        FROM llm_calls WHERE {condition}
+        ''', argument)
+        print(f"LLM spend for {scope}: {total['calls']} calls in {total['runs']} runs, "
+              f"{total['tokens_in']} tokens in, {total['tokens_out']} tokens out, ${total['cost']:.4f}")
+        if not total['calls']:
+            return
+
+        groupings = [
+            ("prompt type", "call"),
+            ("model", "model"),
+            ("outlet", "coalesce(outlet, '(cross-source)')"),
+            ("prompt type / outlet", "call || ' / ' || coalesce(outlet, '(cross-source)')"),
+        ]
+        for title, expression in groupings:
+            rows = await conn.fetch(f'''
+            SELECT {expression} AS name, count(*) AS calls,
+                   sum(input_tokens) AS tokens_in, sum(output_tokens) AS tokens_out,
+                   avg(latency_seconds) AS mean_latency, sum(cost_usd) AS cost,
+                   count(*) FILTER (WHERE NOT succeeded) AS failures
+            FROM llm_calls WHERE {condition}
+            GROUP BY 1 ORDER BY cost DESC, calls DESC
+            LIMIT {int(top)}
+            ''', argument)
+            print(f"\n{title:<36}{'calls':>7}{'failed':>8}{'tokens in':>12}{'tokens out':>12}{'mean s':>8}{'cost $':>10}{'share':>8}")
+            for row in rows:
+                share = row['cost'] / total['cost'] * 100 if total['cost'] else 0
+                print(f"{row['name'][:35]:<36}{row['calls']:>7}{row['failures']:>8}{row['tokens_in']:>12}"
+                      f"{row['tokens_out']:>12}{row['mean_latency']:>8.2f}{row['cost']:>10.4f}{share:>7.1f}%")
+    finally:
+        await conn.close()
+
+
+async def reprice_calls(db_url: str) -> None:
+    """Recompute the stored cost of every call from the current prices of its model."""
+    conn = await asyncpg.connect(db_url)
+    try:
+        for row in await conn.fetch("SELECT DISTINCT model FROM llm_calls"):
+            # Prices per token, so unpriced models warn once and are reset to no cost
+            input_price = estimate_cost(row['model'], 1_000_000, 0) / 1_000_000
+            output_price = estimate_cost(row['model'], 0, 1_000_000) / 1_000_000
+            status = await conn.execute('''
+            UPDATE llm_calls
+            SET cost_usd = input_tokens * $2::float8 + output_tokens * $3::float8
+            WHERE model = $1
+            ''', row['model'], input_price, output_price)
+            print(f"{row['model']}: {status.split()[-1]} calls repriced")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Report LLM token usage and cost from the llm_calls table.")
+    parser.add_argument("--days", type=int, default=7, help="Report the calls of the last N days (default: 7)")
+    parser.add_argument("--run", help="Report a single pipeline run instead")
+    parser.add_argument("--top", type=int, default=10, help="Rows per table (default: 10)")
+    parser.add_argument("--reprice", action="store_true", help="Recompute the stored costs from LLM_MODEL_PRICES first")
+    args = parser.parse_args()
+
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        print("Error: DATABASE_URL not set in environment")
+        sys.exit(1)
+    if args.reprice:
+        asyncio.run(reprice_calls(db_url))
+    asyncio.run(print_report(db_url, args.days, args.run, args.top))
@@ -0,0 +1,250 @@
+"""
+Structured instrumentation for the scraper pipeline.
+
+Spans time each stage (fetch, parse, LLM calls, DB writes) and each outlet;
+counters track pages, bytes, articles, LLM tokens and DB round trips. Span
+attributes are inherited by nested spans and counters, so everything recorded
+while an outlet is being scraped is attributed to that outlet.
+
+At the end of a run the totals are printed as a summary table and appended as
+one JSON line to settings.PIPELINE_METRICS_FILE. Spans and counters are also
+sent to an OpenTelemetry collector when OTEL_EXPORTER_OTLP_ENDPOINT is set and
+the OpenTelemetry SDK and OTLP exporter are installed.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import inspect
+import functools
+import contextvars
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.config import settings
+
+try:
+    from opentelemetry import metrics as otel_metrics, trace as otel_trace
+except ImportError:
+    otel_metrics = None
+    otel_trace = None
+
+# Attributes of the innermost active span, inherited by nested spans and counters
+_current_attributes: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("telemetry_attributes", default={})
+
+CounterKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class SpanStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if not ok:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 4),
+            "max_seconds": round(self.max_seconds, 4),
+        }
+
+
+class PipelineTelemetry:
+    """Span timings and counters of one pipeline run."""
+
+    def __init__(self):
+        self._tracer = None
+        self._meter = None
+        self._providers = []
+        self._instruments: Dict[str, Any] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        # Keyed by (span name, outlet) so the summary can break stages down per outlet
+        self.spans: Dict[Tuple[str, Optional[str]], SpanStats] = defaultdict(SpanStats)
+        self.counters: Dict[CounterKey, float] = defaultdict(float)
+
+    def start_run(self) -> None:
+        """Start a new run and set up the OpenTelemetry export if configured."""
+        self.reset()
+        if settings.OTEL_EXPORTER_OTLP_ENDPOINT and not self._providers:
+            self._configure_otel()
+        if otel_trace is not None:
+            self._tracer = otel_trace.get_tracer("scraper")
+            self._meter = otel_metrics.get_meter("scraper")
+
+    def _configure_otel(self) -> None:
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        except ImportError:
+            print("OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk / opentelemetry-exporter-otlp "
+                  "are not installed; writing the local metrics file only")
+            return
+
+        resource = Resource.create({"service.name": "scraper"})
+        tracer_provider = TracerProvider(resource=resource)
+        tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        meter_provider = MeterProvider(resource=resource, metric_readers=[PeriodicExportingMetricReader(OTLPMetricExporter())])
+        otel_trace.set_tracer_provider(tracer_provider)
+        otel_metrics.set_meter_provider(meter_provider)
+        self._providers = [tracer_provider, meter_provider]
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as span `name`; nested spans and counters inherit `attributes`."""
+        merged = {**_current_attributes.get(), **attributes}
+        token = _current_attributes.set(merged)
+        otel_span = self._tracer.start_as_current_span(name, attributes=merged) if self._tracer else nullcontext()
+        started = time.perf_counter()
+        ok = False
+        try:
+            with otel_span:
+                yield
+            ok = True
+        finally:
+            self.spans[(name, merged.get("outlet"))].record(time.perf_counter() - started, ok)
+            _current_attributes.reset(token)
+
+    def attributes(self) -> Dict[str, Any]:
+        """Attributes of the innermost active span."""
+        return dict(_current_attributes.get())
+
+    def count(self, name: str, value: float = 1, **attributes) -> None:
+        """Add `value` to counter `name`, labelled with the active span attributes."""
+        merged = {**_current_attributes.get(), **attributes}
+        self.counters[(name, tuple(sorted(merged.items())))] += value
+        if self._meter is not None:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                instrument = self._instruments[name] = self._meter.create_counter(name)
+            instrument.add(value, attributes=merged)
+
+    def record_query(self, query) -> None:
+        """asyncpg query logger: one DB round trip with its duration."""
+        self.count("db.round_trips")
+        self.count("db.query_seconds", query.elapsed)
+
+    def counter_total(self, name: str, **attributes) -> float:
+        return sum(
+            value for (counter, labels), value in self.counters.items()
+            if counter == name and all(dict(labels).get(key) == wanted for key, wanted in attributes.items())
+        )
+
+    def summary_table(self) -> str:
+        """Per-stage and per-outlet totals of the run as plain-text tables."""
+        stages: Dict[str, SpanStats] = defaultdict(SpanStats)
+        for (name, _), stats in self.spans.items():
+            stage = stages[name]
+            stage.calls += stats.calls
+            stage.errors += stats.errors
+            stage.total_seconds += stats.total_seconds
+            stage.max_seconds = max(stage.max_seconds, stats.max_seconds)
+
+        lines = [
+            f"Pipeline run {self.run_id}: {time.perf_counter() - self._started:.1f}s",
+            "",
+            f"{'stage':<26}{'calls':>7}{'errors':>8}{'total s':>10}{'mean ms':>10}{'max ms':>10}",
+        ]
+        for name, stats in sorted(stages.items(), key=lambda item: -item[1].total_seconds):
+            mean_ms = stats.total_seconds / stats.calls * 1000 if stats.calls else 0.0
+            lines.append(f"{name:<26}{stats.calls:>7}{stats.errors:>8}{stats.total_seconds:>10.2f}"
+                         f"{mean_ms:>10.1f}{stats.max_seconds * 1000:>10.1f}")
+
+        outlets = sorted({outlet for (name, outlet) in self.spans if name == "scrape" and outlet})
+        if outlets:
+            lines += ["", f"{'outlet':<14}{'time s':>8}{'pages':>7}{'KB':>8}{'kept':>6}{'skipped':>9}"
+                          f"{'llm s':>8}{'tokens in':>11}{'tokens out':>11}{'db trips':>10}"]
+            for outlet in outlets:
+                llm_seconds = sum(stats.total_seconds for (name, span_outlet), stats in self.spans.items()
+                                  if span_outlet == outlet and name.startswith("llm."))
+                lines.append(
+                    f"{outlet:<14}{self.spans[('scrape', outlet)].total_seconds:>8.1f}"
+                    f"{self.counter_total('pages_fetched', outlet=outlet):>7.0f}"
+                    f"{self.counter_total('bytes_fetched', outlet=outlet) / 1024:>8.0f}"
+                    f"{self.counter_total('articles_kept', outlet=outlet):>6.0f}"
+                    f"{self.counter_total('articles_skipped', outlet=outlet):>9.0f}"
+                    f"{llm_seconds:>8.1f}"
+                    f"{self.counter_total('llm.input_tokens', outlet=outlet):>11.0f}"
+                    f"{self.counter_total('llm.output_tokens', outlet=outlet):>11.0f}"
+                    f"{self.counter_total('db.round_trips', outlet=outlet):>10.0f}"
+                )
+
+        lines += ["", "Totals: " + ", ".join(
+            f"{name} {self.counter_total(name):.0f}" for name in
+            ["pages_fetched", "bytes_fetched", "articles_kept", "articles_skipped", "articles_duplicate",
+             "llm.input_tokens", "llm.output_tokens", "db.round_trips"]
+        )]
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "duration_seconds": round(time.perf_counter() - self._started, 3),
+            "spans": [
+                {"name": name, "outlet": outlet, **stats.as_dict()}
+                for (name, outlet), stats in sorted(self.spans.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+            ],
+            "counters": [
+                {"name": name, "attributes": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ],
+        }
+
+    def finish_run(self) -> None:
+        """Print the summary table, append the run to the metrics file and flush the OpenTelemetry export."""
+        print(self.summary_table())
+        if settings.PIPELINE_METRICS_FILE:
+            try:
+                with open(settings.PIPELINE_METRICS_FILE, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(self.as_dict(), ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Error writing pipeline metrics to {settings.PIPELINE_METRICS_FILE}: {e}")
+        for provider in self._providers:
+            provider.force_flush()
+
+
+telemetry = PipelineTelemetry()
+
+
+def traced(name: str, **attributes):
+    """Decorator running every call of a sync or async function inside `telemetry.span(name, **attributes)`."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with telemetry.span(name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with telemetry.span(name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,206 @@
+import os
+import sys
+import gzip
+import json
+import shutil
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.cache import cache_seed, compute_validators
+from backend.config import settings
+from backend.database import register_json_codecs
+from backend.documents import load_cached_analysis
+from backend.endpoints.summaries import fetch_latest_summaries, render_summaries
+from backend.endpoints.analysis import (
+    fetch_cross_source_analysis,
+    fetch_analysis_for_date,
+    render_cross_source_analysis,
+    render_unified_topics,
+    render_topic_coverage,
+)
+from backend.snapshots import MANIFEST_FILENAME, ENCODING_SUFFIXES, snapshot_key
+from backend.utils.jsonutils import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SUMMARY_MODES = ["raw", "parsed"]
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(
+    directory: str,
+    version: str,
+    data_version: int,
+    key: str,
+    seed: str,
+    rows: Sequence[asyncpg.Record],
+    body: bytes
+) -> Dict[str, Any]:
+    """
+    Write one rendered response and its pre-compressed variants.
+
+    Returns:
+        The manifest entry for the snapshot.
+    """
+    relative_path = f"{version}/{key}.json"
+    base_path = os.path.join(directory, relative_path)
+
+    variants = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+
+    for encoding, data in variants.items():
+        _write_atomic(base_path + ENCODING_SUFFIXES[encoding], data)
+
+    etag, last_modified = compute_validators(seed, rows)
+    return {
+        "path": relative_path,
+        "etag": etag,
+        "last_modified": last_modified,
+        "encodings": {encoding: len(data) for encoding, data in variants.items()},
+        "data_version": data_version,
+    }
+
+
+def load_manifest(directory: str) -> Dict[str, Any]:
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {"version": None, "entries": {}}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def current_entries(entries: Dict[str, Any], data_version: int, newest_date: date) -> Dict[str, Any]:
+    """
+    The manifest entries still worth keeping: rendered from the current data version
+    (the API ignores the others) and within SNAPSHOT_RETENTION_DAYS of the newest date.
+    """
+    oldest_date = (newest_date - timedelta(days=settings.SNAPSHOT_RETENTION_DAYS - 1)).isoformat()
+    # Snapshot keys are "<endpoint>/<date>/<language>/..."
+    return {
+        key: entry for key, entry in entries.items()
+        if entry.get("data_version") == data_version and key.split("/")[1] >= oldest_date
+    }
+
+
+def prune_versions(directory: str, manifest: Dict[str, Any], previous_version: Optional[str]) -> None:
+    """Delete version directories no longer referenced, keeping the previous one for in-flight readers."""
+    referenced = {entry["path"].split("/", 1)[0] for entry in manifest["entries"].values()}
+    if previous_version:
+        referenced.add(previous_version)
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and name not in referenced:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+async def publish_snapshots(
+    conn: asyncpg.Connection,
+    dates: Iterable[date],
+    languages: Iterable[str],
+    directory: str = settings.SNAPSHOT_DIR
+) -> Dict[str, Any]:
+    """
+    Render every read endpoint's response for the given dates and languages
+    into a new snapshot version and update the index manifest.
+
+    `directory` must be where the snapshots are served from: the snapshots/ directory
+    of the GitHub Pages site, or the SNAPSHOT_DIR of the API. Entries of an older data version or of dates outside the retention
+    window are dropped from the manifest, and their files deleted.
+
+    Args:
+        conn: Database connection to read the stored data from.
+        dates: Dates whose responses changed in this run.
+        languages: Languages to render.
+        directory: Root directory of the snapshots.
+
+    Returns:
+        The updated manifest.
+    """
+    await register_json_codecs(conn)
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    previous_version = manifest.get("version")
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    dates = list(dates)
+    # Read before rendering: a write landing meanwhile bumps the marker past this
+    # version, so the API ignores these snapshots rather than serve them as current
+    data_version = await conn.fetchval("SELECT version FROM data_version WHERE id = 1") or 0
+    entries = current_entries(manifest.get("entries", {}), data_version, max(dates))
+
+    def publish(rows, body: bytes, endpoint: str, target_date: date, language: str, *extra) -> None:
+        key = snapshot_key(endpoint, target_date, language, *extra)
+        seed = cache_seed(endpoint, target_date, language, *extra)
+        entries[key] = write_snapshot(directory, version, data_version, key, seed, rows, body)
+
+    for target_date in dates:
+        for language in languages:
+            summary_rows = await fetch_latest_summaries(conn, language, target_date)
+            for mode in SUMMARY_MODES:
+                body = render_summaries(summary_rows, mode).model_dump_json(exclude_none=True).encode("utf-8")
+                publish(summary_rows, body, "summaries", target_date, language, mode)
+
+            row = await fetch_cross_source_analysis(conn, target_date, language)
+            document = (await load_cached_analysis(conn, row['id'])).document if row else None
+            publish([row] if row else [], dumps(render_cross_source_analysis(row, document, target_date)),
+                    "cross-source-analysis", target_date, language)
+
+            row = await fetch_analysis_for_date(conn, target_date, language)
+            rows: List[asyncpg.Record] = [row] if row else []
+            cached = await load_cached_analysis(conn, row['id']) if row else None
+            publish(rows, dumps(render_unified_topics(cached.document if cached else None, target_date, language)),
+                    "unified-topics", target_date, language)
+
+            if cached is not None:
+                # One snapshot per topic, reachable by its full name and by its topic id
+                for topic in cached.document.get("unified_topics", []):
+                    for lookup in {topic["name"].lower(), topic["topic_id"]}:
+                        publish(rows, dumps(render_topic_coverage(cached.topic_index, lookup, target_date, language)),
+                                "topic-coverage", target_date, language, lookup)
+
+    manifest = {
+        "version": version,
+        "data_version": data_version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "entries": entries,
+    }
+    _write_atomic(os.path.join(directory, MANIFEST_FILENAME),
+                  json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    prune_versions(directory, manifest, previous_version)
+    return manifest
+
+
+async def main():
+    """Publish snapshots for today in all languages into SNAPSHOT_DIR, e.g. on the API host."""
+    conn = await asyncpg.connect(os.getenv("DATABASE_URL"))
+    try:
+        manifest = await publish_snapshots(conn, [date.today()], ["hu", "en"])
+        print(f"Published snapshot version {manifest['version']} with {len(manifest['entries'])} entries")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
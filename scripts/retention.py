@@ -0,0 +1,333 @@
+"""
+Monthly partitions, retention and archival for scraped_articles and summaries.
+
+Both tables are range-partitioned by month: scraped_articles by scraped_at,
+summaries by date. The scraper creates the partitions of the current and the
+next month at the start of every run. Run this module on a schedule to retire
+the partitions that are older than the retention period of their table, in
+two separate steps:
+
+- every row of an expired partition is exported to
+  <archive dir>/<table>/<partition>.jsonl.gz, one JSON object per line, and the
+  partition is detached, which takes its rows out of every query at once. A
+  partition left detached by an earlier run is exported again, so the archive
+  directory always holds every detached partition.
+- once the archives are copied to durable storage (the retention workflow
+  uploads them to a GitHub release and verifies the upload), --drop-detached
+  drops the detached partitions whose archive holds all of their rows. Dropping
+  frees their space at once instead of leaving dead rows behind for VACUUM the
+  way a DELETE does.
+
+The archives can be queried offline, e.g. with DuckDB:
+    SELECT domain, title FROM read_json_auto('archive/scraped_articles/*.jsonl.gz') WHERE title ILIKE '%MNB%'
+or with `zcat archive/summaries/*.jsonl.gz | jq ...`, and read back in Python with `iter_archive`.
+
+Usage:
+    python scripts/retention.py                   # archive and detach the expired partitions
+    python scripts/retention.py --dry-run         # only list the expired partitions
+    python scripts/retention.py --drop-detached   # drop the detached partitions archived in --archive-dir
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import asyncio
+import argparse
+from datetime import date
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import asyncpg
+from dotenv import load_dotenv
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.config import settings
+
+
+class PartitionedTable(NamedTuple):
+    name: str
+    # Partition column and its type ("date" or "timestamptz")
+    key: str
+    key_type: str
+    # Fills the partition column when converting rows that predate partitioning and lack it
+    key_fallback: str
+    # Stored columns, in archive order (generated columns are recomputed, never copied)
+    columns: List[str]
+    # Created on the partitioned table, and so on every partition
+    indexes: List[str]
+    retention_months: int
+
+
+PARTITIONED_TABLES = {
+    "scraped_articles": PartitionedTable(
+        name="scraped_articles",
+        key="scraped_at",
+        key_type="timestamptz",
+        key_fallback="coalesce(scraped_at, publication_date, CURRENT_TIMESTAMP)",
+        columns=["id", "url", "domain", "title", "content", "publication_date", "scraped_at"],
+        indexes=[
+            "CREATE INDEX IF NOT EXISTS idx_scraped_articles_url ON scraped_articles (url)",
+            "CREATE INDEX IF NOT EXISTS idx_scraped_articles_search ON scraped_articles USING GIN (search_vector)",
+        ],
+        retention_months=settings.ARTICLE_RETENTION_MONTHS,
+    ),
+    "summaries": PartitionedTable(
+        name="summaries",
+        key="date",
+        key_type="date",
+        key_fallback="coalesce(date, created_at::date, CURRENT_DATE)",
+        columns=["id", "domain", "language", "date", "content", "short_summary", "sections", "created_at"],
+        indexes=[
+            "CREATE INDEX IF NOT EXISTS idx_summaries_language_date_domain_created ON summaries (language, date, domain, created_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_summaries_search ON summaries USING GIN (search_vector)",
+        ],
+        retention_months=settings.SUMMARY_RETENTION_MONTHS,
+    ),
+}
+
+_PARTITION_MONTH_RE = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """The first day of the month `months` after the month of `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _bound(table: PartitionedTable, month: date) -> str:
+    # Timestamp partitions split at midnight UTC, whatever the session time zone
+    return f"{month.isoformat()} 00:00:00+00" if table.key_type == "timestamptz" else month.isoformat()
+
+
+async def ensure_partitions(
+    conn: asyncpg.Connection,
+    table: PartitionedTable,
+    first: date,
+    last: date,
+    parent: Optional[str] = None
+) -> None:
+    """Create the monthly partitions covering `first` to `last` that do not exist yet."""
+    month = month_start(first)
+    while month <= last:
+        await conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {partition_name(table.name, month)}
+        PARTITION OF {parent or table.name}
+        FOR VALUES FROM ('{_bound(table, month)}') TO ('{_bound(table, add_months(month, 1))}')
+        ''')
+        month = add_months(month, 1)
+
+
+async def list_partitions(conn: asyncpg.Connection, table: PartitionedTable) -> List[Tuple[str, date]]:
+    """The monthly partitions of `table` as (name, first day of the month), oldest first."""
+    rows = await conn.fetch('''
+    SELECT child.relname AS name
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.oid = to_regclass($1)
+    ''', table.name)
+    partitions = []
+    for row in rows:
+        match = _PARTITION_MONTH_RE.search(row['name'])
+        if match:
+            partitions.append((row['name'], date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def list_detached_partitions(conn: asyncpg.Connection, table: PartitionedTable) -> List[str]:
+    """The monthly partitions of `table` that were detached but not dropped yet, oldest first."""
+    rows = await conn.fetch('''
+    SELECT relname AS name
+    FROM pg_class
+    WHERE relkind = 'r'
+      AND NOT relispartition
+      AND relnamespace = current_schema()::regnamespace
+      AND relname ~ ('^' || $1 || '_[0-9]{4}_[0-9]{2}$')
+    ORDER BY relname
+    ''', table.name)
+    return [row['name'] for row in rows]
+
+
+async def is_partitioned(conn: asyncpg.Connection, table: PartitionedTable) -> bool:
+    return await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1))", table.name
+    )
+
+
+async def convert_to_partitioned(conn: asyncpg.Connection, table: PartitionedTable) -> None:
+    """
+    Replace a plain table with a partitioned copy holding the same rows.
+
+    The copy keeps the column definitions, defaults and id sequence of the
+    original, with a primary key of (id, partition column) since every unique
+    index on a partitioned table must include its partition column. The
+    partition column gets the type a freshly created table has; timestamps
+    without a time zone are read as UTC, which is what the scraper stores.
+    """
+    staging = f"{table.name}_partitioned"
+    columns = ", ".join(table.columns)
+    selected = ", ".join(
+        f"({table.key_fallback})::{table.key_type}" if column == table.key else column for column in table.columns
+    )
+    async with conn.transaction():
+        await conn.execute("SET LOCAL TIME ZONE 'UTC'")
+        first, last = await conn.fetchrow(f"SELECT min({table.key_fallback})::date, max({table.key_fallback})::date FROM {table.name}")
+        today = date.today()
+        # The type of a partition column cannot be altered, so it is set on a template first
+        await conn.execute(f'''
+        CREATE TEMPORARY TABLE {staging}_template (LIKE {table.name} INCLUDING DEFAULTS INCLUDING GENERATED)
+        ON COMMIT DROP
+        ''')
+        await conn.execute(f"ALTER TABLE {staging}_template ALTER COLUMN {table.key} TYPE {table.key_type}")
+        await conn.execute(f'''
+        CREATE TABLE {staging} (LIKE {staging}_template INCLUDING DEFAULTS INCLUDING GENERATED)
+        PARTITION BY RANGE ({table.key})
+        ''')
+        await conn.execute(f"ALTER TABLE {staging} ALTER COLUMN {table.key} SET NOT NULL")
+        await conn.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id, {table.key})")
+        await ensure_partitions(conn, table, min(first or today, today), max(last or today, add_months(today, 1)), parent=staging)
+        await conn.execute(f"INSERT INTO {staging} ({columns}) SELECT {selected} FROM {table.name}")
+        # The sequence would be dropped with the table that owns it
+        await conn.execute(f"ALTER SEQUENCE {table.name}_id_seq OWNED BY {staging}.id")
+        await conn.execute(f"DROP TABLE {table.name}")
+        await conn.execute(f"ALTER TABLE {staging} RENAME TO {table.name}")
+        await conn.execute(f"ALTER TABLE {table.name} RENAME CONSTRAINT {staging}_pkey TO {table.name}_pkey")
+        for index in table.indexes:
+            await conn.execute(index)
+
+
+def archive_path(archive_dir: str, table: PartitionedTable, partition: str) -> str:
+    return os.path.join(archive_dir, table.name, f"{partition}.jsonl.gz")
+
+
+async def archive_partition(conn: asyncpg.Connection, table: PartitionedTable, partition: str, archive_dir: str) -> int:
+    """Export the rows of a partition to a gzipped JSON Lines file and return the row count."""
+    path = archive_path(archive_dir, table, partition)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    count = 0
+    with gzip.open(temporary_path, "wt", encoding="utf-8") as archive:
+        async with conn.transaction():
+            async for row in conn.cursor(f"SELECT {', '.join(table.columns)} FROM {partition} ORDER BY id"):
+                archive.write(json.dumps(dict(row), ensure_ascii=False, default=str))
+                archive.write("\n")
+                count += 1
+    # Only a complete archive gets the final name, so a crash never leaves a truncated one behind
+    os.replace(temporary_path, path)
+    return count
+
+
+def iter_archive(path: str) -> Iterator[Dict[str, Any]]:
+    """The rows of an archive written by `archive_partition`."""
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            yield json.loads(line)
+
+
+def archived_rows(path: str) -> Optional[int]:
+    """The number of rows in an archive, or None if there is no archive at `path`."""
+    if not os.path.exists(path):
+        return None
+    return sum(1 for _ in iter_archive(path))
+
+
+async def apply_retention(db_url: str, archive_dir: str, dry_run: bool) -> None:
+    """Archive and detach the partitions older than the retention period of each table."""
+    conn = await asyncpg.connect(db_url)
+    await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+    try:
+        this_month = month_start(date.today())
+        summaries_retired = False
+        for table in PARTITIONED_TABLES.values():
+            if table.retention_months <= 0:
+                print(f"{table.name}: retention disabled, keeping every partition")
+                continue
+            cutoff = add_months(this_month, -table.retention_months)
+            expired = [name for name, month in await list_partitions(conn, table) if month < cutoff]
+            detached = await list_detached_partitions(conn, table)
+            print(f"{table.name}: keeping partitions from {cutoff:%Y-%m}, {len(expired)} expired, "
+                  f"{len(detached)} detached by an earlier run")
+            # Left behind when an earlier run failed before its drop step
+            for partition in detached:
+                if dry_run:
+                    print(f"  would archive {partition} again")
+                    continue
+                count = await archive_partition(conn, table, partition, archive_dir)
+                print(f"  {partition}: {count} rows archived again to {archive_path(archive_dir, table, partition)}")
+            for partition in expired:
+                if dry_run:
+                    print(f"  would archive and detach {partition}")
+                    continue
+                count = await archive_partition(conn, table, partition, archive_dir)
+                await conn.execute(f"ALTER TABLE {table.name} DETACH PARTITION {partition}")
+                print(f"  {partition}: {count} rows archived to {archive_path(archive_dir, table, partition)}, detached")
+                summaries_retired = summaries_retired or table.name == "summaries"
+            if table.name == "scraped_articles" and expired and not dry_run:
+                # The URLs of retired articles no longer need to be kept unique
+                status = await conn.execute(f"DELETE FROM article_urls WHERE scraped_at < '{_bound(table, cutoff)}'")
+                print(f"  article_urls: {status.split()[-1]} URLs of retired articles removed")
+
+        # The API serves summaries by date, so its cached responses for retired dates are stale
+        if summaries_retired:
+            await conn.execute('''
+            UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1
+            ''')
+    finally:
+        await conn.close()
+
+
+async def drop_detached(db_url: str, archive_dir: str, dry_run: bool) -> None:
+    """
+    Drop the detached partitions whose archive in `archive_dir` holds all of their rows.
+
+    Run this only once the archives are stored durably: a dropped partition
+    exists nowhere else.
+    """
+    conn = await asyncpg.connect(db_url)
+    try:
+        for table in PARTITIONED_TABLES.values():
+            for partition in await list_detached_partitions(conn, table):
+                path = archive_path(archive_dir, table, partition)
+                archived = archived_rows(path)
+                count = await conn.fetchval(f"SELECT count(*) FROM {partition}")
+                if archived != count:
+                    print(f"  {partition}: {count} rows but {'no archive' if archived is None else f'{archived} archived'} "
+                          f"at {path}, keeping it")
+                    continue
+                if dry_run:
+                    print(f"  would drop {partition} ({count} rows archived)")
+                    continue
+                await conn.execute(f"DROP TABLE {partition}")
+                print(f"  {partition}: dropped, its {count} rows are archived in {path}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Archive and detach the expired monthly partitions of scraped_articles and summaries.")
+    parser.add_argument("--archive-dir", default=settings.RETENTION_ARCHIVE_DIR,
+                        help=f"Directory the archives are written to and checked in (default: {settings.RETENTION_ARCHIVE_DIR})")
+    parser.add_argument("--dry-run", action="store_true", help="List the affected partitions without touching them")
+    parser.add_argument("--drop-detached", action="store_true",
+                        help="Drop the detached partitions archived in --archive-dir; run only once the archives are uploaded")
+    args = parser.parse_args()
+
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        print("Error: DATABASE_URL not set in environment")
+        sys.exit(1)
+    if args.drop_detached:
+        asyncio.run(drop_detached(db_url, args.archive_dir, args.dry_run))
+    else:
+        asyncio.run(apply_retention(db_url, args.archive_dir, args.dry_run))
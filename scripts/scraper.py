@@ -9,6 +9,7 @@ from typing import List, Optional
 from dateutil import parser as date_parser
 from dotenv import load_dotenv
 import re
+import json
 
 load_dotenv()
 
@@ -19,7 +20,12 @@ gmt_plus_2 = timezone(timedelta(hours=2))
 
 db_url = os.getenv("DATABASE_URL")
 
-from llm import llm_service
+from llm import llm_service, get_chat_model
+from llm_ledger import llm_ledger
+from article_dedup import ArticleDedupIndex
+from topic_clustering import cross_source_clusters
+from pipeline_telemetry import telemetry, traced
+from retention import PARTITIONED_TABLES, add_months, ensure_partitions
 from backend.models.ai_models import CrossSourceAnalysis
 
 
@@ -30,52 +36,107 @@ PRIMARY_LANGUAGE = "hu"
 # Import settings, models, and Base from the backend
 from backend.config import settings
 from backend.models.db_models import ScrapedArticle, Summary, DomainAnalysis
+from backend.utils.summaryutils import parse_summary_content
+from backend.utils.textutils import normalize_domain
+from backend.documents import normalize_analysis_document, unified_topic_rows
+
+# Articles seen during the current run, reset at the start of each run
+dedup_index = ArticleDedupIndex(threshold=settings.DEDUP_THRESHOLD, min_words=settings.DEDUP_MIN_WORDS)
 
 async def get_connection():
     """Returns a database connection from the pool."""
-    return await asyncpg.connect(db_url)
-
-#function which cleans up the scraped article table
-async def cleanup_scraped_articles():
-    """Cleans up the scraped articles table using asyncpg directly."""
+    conn = await asyncpg.connect(db_url)
+    # Count every round trip made on the connection
+    conn.add_query_logger(telemetry.record_query)
+    return conn
+
+def fetch_page(url: str, kind: str = "article") -> requests.Response:
+    """GET a homepage or article page, recording the fetch time and the page size."""
+    with telemetry.span("fetch", kind=kind):
+        response = requests.get(url)
+    telemetry.count("pages_fetched", kind=kind)
+    telemetry.count("bytes_fetched", len(response.content), kind=kind)
+    return response
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse a fetched page, recording the parse time."""
+    with telemetry.span("parse"):
+        return BeautifulSoup(html, "html.parser")
+
+async def bump_data_version(conn):
+    """Bumps the data version marker so the API drops its cached responses."""
+    await conn.execute('''
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1
+    ''')
+
+@traced("db.ensure_partitions")
+async def ensure_current_partitions(current_date: date):
+    """Create this month's and next month's partitions of the tables partitioned by date."""
     conn = await get_connection()
     try:
-        await conn.execute("DELETE FROM scraped_articles")
-        print("Scraped articles cleaned up successfully.")
+        for table in PARTITIONED_TABLES.values():
+            await ensure_partitions(conn, table, current_date, add_months(current_date, 1))
     except Exception as e:
-        print(f"Error cleaning up scraped articles: {e}")
+        print(f"Error creating partitions: {e}")
     finally:
         await conn.close()
 
-async def insert_article_to_db(article: ScrapedArticle):
-    """Inserts an article into the database using asyncpg directly."""
+@traced("db.store_articles")
+async def store_articles(articles: List[ScrapedArticle]):
+    """
+    Stores the scraped articles for search and history, skipping URLs stored by an earlier run.
+    Old articles are archived and retired a month at a time by scripts/retention.py.
+
+    A unique index on the partitioned table would have to include scraped_at, so URLs
+    are claimed in the unpartitioned article_urls table; an article is only inserted
+    when its URL was claimed, which stays correct with concurrent runs.
+    """
     conn = await get_connection()
     try:
-        await conn.execute('''
+        await conn.executemany('''
+        WITH claimed AS (
+            INSERT INTO article_urls (url, scraped_at) VALUES ($1::varchar, $6::timestamptz)
+            ON CONFLICT (url) DO NOTHING
+            RETURNING url
+        )
         INSERT INTO scraped_articles (url, domain, title, content, publication_date, scraped_at)
-        VALUES ($1, $2, $3, $4, $5, $6)
-        ''', article.url, article.domain, article.title, article.content, 
-            article.publication_date, article.scraped_at)
-        print(f"Article '{article.title}' inserted into DB")
+        SELECT url, $2::varchar, $3::text, $4::text, $5::date, $6::timestamptz
+        FROM claimed
+        ''', [
+            (article.url, normalize_domain(article.domain), article.title, article.content,
+             article.publication_date, article.scraped_at)
+            for article in articles
+        ])
+        print(f"{len(articles)} articles stored")
     except Exception as e:
-        print(f"Error inserting article: {e}")
+        print(f"Error storing articles: {e}")
     finally:
         await conn.close()
 
+@traced("db.insert_summary")
 async def insert_summary_to_db(summary: Summary):
-    """Inserts a summary into the database using asyncpg directly."""
+    """
+    Inserts a summary into the database using asyncpg directly.
+    The marker text is parsed once here so readers get the structured sections for free.
+    """
+    parsed = parse_summary_content(summary.content)
+    sections_json = json.dumps(parsed["sections"], ensure_ascii=False) if parsed["sections"] is not None else None
+
     conn = await get_connection()
     try:
         await conn.execute('''
-        INSERT INTO summaries (domain, language, date, content)
-        VALUES ($1, $2, $3, $4)
-        ''', summary.domain, summary.language, summary.date, summary.content)
+        INSERT INTO summaries (domain, language, date, content, short_summary, sections)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ''', normalize_domain(summary.domain), summary.language, summary.date, summary.content,
+            parsed["short_summary"], sections_json)
+        await bump_data_version(conn)
         print(f"Summary for {summary.domain} inserted into DB")
     except Exception as e:
         print(f"Error inserting summary: {e}")
     finally:
         await conn.close()
 
+@traced("db.store_domain_analysis")
 async def store_domain_analysis(analysis: DomainAnalysis):
     """
     Store domain analysis in the database.
@@ -94,7 +155,7 @@ async def store_domain_analysis(analysis: DomainAnalysis):
         INSERT INTO domain_analyses (domain, date, language)
         VALUES ($1, $2, $3)
         RETURNING id
-        ''', analysis.domain, analysis.date, analysis.language)
+        ''', normalize_domain(analysis.domain), analysis.date, analysis.language)
         
         # Insert each topic
         for topic in analysis.topics:
@@ -121,6 +182,67 @@ async def store_domain_analysis(analysis: DomainAnalysis):
     finally:
         await conn.close()
 
+def format_topic(topic: dict, domain: str, number: int) -> str:
+    """One topic of a source in the cross-source prompt."""
+    text = f"  Topic {number}: {topic['topic']}\n"
+    text += f"    Sentiment: {topic['sentiment']}\n"
+    text += f"    Political Leaning: {topic['political_leaning']}\n"
+    text += f"    Key Phrases: {', '.join(phrase for phrase in topic['key_phrases'] if phrase)}\n"
+    text += f"    Framing: {topic['framing']}\n"
+    if topic['article_urls']:
+        text += f"    Article URLs: {', '.join(topic['article_urls'])}\n"
+        shared_with = dedup_index.shared_outlets(topic['article_urls'], domain)
+        if shared_with:
+            text += f"    Same article text (wire copy) also published by: {', '.join(shared_with)}\n"
+    return text
+
+def format_source_data(target_date: date, source_data_by_domain: dict) -> str:
+    """Every topic of every source, grouped by source."""
+    llm_input = f"Date: {target_date.isoformat()}\n\n"
+    for domain, topics in source_data_by_domain.items():
+        llm_input += f"Source: {domain}\n"
+        for i, topic in enumerate(topics, 1):
+            llm_input += format_topic(topic, domain, i)
+        llm_input += "\n"
+    return llm_input
+
+@traced("cross_source.cluster")
+def format_clustered_source_data(target_date: date, source_data_by_domain: dict) -> Optional[str]:
+    """
+    The topics covered by two or more sources, pre-grouped into candidate clusters.
+
+    Returns None if no cluster spans two sources, so the caller can fall back to
+    sending every topic.
+    """
+    topics = [
+        {**topic, "domain": domain}
+        for domain, domain_topics in source_data_by_domain.items()
+        for topic in domain_topics
+    ]
+    clusters = cross_source_clusters(topics, settings.TOPIC_CLUSTER_THRESHOLD, settings.TOPIC_CLUSTER_MAX_CLUSTERS)
+    sent = sum(len(cluster) for cluster in clusters)
+    telemetry.count("cross_source.topics", len(topics))
+    telemetry.count("cross_source.topics_sent", sent)
+    print(f"Pre-clustered {len(topics)} topics: {len(clusters)} candidate clusters with {sent} topics, "
+          f"{len(topics) - sent} topics left out")
+    if not clusters:
+        return None
+
+    llm_input = f"Date: {target_date.isoformat()}\n\n"
+    for number, cluster in enumerate(clusters, 1):
+        domains = sorted({topics[i]["domain"] for i in cluster})
+        llm_input += f"Candidate cluster {number} ({len(domains)} sources):\n"
+        by_domain = {}
+        for i in cluster:
+            by_domain.setdefault(topics[i]["domain"], []).append(topics[i])
+        for domain, domain_topics in by_domain.items():
+            llm_input += f"Source: {domain}\n"
+            for i, topic in enumerate(domain_topics, 1):
+                llm_input += format_topic(topic, domain, i)
+        llm_input += "\n"
+    return llm_input
+
+@traced("cross_source.generate")
 async def generate_cross_source_analysis(target_date=None, language="hu"):
     """
     Use LLM to analyze how different news sources cover the same topics.
@@ -184,18 +306,11 @@ async def generate_cross_source_analysis(target_date=None, language="hu"):
             })
         
         # Format the data for the LLM prompt
-        llm_input = f"Date: {target_date.isoformat()}\n\n"
-        for domain, topics in source_data_by_domain.items():
-            llm_input += f"Source: {domain}\n"
-            for i, topic in enumerate(topics, 1):
-                llm_input += f"  Topic {i}: {topic['topic']}\n"
-                llm_input += f"    Sentiment: {topic['sentiment']}\n"
-                llm_input += f"    Political Leaning: {topic['political_leaning']}\n"
-                llm_input += f"    Key Phrases: {', '.join(topic['key_phrases'])}\n"
-                llm_input += f"    Framing: {topic['framing']}\n"
-                if topic['article_urls']:
-                    llm_input += f"    Article URLs: {', '.join(topic['article_urls'])}\n"
-            llm_input += "\n"
+        llm_input = None
+        if settings.TOPIC_CLUSTERING_ENABLED:
+            llm_input = format_clustered_source_data(target_date, source_data_by_domain)
+        if llm_input is None:
+            llm_input = format_source_data(target_date, source_data_by_domain)
         
         response = llm_service.cross_source_analysis(target_date.isoformat(), llm_input, language)
             
@@ -209,6 +324,38 @@ async def generate_cross_source_analysis(target_date=None, language="hu"):
     finally:
         await conn.close()
 
+async def store_unified_topics(conn, analysis_id: int, analysis_date: date, language: str, topics: List[dict]):
+    """
+    Writes the unified topics of a stored analysis to unified_topics and source_coverage,
+    so per-topic and per-outlet queries can use plain indexed SQL instead of decoding the JSONB document.
+    Sentiment and political leaning are stored as their smallint codes.
+    """
+    topic_rows, coverage_rows = unified_topic_rows(topics)
+    if not topic_rows:
+        return
+    rows = await conn.fetch('''
+    INSERT INTO unified_topics (analysis_id, date, language, position, topic_id, name, comparative_analysis)
+    SELECT $1, $2, $3, topic.position, topic.topic_id, topic.name, topic.comparative_analysis
+    FROM unnest($4::smallint[], $5::text[], $6::text[], $7::text[]) AS topic(position, topic_id, name, comparative_analysis)
+    RETURNING id, position
+    ''', analysis_id, analysis_date, language,
+        [row.position for row in topic_rows],
+        [row.topic_id for row in topic_rows],
+        [row.name for row in topic_rows],
+        [row.comparative_analysis for row in topic_rows])
+    topic_row_ids = {row['position']: row['id'] for row in rows}
+
+    await conn.executemany('''
+    INSERT INTO source_coverage
+    (unified_topic_id, analysis_id, date, language, domain, original_topic_name,
+     sentiment, political_leaning, framing, key_phrases, article_urls)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+    ''', [
+        (topic_row_ids[row.position], analysis_id, analysis_date, language, *row[1:])
+        for row in coverage_rows
+    ])
+
+@traced("db.store_cross_source_analysis")
 async def store_cross_source_analysis(analysis_data: CrossSourceAnalysis):
     """Store the cross-source analysis in the database."""
     
@@ -226,6 +373,10 @@ async def store_cross_source_analysis(analysis_data: CrossSourceAnalysis):
     # Check for valid data
     if not analysis_dict or "unified_topics" not in analysis_dict or not analysis_dict.get("unified_topics"):
         print(f"Warning: No valid analysis topics to store")
+
+    # Store canonical domain names and stable topic ids so readers don't have to derive them
+    if analysis_dict:
+        normalize_analysis_document(analysis_dict)
     
     conn = await get_connection()
     try:
@@ -251,10 +402,21 @@ async def store_cross_source_analysis(analysis_data: CrossSourceAnalysis):
 
         language = analysis_dict.get("language", "hu")  
             
-        await conn.execute('''
-        INSERT INTO cross_source_analyses (date, analysis_json, language)
-        VALUES ($1, $2, $3)
-        ''', date_obj, analysis_json, language)
+        # Append the analysis and point the (date, language) lookup row at it atomically
+        async with conn.transaction():
+            stored = await conn.fetchrow('''
+            INSERT INTO cross_source_analyses (date, analysis_json, language)
+            VALUES ($1, $2, $3)
+            RETURNING id, created_at
+            ''', date_obj, analysis_json, language)
+            await conn.execute('''
+            INSERT INTO latest_cross_source_analysis (language, date, analysis_id, created_at)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (language, date) DO UPDATE
+            SET analysis_id = EXCLUDED.analysis_id, created_at = EXCLUDED.created_at
+            ''', language, date_obj, stored['id'], stored['created_at'])
+            await store_unified_topics(conn, stored['id'], date_obj, language, analysis_dict.get("unified_topics") or [])
+            await bump_data_version(conn)
             
         print(f"Cross-source analysis stored successfully for {date_obj}")
     except Exception as e:
@@ -289,6 +451,7 @@ def parse_hungarian_date(date_text):
     
     return None
 
+@traced("process_articles")
 async def process_articles_multilingual(articles: List[ScrapedArticle], domain: str):
     """
     Process a list of articles and generate summaries and analysis in all supported languages
@@ -297,6 +460,21 @@ async def process_articles_multilingual(articles: List[ScrapedArticle], domain:
         articles: List of scraped articles
         domain: The domain name these articles belong to
     """
+    # Every article page fetched for the outlet that did not make it here was skipped
+    telemetry.count("articles_skipped", telemetry.counter_total("pages_fetched", outlet=domain, kind="article") - len(articles))
+
+    if articles:
+        await store_articles(articles)
+
+    if settings.DEDUP_ENABLED:
+        with telemetry.span("dedup"):
+            unique_articles = dedup_index.collapse(articles, domain)
+        if len(unique_articles) < len(articles):
+            print(f"Collapsed {len(articles) - len(unique_articles)} near-duplicate articles for {domain}")
+        telemetry.count("articles_duplicate", len(articles) - len(unique_articles))
+        articles = unique_articles
+    telemetry.count("articles_kept", len(articles))
+
     if not articles:
         print(f"No articles provided for {domain}")
         return
@@ -381,6 +559,7 @@ async def process_articles_multilingual(articles: List[ScrapedArticle], domain:
         print(f"Primary language '{PRIMARY_LANGUAGE}' not in supported languages. Skipping domain analysis for {domain}.")
 
 
+@traced("cross_source")
 async def generate_and_store_multilingual_cross_analysis(current_date: date):
     """
     Generates cross-source analysis in the primary language, stores it,
@@ -426,10 +605,11 @@ async def generate_and_store_multilingual_cross_analysis(current_date: date):
     elif not primary_analysis_generated_successfully:
         print(f"Skipping translation of cross-source analysis as primary ({PRIMARY_LANGUAGE}) analysis failed or yielded no topics.")
 
+@traced("scrape", outlet="telex")
 async def scrape_telex():
     url = "https://www.telex.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     elements = soup.find_all(class_='item__title')
 
     hrefs = []
@@ -456,8 +636,8 @@ async def scrape_telex():
             continue
 
         
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
         title_element = soup.find('h1')
         if title_element is None:
             print(f"No h1 tag found for {url + href}")
@@ -503,10 +683,11 @@ async def scrape_telex():
     await process_articles_multilingual(articles, "telex")
 
 
+@traced("scrape", outlet="origo")
 async def scrape_origo(): 
     url = "https://www.origo.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     elements = soup.find_all(class_='article-card-link')
 
     hrefs = []
@@ -519,8 +700,8 @@ async def scrape_origo():
     articles: List[ScrapedArticle] = []
     
     for href in hrefs:
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
 
         #extracting time tag
 
@@ -581,10 +762,11 @@ async def scrape_origo():
     
     await process_articles_multilingual(articles, "origo")
 
+@traced("scrape", outlet="mandiner")
 async def scrape_mandiner():    
     url = "https://www.mandiner.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     elements = soup.find_all(class_='article-card-link')
 
     hrefs = []
@@ -597,8 +779,8 @@ async def scrape_mandiner():
     articles = []
     
     for href in hrefs:
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
         title_element = soup.find('h1', class_='article-page-title')
 
         if title_element is None:
@@ -652,10 +834,11 @@ async def scrape_mandiner():
 
     await process_articles_multilingual(articles, "mandiner")
 
+@traced("scrape", outlet="hvg")
 async def scrape_hvg():
     url = "https://www.hvg.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     h1_elements = soup.find_all('h1')
 
     hrefs = []
@@ -674,8 +857,8 @@ async def scrape_hvg():
             print("-----------------360 articles are locked behind a paywall, cannot be parsed-----------------")
             continue
 
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
         title_element = soup.find('h1')
         title = title_element.text.strip().replace('\n', '')
 
@@ -718,10 +901,11 @@ async def scrape_hvg():
 
     await process_articles_multilingual(articles, "hvg")
 
+@traced("scrape", outlet="444")
 async def scrape_negynegynegy():
     url = "https://www.444.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -741,8 +925,8 @@ async def scrape_negynegynegy():
 
     for href in hrefs:
 
-        response = requests.get(href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(href)
+        soup = parse_html(response.text)
         title_element = soup.find('h1', class_='_18v5wa35')
         if title_element is None:
             print(f"No title found for {href}")
@@ -794,10 +978,11 @@ async def scrape_negynegynegy():
 
     await process_articles_multilingual(articles, "444")
 
+@traced("scrape", outlet="24.hu")
 async def scrape_24ponthu():
     url = "https://www.24.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     # Regular expression to match URLs with date pattern YYYY/MM/DD
@@ -813,8 +998,8 @@ async def scrape_24ponthu():
 
     for href in hrefs:
 
-        response = requests.get(href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(href)
+        soup = parse_html(response.text)
         title_element = soup.find('h1', class_='o-post__title')
         if title_element is None:
             print(f"No title found for {href}")
@@ -866,10 +1051,11 @@ async def scrape_24ponthu():
 
     await process_articles_multilingual(articles, "24.hu")
 
+@traced("scrape", outlet="vadhajtasok")
 async def scrape_vadhajtasok():
     url = "https://www.vadhajtasok.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -886,8 +1072,8 @@ async def scrape_vadhajtasok():
     articles = []
 
     for href in hrefs:
-        response = requests.get(href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(href)
+        soup = parse_html(response.text)
         title_element = soup.find('meta', attrs={'property': 'og:title'})
         if title_element is None:
             print(f"No title found for {href}")
@@ -934,10 +1120,11 @@ async def scrape_vadhajtasok():
     
     await process_articles_multilingual(articles, "vadhajtasok")
 
+@traced("scrape", outlet="magyarjelen")
 async def scrape_magyarjelen():
     url = "https://www.magyarjelen.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -950,8 +1137,8 @@ async def scrape_magyarjelen():
     articles = []
 
     for href in hrefs:
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
         title_element = soup.find('meta', attrs={'property': 'og:title'})
         if title_element is None:
             print(f"No title found for {href}")
@@ -990,10 +1177,11 @@ async def scrape_magyarjelen():
     
     await process_articles_multilingual(articles, "magyarjelen")
     
+@traced("scrape", outlet="nyugatifeny")
 async def scrape_nyugatifeny():
     url = "https://www.nyugatifeny.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -1005,8 +1193,8 @@ async def scrape_nyugatifeny():
     articles = []
 
     for href in hrefs:
-        response = requests.get(href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(href)
+        soup = parse_html(response.text)
         title_element = soup.find('title')
         if title_element is None:
             print(f"No title found for {href}")
@@ -1049,10 +1237,11 @@ async def scrape_nyugatifeny():
     
     await process_articles_multilingual(articles, "nyugatifeny")
 
+@traced("scrape", outlet="index")
 async def scrape_index():
     url = "https://index.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -1076,8 +1265,8 @@ async def scrape_index():
     articles = []
 
     for href in hrefs:
-        response = requests.get(href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(href)
+        soup = parse_html(response.text)
         title_element = soup.find('meta', attrs={'property': 'og:title'})
         if title_element is None:
             title_element = soup.find('title')
@@ -1156,10 +1345,11 @@ async def scrape_index():
 
     await process_articles_multilingual(articles, "index")
 
+@traced("scrape", outlet="magyarnemzet")
 async def scrape_magyarnemzet():
     url = "https://www.magyarnemzet.hu"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    response = fetch_page(url, kind="homepage")
+    soup = parse_html(response.text)
     a_elements = soup.find_all('a', href=True)
 
     hrefs = []
@@ -1171,8 +1361,8 @@ async def scrape_magyarnemzet():
     articles=[]        
 
     for href in hrefs:
-        response = requests.get(url + href)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = fetch_page(url + href)
+        soup = parse_html(response.text)
         title_element = soup.find('meta', attrs={'property': 'og:title'})
         if title_element is None:
             title_element = soup.find('title')
@@ -1244,9 +1434,53 @@ async def scrape_magyarnemzet():
     await process_articles_multilingual(articles, "magyarnemzet")
 
 
+@traced("publish_snapshots")
+async def publish_static_snapshots(current_date: date):
+    """
+    Render the API responses for the current date into static JSON snapshots.
+
+    Only runs with SNAPSHOT_PUBLISH set: the scrape workflow publishes into its
+    checkout of the GitHub Pages branch, which the frontend reads them from.
+    """
+    if not settings.SNAPSHOT_PUBLISH:
+        print("SNAPSHOT_PUBLISH not set, skipping static snapshots")
+        return
+
+    # Imported here: the publisher pulls in the API's endpoint modules and FastAPI
+    from publisher import publish_snapshots
+
+    conn = await get_connection()
+    try:
+        manifest = await publish_snapshots(conn, [current_date], SUPPORTED_LANGUAGES)
+        print(f"Published snapshot version {manifest['version']} ({len(manifest['entries'])} entries in manifest)")
+    except Exception as e:
+        print(f"Error publishing static snapshots: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await conn.close()
+
+@traced("db.store_llm_calls")
+async def store_llm_calls():
+    """Print the LLM spend of the run and write its calls to the llm_calls table."""
+    print(llm_ledger.summary_table())
+    if not settings.LLM_LEDGER_ENABLED:
+        return
+    conn = await get_connection()
+    try:
+        stored = await llm_ledger.flush(conn)
+        print(f"{stored} LLM calls stored in llm_calls")
+    except Exception as e:
+        print(f"Error storing LLM calls: {e}")
+    finally:
+        await conn.close()
+
 async def run_full_analysis_pipeline():
     """Run the complete analysis pipeline for all sources."""
     current_date = date.today()
+    telemetry.start_run()
+    dedup_index.reset()
+    await ensure_current_partitions(current_date)
     
     # Dictionary to track scraping results for each source
     scrape_results = {
@@ -1303,10 +1537,17 @@ async def run_full_analysis_pipeline():
     else:
         print("No sources were successfully scraped, skipping cross-source analysis.")
 
+    await publish_static_snapshots(current_date)
+
+    await store_llm_calls()
+
     print("Full analysis pipeline finished.")
+    telemetry.finish_run()
 
 if __name__ == "__main__":
     print("Running scraper script...")
+    # Create the LLM client up front so a missing API key fails before any scraping
+    get_chat_model()
     asyncio.run(run_full_analysis_pipeline())
     # asyncio.run(scrape_magyarnemzet())
     print("Script finished.")
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Local pre-clustering of the per-domain topics for the cross-source analysis.
+
+Each topic (name, key phrases and framing) becomes a TF-IDF vector over
+character 4-grams of its words, which copes with Hungarian inflection
+("Ukrajna", "Ukrajnában") without a stemmer or an embedding model. Topics are
+merged by average-linkage agglomerative clustering on the cosine similarity
+matrix until no pair of clusters is similar enough.
+
+Only clusters covered by at least two sources are sent to the cross-source
+prompt, so topics a single outlet wrote about are never seen by the model.
+"""
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+NGRAM_SIZE = 4
+
+
+def topic_text(topic: Dict[str, Any]) -> str:
+    """The text a topic is compared by; the name is repeated to outweigh the longer framing."""
+    key_phrases = " ".join(phrase for phrase in topic.get("key_phrases") or [] if phrase)
+    return f"{topic['topic']} {topic['topic']} {key_phrases} {topic.get('framing') or ''}"
+
+
+def _ngrams(text: str) -> List[str]:
+    grams = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) < 3:
+            continue
+        padded = f" {word} "
+        grams.extend(padded[i:i + NGRAM_SIZE] for i in range(max(len(padded) - NGRAM_SIZE + 1, 1)))
+    return grams
+
+
+def tfidf_matrix(texts: Sequence[str]) -> np.ndarray:
+    """L2-normalized TF-IDF rows (sublinear tf, smoothed idf) over character n-grams."""
+    vocabulary: Dict[str, int] = {}
+    rows, columns, counts = [], [], []
+    for row, text in enumerate(texts):
+        grams: Dict[int, int] = defaultdict(int)
+        for gram in _ngrams(text):
+            grams[vocabulary.setdefault(gram, len(vocabulary))] += 1
+        rows.extend([row] * len(grams))
+        columns.extend(grams.keys())
+        counts.extend(grams.values())
+
+    matrix = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    matrix[rows, columns] = 1.0 + np.log(np.asarray(counts, dtype=np.float32))
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1.0 + len(texts)) / (1.0 + document_frequency)) + 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def cluster_topics(topics: Sequence[Dict[str, Any]], threshold: float) -> List[List[int]]:
+    """
+    Group similar topics by average-linkage clustering of their TF-IDF vectors.
+
+    Args:
+        topics: Topic dicts with "topic", "key_phrases" and "framing".
+        threshold: Minimum average cosine similarity between two clusters to merge them.
+
+    Returns:
+        Clusters as lists of indexes into `topics`, largest first.
+    """
+    if not topics:
+        return []
+    vectors = tfidf_matrix([topic_text(topic) for topic in topics])
+    similarity = (vectors @ vectors.T).astype(np.float64)
+    np.fill_diagonal(similarity, -np.inf)
+
+    members: List[List[int]] = [[i] for i in range(len(topics))]
+    active = np.ones(len(topics), dtype=bool)
+    while True:
+        flat = int(np.argmax(similarity))
+        i, j = divmod(flat, len(topics))
+        if similarity[i, j] < threshold:
+            break
+        # Average linkage: the merged row is the size-weighted mean of both rows
+        size_i, size_j = len(members[i]), len(members[j])
+        merged = (similarity[i] * size_i + similarity[j] * size_j) / (size_i + size_j)
+        similarity[i, :] = merged
+        similarity[:, i] = merged
+        similarity[i, i] = -np.inf
+        similarity[j, :] = -np.inf
+        similarity[:, j] = -np.inf
+        members[i] += members[j]
+        members[j] = []
+        active[j] = False
+
+    clusters = [members[i] for i in np.flatnonzero(active)]
+    return sorted(clusters, key=len, reverse=True)
+
+
+def cross_source_clusters(
+    topics: Sequence[Dict[str, Any]],
+    threshold: float,
+    max_clusters: int
+) -> List[List[int]]:
+    """
+    The clusters worth a cross-source comparison: covered by two or more sources,
+    most widely covered first, at most `max_clusters` of them.
+
+    Each topic dict must have a "domain" besides the fields used by `cluster_topics`.
+    """
+    clusters = [
+        cluster for cluster in cluster_topics(topics, threshold)
+        if len({topics[i]["domain"] for i in cluster}) >= 2
+    ]
+    clusters.sort(key=lambda cluster: (-len({topics[i]["domain"] for i in cluster}), -len(cluster)))
+    return clusters[:max_clusters] if max_clusters > 0 else clusters
+
@@ -0,0 +1,6 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The scripts import their sibling modules directly, like when run as `python scripts/<name>.py`
+sys.path[:0] = [project_root, os.path.join(project_root, "scripts")]
@@ -0,0 +1,91 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from article_dedup import ArticleDedupIndex, jaccard, shingles
+from backend.models.db_models import ScrapedArticle
+
+WORDS = [f"szo{i}" for i in range(200)]
+
+
+def make_article(url, domain, words):
+    return ScrapedArticle(
+        url=url,
+        domain=domain,
+        title=url,
+        content=" ".join(words),
+        scraped_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        publication_date=date(2026, 10, 18),
+    )
+
+
+def test_jaccard_of_shingles():
+    text = " ".join(WORDS[:20])
+
+    assert jaccard(shingles(text, 5), shingles(text, 5)) == 1.0
+    assert jaccard(shingles(text, 5), shingles(" ".join(WORDS[100:120]), 5)) == 0.0
+    assert jaccard(frozenset(), shingles(text, 5)) == 0.0
+
+
+def test_same_outlet_near_duplicate_is_collapsed():
+    index = ArticleDedupIndex(threshold=0.8, min_words=50)
+    original = make_article("https://telex.hu/a", "telex.hu", WORDS)
+    # One changed word near the end keeps the shingle similarity above 0.9
+    near_duplicate = make_article("https://telex.hu/b", "telex.hu", WORDS[:-3] + ["mas"] + WORDS[-2:])
+
+    kept = index.collapse([original, near_duplicate], "telex.hu")
+
+    assert kept == [original]
+    assert index.collapsed == {"https://telex.hu/b": "https://telex.hu/a"}
+
+
+def test_articles_below_the_threshold_are_kept():
+    index = ArticleDedupIndex(threshold=0.8, min_words=50)
+    first = make_article("https://telex.hu/a", "telex.hu", WORDS[:100])
+    # Half of the words shared: far below a Jaccard similarity of 0.8
+    second = make_article("https://telex.hu/b", "telex.hu", WORDS[50:150])
+
+    assert index.collapse([first, second], "telex.hu") == [first, second]
+    assert index.collapsed == {}
+
+
+@pytest.mark.parametrize("threshold, collapsed", [(0.5, True), (0.95, False)])
+def test_threshold_decides_what_counts_as_duplicate(threshold, collapsed):
+    index = ArticleDedupIndex(threshold=threshold, min_words=50)
+    first = make_article("https://telex.hu/a", "telex.hu", WORDS)
+    # Every 40th word replaced: similar, but well below 0.95
+    edited = [word if i % 40 else f"uj{i}" for i, word in enumerate(WORDS)]
+    second = make_article("https://telex.hu/b", "telex.hu", edited)
+    assert 0.6 < jaccard(shingles(first.content, 5), shingles(second.content, 5)) < 0.9
+
+    kept = index.collapse([first, second], "telex.hu")
+
+    assert (kept == [first]) is collapsed
+
+
+def test_short_articles_are_never_collapsed():
+    index = ArticleDedupIndex(threshold=0.8, min_words=50)
+    teaser = make_article("https://telex.hu/a", "telex.hu", WORDS[:20])
+    same_teaser = make_article("https://telex.hu/b", "telex.hu", WORDS[:20])
+
+    assert index.collapse([teaser, same_teaser], "telex.hu") == [teaser, same_teaser]
+
+
+def test_repeated_url_is_collapsed_onto_itself():
+    index = ArticleDedupIndex()
+    article = make_article("https://telex.hu/a", "telex.hu", WORDS)
+    index.collapse([article], "telex.hu")
+
+    assert index.collapse([article], "telex.hu") == []
+    assert index.collapsed == {"https://telex.hu/a": "https://telex.hu/a"}
+
+
+def test_cross_outlet_duplicates_are_kept_and_linked():
+    index = ArticleDedupIndex(threshold=0.8, min_words=50)
+    wire_story = make_article("https://telex.hu/mti", "telex.hu", WORDS)
+    same_story = make_article("https://index.hu/mti", "index.hu", WORDS)
+
+    assert index.collapse([wire_story], "telex.hu") == [wire_story]
+    assert index.collapse([same_story], "https://www.index.hu") == [same_story]
+    assert index.shared_outlets(["https://telex.hu/mti"], "telex.hu") == ["index"]
+    assert index.shared_outlets(["https://index.hu/mti"], "index.hu") == ["telex"]
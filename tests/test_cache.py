@@ -0,0 +1,89 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from backend.cache import CacheEntry, cache_seed, compute_validators, not_modified
+
+
+def make_request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def make_entry(etag='"abc"', last_modified="Sun, 18 Oct 2026 10:00:00 GMT"):
+    return CacheEntry(etag, last_modified, b"{}")
+
+
+ROWS = [
+    {"id": 1, "created_at": datetime(2026, 10, 18, 8, 0)},
+    {"id": 2, "created_at": datetime(2026, 10, 18, 10, 0)},
+]
+
+
+def test_validators_depend_on_seed_and_rows():
+    seed = cache_seed("summaries", date(2026, 10, 18), "hu", "raw")
+    etag, last_modified = compute_validators(seed, ROWS)
+
+    assert etag == compute_validators(seed, list(ROWS))[0]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != compute_validators(cache_seed("summaries", date(2026, 10, 18), "en", "raw"), ROWS)[0]
+    assert etag != compute_validators(seed, ROWS[:1])[0]
+    # Naive created_at values are UTC, the newest one is the Last-Modified date
+    assert last_modified == "Sun, 18 Oct 2026 10:00:00 GMT"
+
+
+def test_validators_without_rows_have_no_last_modified():
+    etag, last_modified = compute_validators("unified-topics:2026-10-18:hu", [])
+
+    assert etag
+    assert last_modified is None
+
+
+def test_aware_created_at_is_converted_to_gmt():
+    rows = [{"id": 1, "created_at": datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc).astimezone()}]
+
+    assert compute_validators("seed", rows)[1] == "Sun, 18 Oct 2026 12:00:00 GMT"
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+    ("abc", False),
+])
+def test_if_none_match(if_none_match, expected):
+    assert not_modified(make_request(if_none_match=if_none_match), make_entry()) is expected
+
+
+@pytest.mark.parametrize("if_modified_since, expected", [
+    ("Sun, 18 Oct 2026 10:00:00 GMT", True),
+    ("Mon, 19 Oct 2026 00:00:00 GMT", True),
+    ("Sun, 18 Oct 2026 09:59:59 GMT", False),
+    ("not a date", False),
+])
+def test_if_modified_since(if_modified_since, expected):
+    assert not_modified(make_request(if_modified_since=if_modified_since), make_entry()) is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = make_request(if_none_match='"other"', if_modified_since="Mon, 19 Oct 2026 00:00:00 GMT")
+
+    assert not not_modified(request, make_entry())
+
+
+def test_unconditional_request_and_missing_last_modified_are_modified():
+    assert not not_modified(make_request(), make_entry())
+    assert not not_modified(make_request(if_modified_since="Mon, 19 Oct 2026 00:00:00 GMT"), make_entry(last_modified=None))
+
+
+def test_cache_entry_pack_round_trip():
+    entry = CacheEntry('"abc"', None, b'{"a": 1}\n', {"gzip": b"\x1f\x8b gz", "br": b"br\n"})
+
+    assert CacheEntry.unpack(entry.pack()) == entry
@@ -0,0 +1,37 @@
+from backend.documents import normalize_analysis_document, unified_topic_rows
+
+
+def analysis():
+    return {"unified_topics": [
+        {"name": "Választás", "comparative_analysis": "Összevetés", "source_coverage": [
+            {"domain": "https://www.Telex.hu", "sentiment": "Negativ", "political_leaning": "jobboldali",
+             "key_phrases": ["kampány"], "article_urls": "not a list"},
+        ]},
+        {"name": "valasztas", "source_coverage": [
+            {"domain": "444.hu", "sentiment": "positive", "political_leaning": "közép-bal"},
+        ]},
+        {"name": "", "source_coverage": None},
+    ]}
+
+
+def test_rows_use_slug_ids_normalized_domains_and_codes():
+    topics, coverage = unified_topic_rows(normalize_analysis_document(analysis())["unified_topics"])
+
+    assert [(t.position, t.topic_id, t.name) for t in topics] == [
+        (0, "valasztas", "Választás"), (1, "valasztas-2", "valasztas"), (2, "topic", ""),
+    ]
+    assert topics[0].comparative_analysis == "Összevetés"
+    assert [(c.position, c.domain, c.sentiment, c.political_leaning) for c in coverage] == [
+        (0, "telex", -1, 2), (1, "444", 1, -1),
+    ]
+    assert coverage[0].key_phrases == ["kampány"]
+    assert coverage[0].article_urls == []
+
+
+def test_stored_topic_ids_are_kept():
+    document = {"unified_topics": [{"topic_id": "sajat", "name": "Választás"}, {"name": "Sajat"}]}
+
+    topics, coverage = unified_topic_rows(normalize_analysis_document(document)["unified_topics"])
+
+    assert [t.topic_id for t in topics] == ["sajat", "sajat-2"]
+    assert coverage == []
@@ -0,0 +1,38 @@
+import pytest
+
+from backend.models.enums import PoliticalLeaning, Sentiment
+
+
+@pytest.mark.parametrize("leaning", list(PoliticalLeaning))
+def test_leaning_code_round_trip(leaning):
+    assert PoliticalLeaning.from_code(leaning.code) is leaning
+
+
+@pytest.mark.parametrize("sentiment", list(Sentiment))
+def test_sentiment_code_round_trip(sentiment):
+    assert Sentiment.from_code(sentiment.code) is sentiment
+
+
+def test_codes_are_ordered_from_left_to_right():
+    assert [leaning.code for leaning in PoliticalLeaning] == [-2, -1, 0, 1, 2]
+    assert (Sentiment.NEGATIVE.code, Sentiment.NEUTRAL.code, Sentiment.POSITIVE.code) == (-1, 0, 1)
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Jobboldali", PoliticalLeaning.RIGHT),
+    (" balközép ", PoliticalLeaning.CENTER_LEFT),
+    ("", PoliticalLeaning.CENTER),
+    ("ismeretlen", PoliticalLeaning.CENTER),
+])
+def test_leaning_from_string(label, expected):
+    assert PoliticalLeaning.from_string(label) is expected
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Positive", Sentiment.POSITIVE),
+    ("negativ", Sentiment.NEGATIVE),
+    (None, Sentiment.NEUTRAL),
+    ("vegyes", Sentiment.NEUTRAL),
+])
+def test_sentiment_from_string(label, expected):
+    assert Sentiment.from_string(label) is expected
@@ -0,0 +1,28 @@
+import pytest
+
+from backend.utils.httputils import negotiate_encoding, parse_accept_encoding
+
+AVAILABLE = ["gzip", "br"]
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, deflate;q=abc, ") == {"gzip": 1.0, "br": 0.5, "deflate": 0.0}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", "identity"),
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0, br;q=0", "identity"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("identity", "identity"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header, AVAILABLE) == expected
+
+
+def test_only_available_encodings_are_chosen():
+    assert negotiate_encoding("br, gzip", ["gzip"]) == "gzip"
+    assert negotiate_encoding("br", []) == "identity"
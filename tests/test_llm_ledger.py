@@ -0,0 +1,29 @@
+import pytest
+
+import llm_ledger
+from llm_ledger import LLMLedger, estimate_cost
+
+
+def test_calls_are_priced_by_model():
+    assert estimate_cost("gemini-2.0-flash", 1_000_000, 1_000_000) == pytest.approx(0.10 + 0.40)
+    assert estimate_cost("gemini-2.5-flash-preview-04-17", 1_000_000, 1_000_000) == pytest.approx(0.15 + 3.50)
+    assert estimate_cost("models/gemini-2.0-flash", 2_000, 0) == pytest.approx(0.0002)
+
+
+def test_unknown_model_is_unpriced_with_one_warning(capsys, monkeypatch):
+    monkeypatch.setattr(llm_ledger, "_unpriced_models", set())
+
+    assert estimate_cost("gemini-9-ultra", 1_000_000, 1_000_000) == 0.0
+    assert estimate_cost("gemini-9-ultra", 1_000, 1_000) == 0.0
+    assert capsys.readouterr().out.count("no price for LLM model 'gemini-9-ultra'") == 1
+
+
+def test_ledger_records_the_cost_of_the_calls_model():
+    ledger = LLMLedger()
+    ledger.record("run", "cross_source", "gemini-2.5-flash-preview-04-17", 10_000, 2_000, 1.5, True)
+    ledger.record("run", "summarize", "gemini-2.0-flash", 10_000, 2_000, 0.5, True, outlet="telex")
+
+    costs = {call.call: call.cost_usd for call in ledger.calls}
+    assert costs["cross_source"] == pytest.approx(0.0085)
+    assert costs["summarize"] == pytest.approx(0.0018)
+    assert "cross_source" in ledger.summary_table().splitlines()[1]
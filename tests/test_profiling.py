@@ -0,0 +1,35 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.profiling import ProfilingMiddleware
+
+
+def make_client(token="secret"):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, token=token, interval=0.001)
+    return TestClient(app)
+
+
+def test_profile_requires_the_token():
+    client = make_client()
+
+    assert client.get("/ping?profile=1").json() == {"ok": True}
+    assert client.get("/ping", headers={"X-Profile": "1", "X-Profile-Token": "wrong"}).json() == {"ok": True}
+
+
+def test_profile_with_the_token():
+    response = make_client().get("/ping", headers={"X-Profile": "1", "X-Profile-Token": "secret"})
+
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["x-profiled-status"] == "200"
+
+
+def test_empty_token_is_refused():
+    with pytest.raises(ValueError):
+        make_client(token="").get("/ping")
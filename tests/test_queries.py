@@ -0,0 +1,92 @@
+import asyncio
+
+import asyncpg
+import pytest
+
+from backend.queries import QueryRegistry
+
+
+class FakeStatement:
+    def __init__(self, conn, sql):
+        self.conn = conn
+        self.sql = sql
+
+    async def fetchval(self, *args):
+        if self in self.conn.stale:
+            raise asyncpg.InvalidCachedStatementError("cached statement plan is invalid due to a database schema change")
+        return self.sql
+
+
+class FakeConnection:
+    def __init__(self, missing=(), in_transaction=False):
+        self.missing = missing
+        self.in_transaction = in_transaction
+        self.prepared = []
+        self.stale = set()
+
+    def is_in_transaction(self):
+        return self.in_transaction
+
+    def get_server_pid(self):
+        return 42
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def prepare(self, sql):
+        if any(table in sql for table in self.missing):
+            raise asyncpg.UndefinedTableError("relation does not exist")
+        statement = FakeStatement(self, sql)
+        self.prepared.append(statement)
+        return statement
+
+
+def make_registry():
+    registry = QueryRegistry()
+    registry.register("one", "SELECT 1")
+    registry.register("missing", "SELECT * FROM missing_table")
+    return registry
+
+
+def test_prepare_all_skips_statements_that_fail():
+    registry = make_registry()
+    conn = FakeConnection(missing=["missing_table"])
+
+    assert asyncio.run(registry.prepare_all(conn)) == 1
+    assert asyncio.run(registry.fetchval(conn, "one")) == "SELECT 1"
+    with pytest.raises(asyncpg.UndefinedTableError):
+        asyncio.run(registry.fetchval(conn, "missing"))
+
+
+def test_invalidated_statement_is_prepared_again():
+    registry = make_registry()
+    conn = FakeConnection()
+    asyncio.run(registry.fetchval(conn, "one"))
+    conn.stale.add(conn.prepared[0])
+
+    assert asyncio.run(registry.fetchval(conn, "one")) == "SELECT 1"
+    assert len(conn.prepared) == 2
+    # The new statement is cached
+    assert asyncio.run(registry.fetchval(conn, "one")) == "SELECT 1"
+    assert len(conn.prepared) == 2
+
+
+def test_invalidated_statement_in_a_transaction_is_not_retried():
+    registry = make_registry()
+    conn = FakeConnection(in_transaction=True)
+    asyncio.run(registry.fetchval(conn, "one"))
+    conn.stale.add(conn.prepared[0])
+
+    with pytest.raises(asyncpg.InvalidCachedStatementError):
+        asyncio.run(registry.fetchval(conn, "one"))
+    # Prepared again by the next query, e.g. after the transaction is retried
+    assert asyncio.run(registry.fetchval(conn, "one")) == "SELECT 1"
+    assert len(conn.prepared) == 2
+
+
+def test_conflicting_registration_is_rejected():
+    registry = make_registry()
+
+    assert registry.register("one", "SELECT 1") == "one"
+    with pytest.raises(ValueError):
+        registry.register("one", "SELECT 2")
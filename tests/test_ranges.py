@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.config import settings
+from backend.ranges import resolve_date_range
+
+
+def test_range_defaults_to_today():
+    assert resolve_date_range(date(2026, 1, 1), None) == (date(2026, 1, 1), date.today())
+
+
+def test_single_day_range():
+    assert resolve_date_range(date(2026, 10, 18), date(2026, 10, 18)) == (date(2026, 10, 18), date(2026, 10, 18))
+
+
+def test_reversed_range_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        resolve_date_range(date(2026, 10, 18), date(2026, 10, 17))
+    assert error.value.status_code == 400
+
+
+def test_range_length_is_limited():
+    start = date(2026, 1, 1)
+    longest = start + timedelta(days=settings.RANGE_MAX_DAYS - 1)
+
+    assert resolve_date_range(start, longest) == (start, longest)
+    with pytest.raises(HTTPException) as error:
+        resolve_date_range(start, longest + timedelta(days=1))
+    assert error.value.status_code == 400
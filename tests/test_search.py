@@ -0,0 +1,38 @@
+from datetime import date
+
+from backend.endpoints.search import HIGHLIGHT_START, HIGHLIGHT_STOP, highlight, render_search_results
+
+
+def match(total, **fields):
+    row = {"type": "summary", "id": 1, "domain": "telex.hu", "date": date(2026, 10, 1),
+           "title": "Title", "url": None, "snippet": None, "rank": 0.123456, "total": total}
+    row.update(fields)
+    return row
+
+
+def test_highlight_escapes_before_marking():
+    snippet = f"<b>a</b>  {HIGHLIGHT_START}főváros{HIGHLIGHT_STOP}\n& more"
+
+    assert highlight(snippet) == "&lt;b&gt;a&lt;/b&gt; <mark>főváros</mark> &amp; more"
+    assert highlight(None) is None
+
+
+def test_page_of_matches():
+    rows = [match(3, id=1), match(3, id=2)]
+
+    response = render_search_results(rows, "q", "hu", 2, 0)
+
+    assert [r["id"] for r in response["results"]] == [1, 2]
+    assert response["total"] == 3
+    assert response["next_offset"] == 2
+    assert response["results"][0]["rank"] == 0.1235
+
+
+def test_offset_past_the_last_match_keeps_the_total():
+    rows = [match(3, type=None, id=None, rank=None, date=None)]
+
+    response = render_search_results(rows, "q", "hu", 20, 40)
+
+    assert response["results"] == []
+    assert response["total"] == 3
+    assert response["next_offset"] is None
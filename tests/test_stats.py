@@ -0,0 +1,45 @@
+from datetime import date
+
+from backend.stats import CoverageCube
+
+
+def row(day, domain, sentiment, leaning, topics=1):
+    return {"date": date(2026, 10, day), "domain": domain, "sentiment": sentiment,
+            "political_leaning": leaning, "topics": topics}
+
+
+ROWS = [
+    row(17, "telex", "pozitív", "közép-bal", 2),
+    row(18, "telex", "negatív", "bal"),
+    # Smallint codes, as stored in source_coverage
+    row(18, "origo", 1, 2, 3),
+    row(19, "index", "semleges", "közép"),
+    row(19, "", "semleges", "közép"),
+]
+
+
+def test_aggregate_over_a_range():
+    stats = CoverageCube.from_rows(ROWS).aggregate(date(2026, 10, 17), date(2026, 10, 18))
+
+    assert stats["totals"]["topics"] == 6
+    assert stats["totals"]["sentiment"] == {"pozitív": 5, "negatív": 1, "semleges": 0}
+    assert [outlet["domain"] for outlet in stats["outlets"]] == ["origo", "telex"]
+    assert [day["date"] for day in stats["trend"]] == ["2026-10-17", "2026-10-18"]
+    # (2 * -1 + 1 * -2 + 3 * 2) / 6
+    assert stats["totals"]["mean_leaning"] == 0.333
+
+
+def test_aggregate_filters_outlets_and_skips_empty_dates():
+    stats = CoverageCube.from_rows(ROWS).aggregate(date(2026, 10, 1), date(2026, 10, 31), outlets=["index"])
+
+    assert stats["totals"]["topics"] == 1
+    assert [day["date"] for day in stats["trend"]] == ["2026-10-19"]
+    assert stats["outlets"][0]["political_leaning"]["közép"] == 1
+
+
+def test_empty_range():
+    stats = CoverageCube.from_rows(ROWS).aggregate(date(2026, 9, 1), date(2026, 9, 30))
+
+    assert stats["totals"]["topics"] == 0
+    assert stats["totals"]["mean_leaning"] is None
+    assert stats["outlets"] == [] and stats["trend"] == []
@@ -0,0 +1,47 @@
+from backend.utils.summaryutils import parse_summary_content
+
+FULL_SUMMARY = """Itt az összefoglaló:
+[START_SHORT_SUMMARY]Rövid előnézet.[END_SHORT_SUMMARY]
+[START_MAIN_SUMMARY]
+[START_BEVEZETO]**Bevezető**
+A nap legfontosabb hírei.[END_BEVEZETO]
+[START_BELFOLD]Belföldi hírek.[END_BELFOLD]
+[START_KULFOLD]Külföldi hírek.[END_KULFOLD]
+[START_ZARAS]Zárszó.[END_ZARAS]
+[END_MAIN_SUMMARY]"""
+
+
+def test_parses_short_summary_and_sections():
+    parsed = parse_summary_content(FULL_SUMMARY)
+
+    assert parsed["short_summary"] == "Rövid előnézet."
+    assert parsed["sections"] == {
+        "bevezeto": "A nap legfontosabb hírei.",
+        "belfold": "Belföldi hírek.",
+        "kulfold": "Külföldi hírek.",
+        "tarsadalom": None,
+        "zaras": "Zárszó.",
+    }
+
+
+def test_text_before_first_section_becomes_introduction():
+    parsed = parse_summary_content(
+        "[START_MAIN_SUMMARY]Nyitó bekezdés.\n[START_BELFOLD]Belföld.[END_BELFOLD][END_MAIN_SUMMARY]"
+    )
+
+    assert parsed["sections"]["bevezeto"] == "Nyitó bekezdés."
+    assert parsed["sections"]["belfold"] == "Belföld."
+    # Without a short summary the preview falls back to the introduction
+    assert parsed["short_summary"] == "Nyitó bekezdés."
+
+
+def test_unknown_sections_are_ignored():
+    parsed = parse_summary_content("[START_SPORT]Foci.[END_SPORT][START_KULFOLD]Világ.[END_KULFOLD]")
+
+    assert parsed["sections"]["kulfold"] == "Világ."
+    assert "sport" not in parsed["sections"]
+
+
+def test_content_without_markers_has_no_sections():
+    assert parse_summary_content("Csak egyszerű szöveg.") == {"short_summary": None, "sections": None}
+    assert parse_summary_content("") == {"short_summary": None, "sections": None}
@@ -0,0 +1,34 @@
+from topic_clustering import cluster_topics, cross_source_clusters
+
+
+def topic(name, domain, key_phrases=(), framing=""):
+    return {"topic": name, "domain": domain, "key_phrases": list(key_phrases), "framing": framing}
+
+
+TOPICS = [
+    topic("Háború Ukrajnában", "telex", ["orosz támadás", "Kijev"]),
+    topic("Az ukrajnai háború", "index", ["orosz támadások", "Kijev"]),
+    topic("Inflációs adatok", "telex", ["KSH", "fogyasztói árak"]),
+    topic("Labdarúgó válogatott", "origo", ["Eb-selejtező"]),
+]
+
+
+def test_similar_topics_are_clustered_across_inflections():
+    clusters = cluster_topics(TOPICS, threshold=0.3)
+
+    assert sorted(clusters[0]) == [0, 1]
+    assert sorted(map(sorted, clusters[1:])) == [[2], [3]]
+
+
+def test_high_threshold_keeps_every_topic_apart():
+    assert sorted(map(sorted, cluster_topics(TOPICS, threshold=0.99))) == [[0], [1], [2], [3]]
+
+
+def test_cross_source_clusters_need_two_sources():
+    assert [sorted(cluster) for cluster in cross_source_clusters(TOPICS, 0.3, 0)] == [[0, 1]]
+    same_source = [topic("Háború Ukrajnában", "telex"), topic("Háború Ukrajnában", "telex")]
+    assert cross_source_clusters(same_source, 0.3, 0) == []
+
+
+def test_empty_input():
+    assert cluster_topics([], 0.3) == []
@@ -0,0 +1,77 @@
+from backend.utils.topicindex import (
+    EXACT_SCORE,
+    PREFIX_SCORE,
+    SUBSTRING_SCORE,
+    WORD_PREFIX_SCORE,
+    TopicIndex,
+    assign_topic_ids,
+)
+
+
+def make_index(*names):
+    document = assign_topic_ids({"unified_topics": [{"name": name} for name in names]})
+    return TopicIndex(document["unified_topics"])
+
+
+def names(results):
+    return [topic["name"] for topic, _ in results]
+
+
+def test_assign_topic_ids_slugs_names_and_suffixes_collisions():
+    document = assign_topic_ids({"unified_topics": [
+        {"name": "Háború Ukrajnában"},
+        {"name": "Háború, Ukrajnában!"},
+        {"name": "Költségvetés", "topic_id": "sajat-id"},
+        {"name": ""},
+    ]})
+
+    assert [topic["topic_id"] for topic in document["unified_topics"]] == [
+        "haboru-ukrajnaban", "haboru-ukrajnaban-2", "sajat-id", "topic",
+    ]
+
+
+def test_exact_match_ranks_above_prefix_matches():
+    index = make_index("Választás 2026", "Választás")
+
+    results = index.search("valasztas")
+
+    assert names(results) == ["Választás", "Választás 2026"]
+    assert [score for _, score in results] == [EXACT_SCORE, PREFIX_SCORE]
+
+
+def test_topic_id_is_an_exact_match():
+    index = make_index("Háború Ukrajnában")
+
+    assert index.search("haboru-ukrajnaban") == [(index.topics[0], EXACT_SCORE)]
+
+
+def test_word_prefix_ranks_above_substring():
+    index = make_index("Gazdasági helyzet", "Infláció és kamatok")
+
+    results = index.search("kamat")
+
+    assert results == [(index.topics[1], WORD_PREFIX_SCORE)]
+    assert index.search("dasag") == [(index.topics[0], SUBSTRING_SCORE)]
+
+
+def test_short_queries_match_inside_words():
+    index = make_index("Költségvetés", "Háború Ukrajnában")
+
+    assert names(index.search("gv")) == ["Költségvetés"]
+    assert names(index.search("kö")) == ["Költségvetés"]
+
+
+def test_fuzzy_match_tolerates_typos_and_scores_below_substring():
+    index = make_index("Egészségügyi reform")
+
+    results = index.search("egeszsegugyi refrom")
+
+    assert names(results) == ["Egészségügyi reform"]
+    assert 0 < results[0][1] < SUBSTRING_SCORE
+
+
+def test_unrelated_query_finds_nothing():
+    index = make_index("Egészségügyi reform")
+
+    assert index.search("labdarúgás") == []
+    assert index.search("  ") == []